@@ -114,12 +114,15 @@ setup(
             "data/pypi_classifiers.txt",
             "data/spdx_licenses.json",
             "data/license_without_versions.yaml",
+            "data/license_fingerprints.json",
+            "data/license_compatibility.json",
             "py.typed",
         ]
     },
     entry_points={"console_scripts": ["thoth-license-solver=thoth.license_solver.cli:cli"]},
     zip_safe=False,
     install_requires=get_install_requires(),
+    extras_require={"numpy": ["numpy"]},
     cmdclass={"test": Test},
     long_description_content_type="text/x-rst",
     command_options={
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to license compatibility matrix."""
+
+import json
+import pytest
+from thoth.license_solver.compatibility import (
+    _MATRIX_PATH,
+    CompatibilityMatrix,
+    build_compatibility_matrix,
+    is_compatible,
+)
+from thoth.license_solver.solver import Solver
+
+
+class TestCompatibility:
+    """Test CompatibilityMatrix."""
+
+    solver: Solver = Solver()
+    matrix: CompatibilityMatrix = CompatibilityMatrix(solver.expressions)
+
+    @pytest.mark.parametrize(
+        "project,dependency,compatible",
+        [
+            ("MIT", "BSD-3-Clause", True),
+            ("MIT", "GPL-3.0-only", False),
+            ("Apache-2.0", "LGPL-2.1-only", True),
+            ("GPL-2.0-only", "Apache-2.0", False),
+            ("GPL-3.0-or-later", "Apache-2.0", True),
+            ("GPL-2.0-only", "GPL-3.0-only", False),
+            ("GPL-2.0-or-later", "GPL-3.0-only", True),
+            ("GPL-3.0-only", "AGPL-3.0-only", True),
+            ("GPL-3.0-only", "EPL-2.0", False),
+            ("MIT", "LicenseRef-foo", None),
+            ("GPL-2.0-only WITH Classpath-exception-2.0", "MIT", None),
+        ],
+    )
+    def test_is_compatible(self, project: str, dependency: str, compatible: bool) -> None:
+        """Test pairs of licenses."""
+        assert self.matrix.is_compatible(project, dependency) is compatible
+        assert is_compatible(project, dependency) is compatible
+
+    def test_matrix_data(self) -> None:
+        """Test shipped matrix matches rules for all SPDX licenses."""
+        data = build_compatibility_matrix(lic[1] for lic in self.solver.licenses.licenses_list)
+        with open(_MATRIX_PATH) as f:
+            assert data == json.load(f)
+        assert data["licenses"] == self.matrix.licenses
+        assert CompatibilityMatrix().is_compatible("mit", "gpl-3.0-only") is False
+
+    def test_check(self) -> None:
+        """Test all packages of output are checked against project license."""
+        solver = Solver()
+        for name, license_name in (
+            ("foo", "MIT"),
+            ("bar", "GPL-3.0-only"),
+            ("baz", "LGPL-3.0-only"),
+            ("qux", "MIT OR GPL-3.0-only"),
+            ("quux", "MIT AND GPL-3.0-only"),
+            ("corge", ""),
+        ):
+            solver.solve_from_file({"name": name, "version": "1.0", "license": license_name})
+
+        assert self.matrix.check("Apache-2.0", solver.output.file) == {
+            "conflicts": [("bar", "1.0", "GPL-3.0-only"), ("quux", "1.0", "MIT AND GPL-3.0-only")],
+            "unknown": [("corge", "1.0", "UNDETECTED")],
+        }
+        assert self.matrix.check("GPL-3.0-or-later", solver.output.file)["conflicts"] == []
+        assert self.matrix.check("GPL-2.0-only", solver.output.file)["conflicts"] == [
+            ("bar", "1.0", "GPL-3.0-only"),
+            ("baz", "1.0", "LGPL-3.0-only"),
+            ("quux", "1.0", "MIT AND GPL-3.0-only"),
+        ]
+
+    def test_unknown_project(self) -> None:
+        """Test packages are unknown if project license is not in matrix."""
+        solver = Solver()
+        solver.solve_from_file({"name": "foo", "version": "1.0", "license": "MIT"})
+        assert self.matrix.row("LicenseRef-foo") is None
+        assert self.matrix.check("LicenseRef-foo", solver.output.file) == {
+            "conflicts": [],
+            "unknown": [("foo", "1.0", "MIT")],
+        }
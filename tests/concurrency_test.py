@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to sharing one Solver by more threads."""
+
+import json
+import random
+import itertools
+import threading
+from typing import Any, Dict, List
+from thoth.license_solver.solver import Solver
+
+_LICENSES = ("MIT", "Apache 2.0", "BSD License", "GPLv3+", "UNKNOWN", "MIT OR Apache-2.0", "Released under MIT.")
+_CLASSIFIERS = ("License :: OSI Approved :: MIT License", "License :: OSI Approved :: Apache Software License")
+
+
+def _create_inputs() -> List[Dict[str, Any]]:
+    """Create package metadata, some package versions are repeated with a different license."""
+    inputs = list()
+    for i in range(400):
+        inputs.append(
+            {
+                "name": f"package-{i % 150}",
+                "version": f"1.{i % 3}",
+                "license": _LICENSES[i % len(_LICENSES)],
+                "classifier": [_CLASSIFIERS[i % len(_CLASSIFIERS)]],
+            }
+        )
+    return inputs
+
+
+def _dumps(solver: Solver) -> str:
+    """Serialize output of solver as it is printed."""
+    return json.dumps(solver.output.file)
+
+
+class TestConcurrency:
+    """Test solving packages by more threads with one shared solver."""
+
+    def test_output_matches_sequential_run(self) -> None:
+        """Test output of concurrent run is the same as output of sequential run."""
+        inputs = _create_inputs()
+        sequential = Solver()
+        for metadata in inputs:
+            sequential.solve_from_file(metadata)
+        expected = _dumps(sequential)
+
+        for seed in range(3):
+            shuffled = list(inputs)
+            random.Random(seed).shuffle(shuffled)
+            solver = Solver()
+            threads = [
+                threading.Thread(
+                    target=lambda chunk: [solver.solve_from_file(m) for m in chunk], args=(shuffled[i::8],)
+                )
+                for i in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert len(solver.output._partials) == 8
+            assert _dumps(solver) == expected
+
+    def test_conflicting_duplicates(self) -> None:
+        """Test conflicting records of one package version are reconciled independently of their order."""
+        first = {"name": "foo", "version": "1.0", "license": "MIT"}
+        second = {"name": "foo", "version": "1.0", "license": "Apache 2.0"}
+
+        third = {"name": "foo", "version": "1.0", "license": "BSD License", "classifier": [_CLASSIFIERS[0]]}
+
+        outputs = set()
+        for inputs in itertools.permutations((first, second, third)):
+            solver = Solver()
+            for metadata in inputs:
+                solver.solve_from_file(metadata)
+            assert solver.output.file["foo"]["1.0"]["warning"] is True
+            outputs.add(_dumps(solver))
+
+        assert len(outputs) == 1
+
+    def test_output_is_updated(self) -> None:
+        """Test merged output is recomputed after a package is added."""
+        solver = Solver()
+        solver.solve_from_file({"name": "foo", "version": "1.0", "license": "MIT"})
+        assert list(solver.output.file) == ["foo"]
+        solver.solve_from_file({"name": "bar", "version": "1.0", "license": "MIT"})
+        assert list(solver.output.file) == ["bar", "foo"]
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to deduplication of inputs with identical content."""
+
+import os
+import shutil
+from thoth.license_solver.dedup import ContentDeduplicator, content_hash
+from thoth.license_solver.solver import Solver
+
+_SOLVER_FILES = os.path.join("tests", "test_files", "solver", "test_solver_files")
+
+
+class TestDedup:
+    """Test ContentDeduplicator."""
+
+    def test_content_hash(self, tmp_path) -> None:
+        """Test hash depends only on content."""
+        (tmp_path / "a").write_bytes(b"x" * 100000)
+        (tmp_path / "b").write_bytes(b"x" * 100000)
+        (tmp_path / "c").write_bytes(b"x" * 99999 + b"y")
+        assert content_hash(str(tmp_path / "a")) == content_hash(str(tmp_path / "b"))
+        assert content_hash(str(tmp_path / "a")) != content_hash(str(tmp_path / "c"))
+        assert content_hash(str(tmp_path / "missing")) is None
+
+    def test_is_duplicate(self, tmp_path, monkeypatch) -> None:
+        """Test only files with colliding sizes are hashed."""
+        hashed = list()
+        monkeypatch.setattr("thoth.license_solver.dedup.content_hash", lambda path: hashed.append(path) or path[-1])
+
+        deduplicator = ContentDeduplicator()
+        assert not deduplicator.is_duplicate("a1", 10)
+        assert not deduplicator.is_duplicate("b2", 20)
+        assert hashed == []
+
+        assert not deduplicator.is_duplicate("c3", 10)
+        assert deduplicator.is_duplicate("d1", 10)
+        assert deduplicator.is_duplicate("e3", 10)
+        assert hashed == ["a1", "c3", "d1", "e3"]
+        assert (deduplicator.duplicates, deduplicator.duplicate_bytes) == (2, 20)
+
+    def test_solve_from_directory(self, tmp_path) -> None:
+        """Test copies of files are solved once with the same output."""
+        for file_name in os.listdir(_SOLVER_FILES):
+            shutil.copy(os.path.join(_SOLVER_FILES, file_name), tmp_path / file_name)
+            shutil.copy(os.path.join(_SOLVER_FILES, file_name), tmp_path / f"copy-{file_name}")
+        (tmp_path / "README.md").write_text("# Metadata")
+        (tmp_path / "copy-README.md").write_text("# Metadata")
+
+        solver = Solver()
+        solver.solve_from_directory(str(tmp_path))
+        expected = Solver(deduplicate=False)
+        expected.solve_from_directory(str(tmp_path))
+
+        assert solver.deduplicator is not None
+        assert solver.deduplicator.duplicates == len(os.listdir(_SOLVER_FILES))
+        assert solver.output.file == expected.output.file
+
+    def test_solve_from_directory_removed(self, tmp_path, monkeypatch) -> None:
+        """Test file removed during scan of directory is skipped."""
+        for file_name in os.listdir(_SOLVER_FILES):
+            shutil.copy(os.path.join(_SOLVER_FILES, file_name), tmp_path / file_name)
+
+        entries = sorted(os.scandir(tmp_path), key=lambda entry: entry.name)
+        os.remove(entries[0].path)
+        monkeypatch.setattr("thoth.license_solver.solver.os.scandir", lambda path: iter(entries))
+
+        solver = Solver()
+        solver.solve_from_directory(str(tmp_path))
+        expected = Solver(deduplicate=False)
+        expected.solve_from_directory(str(tmp_path))
+
+        assert not solver.output.is_empty()
+        assert solver.output.file == expected.output.file
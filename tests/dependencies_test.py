@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to solving transitive dependencies."""
+
+import json
+import pytest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List
+from thoth.license_solver.dependencies import get_dependencies, get_release_versions, parse_requirement, select_version
+from thoth.license_solver.pypi import PyPIClient
+from thoth.license_solver.solver import Solver
+
+# local index, latest release of each package is the last one
+INDEX = {
+    "app": {"1.0": ("MIT", ["Lib_A (<3,>=1.0)", "lib-b==1.0", "pytest; extra == 'test'"])},
+    "lib-a": {
+        "1.0": ("BSD-3-Clause", []),
+        "2.0": ("BSD-3-Clause", ["lib-c", "lib-b (==1.0) ; python_version >= '3.6'"]),
+        "2.5": ("BSD-3-Clause", []),
+        "3.0": ("MIT", []),
+    },
+    "lib-b": {"1.0": ("Apache-2.0", ["lib-c"]), "2.0": ("Apache-2.0", [])},
+    "lib-c": {"1.0": ("GPL-3.0-only", ["app", "missing"])},
+}
+YANKED = {("lib-a", "2.5")}
+
+
+class _FakePyPIHandler(BaseHTTPRequestHandler):
+    """Answer requests of PyPI JSON API from INDEX."""
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer metadata of package version, the latest release if version is not given."""
+        self.server.requests.append(self.path)  # type: ignore[attr-defined]
+        parts = self.path.strip("/").split("/")[1:-1]
+        releases = INDEX.get(parts[0].lower().replace("_", "-"), {})
+        version = parts[1] if len(parts) > 1 else (list(releases)[-1] if releases else None)
+        if version not in releases:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        license_name, requires_dist = releases[version]
+        info = {"name": parts[0], "version": version, "license": license_name, "requires_dist": requires_dist}
+        response: Dict[str, Any] = {"info": info}
+        if len(parts) == 1:
+            name = parts[0].lower().replace("_", "-")
+            response["releases"] = {v: [{"yanked": (name, v) in YANKED}] for v in releases}
+        payload = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args: Any) -> None:
+        """Don't log requests."""
+
+
+@pytest.fixture
+def index() -> Iterator[ThreadingHTTPServer]:
+    """Run local package index."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakePyPIHandler)
+    server.requests: List[str] = list()  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _solver(server: ThreadingHTTPServer) -> Solver:
+    """Create solver downloading metadata from local index."""
+    solver = Solver()
+    solver.pypi = PyPIClient(f"http://127.0.0.1:{server.server_address[1]}/pypi")
+    return solver
+
+
+class TestDependencies:
+    """Test solving of transitive dependencies."""
+
+    @pytest.mark.parametrize(
+        "requirement,parsed",
+        [
+            ("idna (<4,>=2.5)", ("idna", "<4,>=2.5")),
+            ("charset_normalizer<4,>=2", ("charset-normalizer", "<4,>=2")),
+            ("urllib3[secure]==1.26.0 ; python_version < '3.8'", ("urllib3", "==1.26.0")),
+            ("foo (==1.0.*)", ("foo", "==1.0.*")),
+            ("bar", ("bar", None)),
+            ('PySocks!=1.5.7,>=1.5.6; extra == "socks"', None),
+        ],
+    )
+    def test_parse_requirement(self, requirement: str, parsed: Any) -> None:
+        """Test parsing of requires_dist entries."""
+        assert parse_requirement(requirement) == parsed
+
+    def test_get_dependencies(self) -> None:
+        """Test each dependency is listed once."""
+        info = {"requires_dist": ["foo>=1.0", "Foo (<2) ; python_version < '3.8'", "bar==1.0"]}
+        assert get_dependencies(info) == [("foo", ">=1.0"), ("bar", "==1.0")]
+        assert get_dependencies({"requires_dist": None}) == []
+
+    @pytest.mark.parametrize(
+        "specifier,version",
+        [
+            (None, "4.0"),
+            ("<4,>=2.5", "3.9"),
+            ("==2.*", "2.0"),
+            (">=3.9.1", "4.0"),
+            (">4", "5.0rc1"),
+            (">5", None),
+            ("not a specifier", "4.0"),
+        ],
+    )
+    def test_select_version(self, specifier: Any, version: Any) -> None:
+        """Test the newest version allowed by specifier is selected, pre-releases only if no release is allowed."""
+        assert select_version(["1.0", "2.0", "3.0rc1", "3.9", "4.0", "5.0rc1", "invalid!"], specifier) == version
+
+    def test_get_release_versions(self) -> None:
+        """Test releases without files or with only yanked files are not listed."""
+        response = {
+            "info": {"version": "3.0"},
+            "releases": {
+                "1.0": [{"yanked": False}],
+                "2.0": [{"yanked": True}, {"yanked": False}],
+                "2.5": [{"yanked": True}],
+                "3.0": [],
+            },
+        }
+        assert get_release_versions(response) == ["1.0", "2.0"]
+        assert get_release_versions({"info": {"version": "3.0"}}) == ["3.0"]
+
+    def test_solve_dependencies(self, index: ThreadingHTTPServer) -> None:
+        """Test the whole graph is solved with the newest allowed versions and each one is downloaded once."""
+        solver = _solver(index)
+        tree = solver.solve_dependencies([("app", None)], workers=4)
+
+        assert tree == {
+            "app": {"1.0": {"license": "MIT", "dependencies": {"lib-a": "2.0", "lib-b": "1.0"}}},
+            "lib-a": {"2.0": {"license": "BSD-3-Clause", "dependencies": {"lib-c": "1.0", "lib-b": "1.0"}}},
+            "lib-b": {"1.0": {"license": "Apache-2.0", "dependencies": {"lib-c": "1.0"}}},
+            "lib-c": {"1.0": {"license": "GPL-3.0-only", "dependencies": {"app": "1.0"}}},
+        }
+        assert sorted(index.requests) == sorted(  # type: ignore[attr-defined]
+            [
+                "/pypi/app/json",
+                "/pypi/lib-a/json",
+                "/pypi/lib-a/2.0/json",
+                "/pypi/lib-b/1.0/json",
+                "/pypi/lib-c/json",
+                "/pypi/missing/json",
+            ]
+        )
+
+        output = solver.output.file
+        assert {name: list(versions) for name, versions in output.items()} == {
+            "app": ["1.0"],
+            "lib-a": ["2.0"],
+            "lib-b": ["1.0"],
+            "lib-c": ["1.0"],
+        }
+        assert output["lib-c"]["1.0"]["license"]["identifier_spdx"] == "GPL-3.0-only"
+
+    def test_max_depth(self, index: ThreadingHTTPServer) -> None:
+        """Test dependencies are solved only up to max depth."""
+        tree = _solver(index).solve_dependencies([("app", "1.0"), ("lib-b", "2.0")], max_depth=1)
+        assert {name: list(versions) for name, versions in tree.items()} == {
+            "app": ["1.0"],
+            "lib-b": ["2.0", "1.0"],
+            "lib-a": ["2.0"],
+        }
+        assert tree["lib-b"]["1.0"]["dependencies"] == {}
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to parsing SPDX license expressions."""
+
+from thoth.license_solver.expression import ExpressionParser, LicenseExpression, LicenseSymbol
+from thoth.license_solver.licenses import Licenses
+from thoth.license_solver.solver import Solver
+
+
+class TestExpression:
+    """Test ExpressionParser."""
+
+    parser: ExpressionParser = ExpressionParser(Licenses())
+
+    def test_parse_symbol(self) -> None:
+        """Test parsing single license identifier."""
+        assert self.parser.parse("mit") == LicenseSymbol("MIT", "MIT License")
+        assert not self.parser.parse("MIT").is_compound
+        assert str(self.parser.parse("LicenseRef-Proprietary")) == "LicenseRef-Proprietary"
+
+    def test_parse_expression(self) -> None:
+        """Test parsing compound expressions, operands are normalized."""
+        expression = self.parser.parse("mit or apache-2.0")
+        assert expression == LicenseExpression(
+            "OR", (LicenseSymbol("MIT", "MIT License"), LicenseSymbol("Apache-2.0", "Apache License 2.0"))
+        )
+        assert str(expression) == "MIT OR Apache-2.0"
+
+        expression = self.parser.parse("(BSD-3-Clause AND GPL-2.0-or-later WITH Classpath-exception-2.0)")
+        assert str(expression) == "BSD-3-Clause AND GPL-2.0-or-later WITH Classpath-exception-2.0"
+        assert [symbol.identifier for symbol in expression.symbols] == ["BSD-3-Clause", "GPL-2.0-or-later"]
+        assert expression.symbols[1].exception == "Classpath-exception-2.0"
+
+        # AND has higher precedence than OR
+        assert str(self.parser.parse("MIT OR BSD-3-Clause AND ISC")) == "MIT OR (BSD-3-Clause AND ISC)"
+        assert str(self.parser.parse("(MIT OR BSD-3-Clause) AND ISC")) == "(MIT OR BSD-3-Clause) AND ISC"
+        assert str(self.parser.parse("MIT OR (ISC OR Zlib)")) == "MIT OR ISC OR Zlib"
+
+    def test_parse_invalid(self) -> None:
+        """Test strings which are not expressions of known licenses."""
+        assert self.parser.parse("BSD License") is None
+        assert self.parser.parse("MIT or later") is None
+        assert self.parser.parse("MIT OR") is None
+        assert self.parser.parse("(MIT OR ISC") is None
+        assert self.parser.parse("MIT WITH") is None
+        assert self.parser.parse("MIT, see LICENSE") is None
+        assert self.parser.parse("") is None
+
+    def test_parse_cache(self) -> None:
+        """Test parsed expressions are memoized."""
+        parser = ExpressionParser(Licenses())
+        assert parser.parse("MIT OR ISC") is parser.parse("MIT OR ISC")
+        assert parser.parse.cache_info().hits == 1
+
+    def test_solver(self) -> None:
+        """Test license expression in solver output."""
+        solver = Solver()
+        solver.solve_from_file(
+            {
+                "name": "test",
+                "version": "1.0",
+                "license": "MIT",
+                "License-Expression": "mit OR Apache-2.0",
+                "classifiers": ["License :: OSI Approved :: Apache Software License"],
+            }
+        )
+        solver.solve_from_file({"name": "test", "version": "2.0", "license": "BSD License"})
+
+        assert solver.output.file["test"]["1.0"] == {
+            "license": {
+                "full_name": "MIT OR Apache-2.0",
+                "identifier_spdx": "MIT OR Apache-2.0",
+                "identifier": "MIT OR Apache-2.0",
+            },
+            "license_version": "UNDETECTED",
+            "classifier": [["License :: OSI Approved :: Apache Software License", "Apache Software License"]],
+            "warning": False,
+            "license_expression": "MIT OR Apache-2.0",
+        }
+        assert "license_expression" not in solver.output.file["test"]["2.0"]
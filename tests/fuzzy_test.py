@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to class FuzzyMatcher."""
+
+import os
+import time
+import pytest
+from thoth.license_solver.solver import Solver
+
+
+class TestFuzzyMatcher:
+    """Test FuzzyMatcher."""
+
+    solver: Solver = Solver()
+
+    def test_match(self) -> None:
+        """Test matching license names with typos."""
+        assert self.solver.fuzzy.match("Apache Licence 2")[0] == ["Apache License 2.0", "Apache-2.0", "Apache 2.0"]
+        assert self.solver.fuzzy.match("BSD-3 clause")[0][1] == "BSD-3-Clause"
+        assert self.solver.fuzzy.match("Mozilla Public Licence 2.0")[0][1] == "MPL-2.0"
+
+    def test_match_not_similar(self) -> None:
+        """Test strings which are not similar to any license."""
+        assert self.solver.fuzzy.match("89fdslkj94") is None
+        assert self.solver.fuzzy.match("") is None
+        assert self.solver.fuzzy.match("MIT " * 100) is None
+
+    def test_match_version_and_variant(self) -> None:
+        """Test version and variant of license are never changed by fuzzy matching."""
+        assert self.solver.fuzzy.match("Apache Licence 3") is None
+        assert self.solver.fuzzy.match("GNU Lesser General Public License v3 (LGPLv3)") is None
+
+    def test_match_more_licenses(self) -> None:
+        """Test more licenses joined in one string are never matched to one of them."""
+        assert self.solver.fuzzy.match("Apache License 2.0 or MIT") is None
+        assert self.solver.fuzzy.match("MIT and Apache License 2.0") is None
+        assert self.solver.fuzzy.match("Apache Licence 2 with MIT") is None
+        for license_name in ("Apache License 2.0 or MIT", "MIT and Apache License 2.0", "MIT or Apache Licence 2"):
+            assert self.solver._get_license_group(license_name) == (["UNDETECTED"], False)
+
+    def test_get_license_group(self) -> None:
+        """Test fuzzy matching is used when license is not found."""
+        assert self.solver._get_license_group("Apache Licence 2") == (
+            ["Apache License 2.0", "Apache-2.0", "Apache 2.0"],
+            True,
+        )
+
+    def test_match_many(self) -> None:
+        """Test lookups of many names, only names with the same version as a license are matched and cached."""
+        solver = Solver()
+        names = [f"Apache Licence {i}" for i in range(500)] + [f"Unknown license name {i}" for i in range(500)]
+
+        matched = [name for name in names if solver.fuzzy.match(name) is not None]
+        assert matched == ["Apache Licence 1", "Apache Licence 2"]
+        for name in names:
+            solver.fuzzy.match(name)
+        assert solver.fuzzy.match.cache_info().hits == len(names)  # type: ignore[attr-defined]
+
+    @pytest.mark.skipif(not os.environ.get("LICENSE_SOLVER_BENCHMARK"), reason="set LICENSE_SOLVER_BENCHMARK to run")
+    def test_benchmark(self) -> None:
+        """Benchmark lookup without cache, it should take less than a millisecond."""
+        names = [f"Apache Licence {i}" for i in range(500)] + [f"Unknown license name {i}" for i in range(500)]
+
+        start = time.perf_counter()
+        for name in names:
+            self.solver.fuzzy._match(name)
+        per_lookup = (time.perf_counter() - start) / len(names)
+
+        assert per_lookup < 0.001, f"Fuzzy lookup took {per_lookup * 1000:.3f} ms"
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to resolving licenses of GitHub repositories."""
+
+import re
+import json
+import pytest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Tuple
+from thoth.license_solver.github import GitHubLicenseResolver
+from thoth.license_solver.output_sqlite import SqliteOutput
+from thoth.license_solver.solver import Solver
+
+PRESCRIPTIONS = {"foo": "owner/foo", "bar": "https://github.com/owner/bar"}
+LICENSES = {("pallets", "flask"): "BSD-3-Clause", ("owner", "foo"): "Apache-2.0", ("owner", "bar"): "MIT"}
+
+
+class _FakeGraphQLHandler(BaseHTTPRequestHandler):
+    """Answer repository license queries of GitHub GraphQL API from LICENSES."""
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Answer query, each aliased repository field gets its license."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        variables = body["variables"]
+        self.server.queries.append(body)  # type: ignore[attr-defined]
+
+        if self.server.fail:  # type: ignore[attr-defined]
+            self.send_response(502)
+            self.end_headers()
+            return
+
+        if self.server.body is not None:  # type: ignore[attr-defined]
+            payload = json.dumps(self.server.body).encode()  # type: ignore[attr-defined]
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        data: Dict[str, Any] = dict()
+        for alias, owner, name in re.findall(r"(r\d+): repository\(owner: \$(o\d+), name: \$(n\d+)\)", body["query"]):
+            spdx_id = LICENSES.get((variables[owner], variables[name]))
+            data[alias] = {"licenseInfo": {"spdxId": spdx_id}} if spdx_id else None
+
+        payload = json.dumps({"data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer license of repository of REST API."""
+        self.server.queries.append(self.path)  # type: ignore[attr-defined]
+        match = re.match(r"^/repos/([^/]+)/([^/]+)/license$", self.path)
+        spdx_id = LICENSES.get((match.group(1), match.group(2))) if match else None
+        if self.server.fail or spdx_id is None:  # type: ignore[attr-defined]
+            self.send_response(403 if self.server.fail else 404)  # type: ignore[attr-defined]
+            self.end_headers()
+            return
+
+        payload = json.dumps({"license": {"spdx_id": spdx_id}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args: Any) -> None:
+        """Don't log requests."""
+
+
+@pytest.fixture
+def graphql() -> Iterator[ThreadingHTTPServer]:
+    """Run fake GitHub GraphQL endpoint."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeGraphQLHandler)
+    server.queries: List[Any] = list()  # type: ignore[attr-defined]
+    server.fail = False  # type: ignore[attr-defined]
+    server.body = None  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server: ThreadingHTTPServer) -> str:
+    """Get URL of fake endpoint."""
+    return f"http://127.0.0.1:{server.server_address[1]}/graphql"
+
+
+class TestGitHub:
+    """Test batched resolution of GitHub licenses."""
+
+    def test_resolve_in_batches(self, graphql: ThreadingHTTPServer) -> None:
+        """Test repositories are resolved with one query per batch."""
+        resolver = GitHubLicenseResolver(_url(graphql), token="token", batch_size=100)
+        repositories: List[Tuple[str, str]] = [("owner", f"repo-{i}") for i in range(247)]
+        repositories += list(LICENSES) + [("pallets", "flask")]
+
+        result = resolver.resolve(repositories)
+        assert len(graphql.queries) == 3  # type: ignore[attr-defined]
+        assert [len(query["variables"]) // 2 for query in graphql.queries] == [100, 100, 50]  # type: ignore
+        assert result[("pallets", "flask")] == "BSD-3-Clause"
+        assert result[("owner", "repo-0")] is None
+
+    def test_resolve_failure(self, graphql: ThreadingHTTPServer) -> None:
+        """Test failed query doesn't fail the run, repositories are not resolved."""
+        graphql.fail = True  # type: ignore[attr-defined]
+        resolver = GitHubLicenseResolver(_url(graphql), token="token")
+        assert resolver.resolve([("pallets", "flask")]) == {}
+
+    def test_resolve_rest(self, graphql: ThreadingHTTPServer) -> None:
+        """Test repositories are resolved with REST API without token."""
+        resolver = GitHubLicenseResolver(_url(graphql), token="", rest_url=_url(graphql).rsplit("/", 1)[0])
+        result = resolver.resolve([("pallets", "flask"), ("owner", "missing"), ("pallets", "flask")])
+        assert result == {("pallets", "flask"): "BSD-3-Clause", ("owner", "missing"): None}
+        assert graphql.queries == ["/repos/pallets/flask/license", "/repos/owner/missing/license"]  # type: ignore
+
+        graphql.fail = True  # type: ignore[attr-defined]
+        assert resolver.resolve([("pallets", "flask")]) == {}
+
+    def test_solver_github_check_unverified(self, graphql: ThreadingHTTPServer) -> None:
+        """Test packages are not reported as verified if their repositories can't be resolved."""
+        graphql.fail = True  # type: ignore[attr-defined]
+        solver = Solver(True, prescriptions=PRESCRIPTIONS)
+        resolver = solver.output.comparator.resolver
+        resolver.url = _url(graphql)  # type: ignore[union-attr]
+        resolver.token = "token"  # type: ignore[union-attr]
+
+        self._solve(solver)
+        output = solver.output.file
+        assert {name: output[name]["1.0"]["warning"] for name in output} == {"foo": True, "bar": True, "baz": False}
+        assert solver.output.github_verification.unverified == 2  # type: ignore[union-attr]
+        assert solver.detect({"name": "foo", "version": "2.0", "license": "MIT"})["foo"]["2.0"]["warning"] is True
+
+    @pytest.mark.parametrize(
+        "body,expected",
+        [
+            ([], {}),
+            ("x", {}),
+            ({"data": []}, {}),
+            ({"data": None, "errors": [{"message": "Bad credentials"}]}, {}),
+            ({"data": {"r0": []}}, {("pallets", "flask"): None}),
+        ],
+    )
+    def test_resolve_unexpected_response(self, graphql: ThreadingHTTPServer, body: Any, expected: Any) -> None:
+        """Test unexpected JSON response doesn't raise."""
+        graphql.body = body  # type: ignore[attr-defined]
+        resolver = GitHubLicenseResolver(_url(graphql), token="token")
+        assert resolver.resolve([("pallets", "flask")]) == expected
+
+    def test_verification_error(self, monkeypatch) -> None:
+        """Test error in background verification doesn't stop reading output."""
+        solver = Solver(True, prescriptions=PRESCRIPTIONS)
+        resolver = solver.output.comparator.resolver
+
+        def _resolve(repositories: Any) -> Any:
+            raise AttributeError("broken response")
+
+        monkeypatch.setattr(resolver, "resolve", _resolve)
+        self._solve(solver)
+        output = solver.output.file
+        # packages which were not verified are never reported as verified
+        assert {name: output[name]["1.0"]["warning"] for name in output} == {"foo": True, "bar": True, "baz": False}
+
+        # worker keeps running after the error
+        solver.solve_from_file({"name": "qux", "version": "1.0", "license": "MIT"})
+        assert "qux" in solver.output.file
+
+    @staticmethod
+    def _solve(solver: Solver) -> None:
+        """Solve packages with MIT license, GitHub reports a different license for foo."""
+        for name in ("foo", "bar", "baz"):
+            solver.solve_from_file(
+                {
+                    "name": name,
+                    "version": "1.0",
+                    "license": "MIT",
+                    "classifier": ["License :: OSI Approved :: MIT License"],
+                }
+            )
+
+    def test_solver_github_check(self, graphql: ThreadingHTTPServer, monkeypatch) -> None:
+        """Test local results are added first and warnings are updated by background verification."""
+        solver = Solver(True, prescriptions=PRESCRIPTIONS)
+        resolver = solver.output.comparator.resolver
+        resolver.url = _url(graphql)  # type: ignore[union-attr]
+        resolver.token = "token"  # type: ignore[union-attr]
+        gate = threading.Event()
+        resolve = resolver.resolve  # type: ignore[union-attr]
+        monkeypatch.setattr(resolver, "resolve", lambda repositories: gate.wait(10) and resolve(repositories))
+
+        self._solve(solver)
+        local = solver.output._merge()
+        assert {name: local[name]["1.0"]["warning"] for name in local} == {"foo": False, "bar": False, "baz": False}
+
+        gate.set()
+        output = solver.output.file
+        assert len(graphql.queries) == 1  # type: ignore[attr-defined]
+        assert {name: output[name]["1.0"]["warning"] for name in output} == {"foo": True, "bar": False, "baz": False}
+
+        # single package is checked immediately
+        assert solver.detect({"name": "foo", "version": "2.0", "license": "MIT"})["foo"]["2.0"]["warning"] is True
+        assert len(graphql.queries) == 2  # type: ignore[attr-defined]
+
+    def test_solver_github_check_sqlite(self, graphql: ThreadingHTTPServer, tmp_path) -> None:
+        """Test verification updates are written to SQLite and summary outputs."""
+        solver = Solver(True, str(tmp_path / "output.db"), 5, prescriptions=PRESCRIPTIONS)
+        solver.output.comparator.resolver.url = _url(graphql)  # type: ignore[union-attr]
+        solver.output.comparator.resolver.token = "token"  # type: ignore[union-attr]
+
+        self._solve(solver)
+        summary = solver.output.get_result()
+        assert summary["packages"] == 3
+        assert summary["warnings"] == 1
+        assert summary["licenses"]["MIT"]["warning_samples"] == ["foo==1.0"]
+
+        solver.close_output()
+        sqlite = SqliteOutput(str(tmp_path / "output.db"))
+        assert sqlite.get("foo", "1.0")["warning"] is True  # type: ignore[index]
+        assert sqlite.get("bar", "1.0")["warning"] is False  # type: ignore[index]
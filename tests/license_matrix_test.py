@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to batch identification of license texts with NumPy."""
+
+import pytest
+from thoth.license_solver.license_matrix import LicenseTextMatrix
+from thoth.license_solver.package import Package
+from thoth.license_solver.solver import Solver
+from .license_text_test import MIT_TEXT
+
+numpy = pytest.importorskip("numpy")
+
+
+class TestLicenseTextMatrix:
+    """Test LicenseTextMatrix."""
+
+    solver: Solver = Solver()
+
+    def test_identify(self) -> None:
+        """Test identification of a batch of license texts."""
+        texts = [MIT_TEXT, "This is not a license.", "", MIT_TEXT.upper()]
+        result = self.solver.get_license_groups_from_texts(texts)
+
+        assert [group[0][1] if group[1] else group[0] for group in result] == [
+            "MIT",
+            ["UNDETECTED"],
+            ["UNDETECTED"],
+            "MIT",
+        ]
+        assert self.solver.get_license_groups_from_texts([]) == []
+
+        package = Package()
+        package.set_license(result[0])
+        assert package.license["identifier_spdx"] == "MIT"
+
+    def test_same_as_classifier(self) -> None:
+        """Test batch results agree with the text classifier and do not depend on batch size."""
+        matrix = LicenseTextMatrix(batch_size=2)
+        texts = [MIT_TEXT, MIT_TEXT.replace("MIT License", ""), "License text", MIT_TEXT]
+
+        found = matrix.identify(texts)
+        assert [x[0] if x else None for x in found] == [
+            x[0] if x else None for x in map(self.solver.license_texts.identify, texts)
+        ]
+        assert found[0] == found[3]
+        assert 0.9 < found[0][1] <= 1.0
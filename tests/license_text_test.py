@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to identification of full license texts."""
+
+import json
+import zipfile
+from thoth.license_solver.license_text import fingerprint, normalize_text, similarity, build_fingerprints
+from thoth.license_solver.solver import Solver
+
+MIT_TEXT = """MIT License
+
+Copyright (c) 2021 Red Hat, Inc.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+class TestLicenseText:
+    """Test LicenseTextClassifier."""
+
+    solver: Solver = Solver()
+
+    def test_normalize_text(self) -> None:
+        """Test normalization of license text."""
+        assert normalize_text('Copyright (c) 2021 Foo\n\nTHE SOFTWARE is  PROVIDED "AS IS"') == [
+            "the",
+            "software",
+            "is",
+            "provided",
+            "as",
+            "is",
+        ]
+        assert normalize_text(
+            "Copyright <<var;name=copyright;original=<year> <owner>;match=.+>>\nsee <<beginOptional>>"
+        ) == ["see"]
+
+    def test_fingerprint(self) -> None:
+        """Test similarity of sketches."""
+        sketch = fingerprint(MIT_TEXT)
+        assert len(sketch) == len(set(sketch)) <= 128
+        assert similarity(sketch, fingerprint(MIT_TEXT.replace("Red Hat, Inc.", "Foo"))) == 1.0
+        assert similarity(sketch, fingerprint("This is not a license.")) == 0.0
+        assert fingerprint("") == ()
+
+    def test_identify(self) -> None:
+        """Test identification of license texts."""
+        assert self.solver.license_texts.identify(MIT_TEXT)[0] == "MIT"
+        assert self.solver.license_texts.identify(MIT_TEXT.replace("\n", " ").upper())[0] == "MIT"
+        assert self.solver.license_texts.identify("This is not a license.") is None
+        assert self.solver.license_texts.identify("") is None
+
+    def test_build_fingerprints(self, tmp_path) -> None:
+        """Test building fingerprints from directory with license texts."""
+        (tmp_path / "MIT.txt").write_text(MIT_TEXT)
+        (tmp_path / "MIT0.txt").write_text(MIT_TEXT)
+        (tmp_path / "README.md").write_text("not a license")
+
+        fingerprints = build_fingerprints(str(tmp_path))
+        assert json.loads(json.dumps(fingerprints)) == fingerprints
+        assert list(fingerprints["data"]) == ["MIT"]
+
+    def test_solve_license_text(self, tmp_path) -> None:
+        """Test solving packages with license text in metadata or license file in archive."""
+        self.solver.solve_from_file({"name": "foo", "version": "1.0", "license": MIT_TEXT})
+
+        wheel = str(tmp_path / "bar-1.0-py3-none-any.whl")
+        with zipfile.ZipFile(wheel, "w") as archive:
+            archive.writestr("bar-1.0.dist-info/METADATA", "Name: bar\nVersion: 1.0\nLicense: UNKNOWN\n")
+            archive.writestr("bar-1.0.dist-info/LICENSE.txt", MIT_TEXT)
+        self.solver.solve_from_archive(wheel)
+
+        for name in ("foo", "bar"):
+            package_data = self.solver.get_output_dict(package_name=name, package_version="1.0")
+            assert package_data["license"]["identifier_spdx"] == "MIT"
+            assert package_data["warning"] is False
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to parsing lockfiles."""
+
+import json
+import pytest
+from thoth.license_solver.exceptions import UnableOpenFile
+from thoth.license_solver.lockfile import parse_pipfile_lock, parse_requirements, deduplicate_pins
+from thoth.license_solver.solver import Solver
+
+PIPFILE_LOCK = {
+    "_meta": {"hash": {"sha256": "abc"}},
+    "default": {
+        "requests": {"hashes": ["sha256:abc"], "index": "pypi", "version": "==2.27.1"},
+        "click": {"version": "==8.0.4", "markers": "python_version >= '3.6'"},
+        "thoth-common": {"git": "https://github.com/thoth-station/common.git", "ref": "abc"},
+    },
+    "develop": {
+        "Requests": {"version": "==2.27.1"},
+        "pytest": {"version": "==7.1.2"},
+    },
+}
+
+REQUIREMENTS = """\
+# comment
+--index-url https://pypi.org/simple
+requests==2.27.1 \\
+    --hash=sha256:abc \\
+    --hash=sha256:def
+click[extra] == 8.0.4 ; python_version >= "3.6"  # inline comment
+pyyaml>=6.0
+-e git+https://github.com/thoth-station/common.git#egg=thoth-common
+Click==8.0.4
+"""
+
+
+class TestLockfile:
+    """Test lockfile parsing."""
+
+    def test_parse_pipfile_lock(self, tmp_path) -> None:
+        """Test parsing Pipfile.lock."""
+        file_path = tmp_path / "Pipfile.lock"
+        file_path.write_text(json.dumps(PIPFILE_LOCK))
+
+        assert parse_pipfile_lock(str(file_path)) == [
+            ("requests", "2.27.1"),
+            ("click", "8.0.4"),
+            ("pytest", "7.1.2"),
+        ]
+
+        with pytest.raises(UnableOpenFile):
+            parse_pipfile_lock(str(tmp_path / "missing"))
+
+    def test_parse_requirements(self, tmp_path) -> None:
+        """Test parsing requirements.txt."""
+        file_path = tmp_path / "requirements.txt"
+        file_path.write_text(REQUIREMENTS)
+
+        assert parse_requirements(str(file_path)) == [("requests", "2.27.1"), ("click", "8.0.4")]
+
+        with pytest.raises(UnableOpenFile):
+            parse_requirements(str(tmp_path / "missing"))
+
+    def test_deduplicate_pins(self) -> None:
+        """Test deduplication of pins."""
+        pins = [("Foo_Bar", "1.0"), ("foo-bar", "1.0"), ("foo.bar", "2.0")]
+        assert deduplicate_pins(pins) == [("Foo_Bar", "1.0"), ("foo.bar", "2.0")]
+
+    def test_solve_from_pins(self, monkeypatch) -> None:
+        """Test solving pins with a single solver."""
+
+        def _get_from_pypi(package_name, package_version, session=None):
+            if package_name == "missing":
+                return None
+            return {"info": {"name": package_name, "version": package_version, "license": "MIT"}}
+
+        monkeypatch.setattr(Solver, "_get_from_pypi", staticmethod(_get_from_pypi))
+
+        solver = Solver()
+        pins = [("foo", "1.0"), ("missing", "1.0"), ("bar", "2.0")]
+        latency = solver.solve_from_pins(pins, workers=2)
+
+        assert list(latency) == pins
+        assert all(duration >= 0 for duration in latency.values())
+        assert list(solver.output.file) == ["bar", "foo"]
+        assert solver.output.file["bar"]["2.0"]["license"]["identifier_spdx"] == "MIT"
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to class LicenseMentionScanner."""
+
+from thoth.license_solver.solver import Solver
+
+
+class TestLicenseMentionScanner:
+    """Test LicenseMentionScanner."""
+
+    solver: Solver = Solver()
+
+    def test_find(self) -> None:
+        """Test finding licenses mentioned in sentences."""
+        assert self.solver.mentions.find("Licensed under the MIT license, see LICENSE")[1] == "MIT"
+        assert self.solver.mentions.find("This is free software; BSD 3-Clause license applies")[1] == "BSD-3-Clause"
+        assert self.solver.mentions.find("Distributed under the terms of the GNU LGPL v2.1")[1] == "LGPL-2.1"
+
+    def test_find_nothing(self) -> None:
+        """Test texts without a license or with more licenses."""
+        # names are matched as whole words, short identifiers with the same case
+        assert self.solver.mentions.find("Please submit patches") is None
+        assert self.solver.mentions.find("see the doc directory") is None
+        assert self.solver.mentions.find("") is None
+        assert self.solver.mentions.find("Dual licensed: MIT or Apache 2.0") is None
+        # the other license is not known, e.g. because of a typo
+        assert self.solver.mentions.find("MIT or Apache Licence 2") is None
+        assert self.solver.mentions.find("Licensed under the MIT license and distributed as is")[1] == "MIT"
+
+    def test_find_qualified(self) -> None:
+        """Test "or later" and exceptions following license name are part of the license."""
+        assert self.solver.mentions.find("GNU GPL v2 or later")[1] == "GPL-2.0-or-later"
+        assert self.solver.mentions.find("Licensed under GNU LGPL v2.1 or any later version")[1] == "LGPL-2.1-or-later"
+        assert self.solver.mentions.find("GNU GPL v2 with classpath exception")[1] == "GPL-2.0-with-classpath-exception"
+        assert self.solver.mentions.find("GNU GPL v2")[1] == "GPL-2.0"
+
+    def test_find_unknown_qualified(self) -> None:
+        """Test license with unknown qualifier is not reported as the license without it."""
+        assert self.solver.mentions.find("MIT or later") is None
+        assert self.solver.mentions.find("GNU GPL v2 with foo exception") is None
+        assert self.solver.mentions.find("GNU GPL v2 or later with classpath exception") is None
+        assert self.solver._get_license_group("GNU GPL v2 with foo exception") == (["UNDETECTED"], False)
+
+    def test_mentions(self) -> None:
+        """Test positions of mentions, the longest name is preferred."""
+        text = "Code is under GNU General Public License v3.0 or later, docs under MIT."
+        mentions = self.solver.mentions.mentions(text)
+
+        assert [(text[start:end], lic_li[1]) for start, end, lic_li in mentions] == [
+            ("GNU General Public License v3.0 or later", "GPL-3.0+"),
+            ("MIT", "MIT"),
+        ]
+
+    def test_max_length(self) -> None:
+        """Test only the beginning of long texts is scanned."""
+        assert self.solver.mentions.find("Licensed under MIT. " + "x" * 10000)[1] == "MIT"
+        assert self.solver.mentions.find("x" * 10000 + " Licensed under MIT.") is None
+
+    def test_solve(self) -> None:
+        """Test solving license field with sentence."""
+        self.solver.solve_from_file({"name": "foo", "version": "1.0", "license": "Released under the MIT license."})
+
+        package_data = self.solver.get_output_dict(package_name="foo", package_version="1.0")
+        assert package_data["license"]["identifier_spdx"] == "MIT"
+        assert package_data["warning"] is False
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to merging outputs."""
+
+import io
+import json
+import pytest
+from typing import Any, Dict
+from thoth.license_solver.merge import merge_outputs, read_output
+from thoth.license_solver.solver import Solver
+from thoth.license_solver.exceptions import UnableOpenFile
+
+
+def _solve(*metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Get output of solver for metadata."""
+    solver = Solver()
+    for m in metadata:
+        solver.solve_from_file(m)
+    return solver.output.get_result()
+
+
+class TestMerge:
+    """Test merge of outputs."""
+
+    MIT = {"name": "foo", "version": "1.0", "license": "MIT"}
+    APACHE = {"name": "foo", "version": "1.0", "license": "Apache 2.0"}
+    BAR = {"name": "bar", "version": "2.0", "license": "BSD License"}
+    BAZ = {"name": "baz", "version": "0.1", "license": "GPLv3+"}
+
+    def test_merge_json_and_ndjson(self, tmp_path) -> None:
+        """Test result of merged outputs is the same as output of one run."""
+        first = tmp_path / "first.json"
+        first.write_text(json.dumps(_solve(self.MIT, self.BAR), indent=2))
+        second = tmp_path / "second.ndjson"
+        second.write_text("\n".join(json.dumps(_solve(m)) for m in (self.APACHE, self.BAZ, self.MIT)) + "\n")
+
+        expected = _solve(self.MIT, self.BAR, self.APACHE, self.BAZ)
+        for run_size in (1, 2, 100):
+            output = io.StringIO()
+            assert merge_outputs([str(first), str(second)], output, run_size=run_size) == 3
+            assert output.getvalue() == json.dumps(dict(sorted(expected.items()))) + "\n"
+            assert json.loads(output.getvalue())["foo"]["1.0"]["warning"] is True
+
+    def test_merge_ndjson_output(self, tmp_path) -> None:
+        """Test merged output with one package per line."""
+        path = tmp_path / "output.json"
+        path.write_text(json.dumps(_solve(self.BAZ, self.BAR)))
+
+        output = io.StringIO()
+        merge_outputs([str(path)], output, ndjson=True)
+        lines = output.getvalue().splitlines()
+        assert [list(json.loads(line)) for line in lines] == [["bar"], ["baz"]]
+
+    def test_read_output_in_small_chunks(self, tmp_path, monkeypatch) -> None:
+        """Test values split between chunks are decoded."""
+        monkeypatch.setattr("thoth.license_solver.merge._CHUNK_SIZE", 3)
+        path = tmp_path / "output.json"
+        path.write_text(json.dumps(_solve(self.MIT, self.BAR), indent=4))
+
+        assert [record[:2] for record in read_output(str(path))] == [("bar", "2.0"), ("foo", "1.0")]
+
+    def test_read_output_invalid(self, tmp_path) -> None:
+        """Test invalid output file."""
+        path = tmp_path / "output.json"
+        path.write_text('{"foo": {"1.0": ')
+
+        with pytest.raises(UnableOpenFile):
+            list(read_output(str(path)))
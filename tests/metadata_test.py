@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to reading core metadata."""
+
+import io
+import tarfile
+import zipfile
+from thoth.license_solver.metadata import parse_metadata, read_archive_metadata, get_archive_paths
+from thoth.license_solver.metadata import read_metadata_file, get_installed_metadata_paths
+from thoth.license_solver.solver import Solver
+
+METADATA = (
+    "Metadata-Version: 2.1\n"
+    "Name: requests\n"
+    "Version: 2.27.1\n"
+    "Summary: Python HTTP for Humans.\n"
+    "License: Apache 2.0\n"
+    "Classifier: License :: OSI Approved :: Apache Software License\n"
+    "Classifier: Programming Language :: Python :: 3\n"
+    "Requires-Dist: idna (<4,>=2.5)\n"
+    "\n"
+    "Name: not-a-header\n"
+)
+
+PACKAGE_DATA = {
+    "license": {"full_name": "Apache License 2.0", "identifier_spdx": "Apache-2.0", "identifier": "Apache 2.0"},
+    "license_version": "2.0",
+    "classifier": [["License :: OSI Approved :: Apache Software License", "Apache Software License"]],
+    "warning": False,
+}
+
+
+def _create_wheel(path: str, metadata: str = METADATA) -> None:
+    """Create wheel with metadata."""
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("requests/__init__.py", "")
+        archive.writestr("requests-2.27.1.dist-info/METADATA", metadata)
+
+
+def _create_sdist(path: str, metadata: str = METADATA) -> None:
+    """Create tar.gz sdist with metadata."""
+    with tarfile.open(path, "w:gz") as archive:
+        for name, content in (("requests-2.27.1/setup.py", ""), ("requests-2.27.1/PKG-INFO", metadata)):
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+class TestMetadata:
+    """Test reading metadata."""
+
+    def test_parse_metadata(self) -> None:
+        """Test parsing of RFC 822 headers."""
+        metadata = parse_metadata(METADATA)
+
+        assert metadata["Name"] == "requests"
+        assert metadata["Version"] == "2.27.1"
+        assert metadata["License"] == "Apache 2.0"
+        assert metadata["Classifier"] == [
+            "License :: OSI Approved :: Apache Software License",
+            "Programming Language :: Python :: 3",
+        ]
+        assert metadata["Requires-Dist"] == ["idna (<4,>=2.5)"]
+
+    def test_parse_metadata_continuation(self) -> None:
+        """Test parsing of multi-line header values."""
+        metadata = parse_metadata("name: foo\nlicense: MIT License\n        |\n        | Copyright (c) 2021\n")
+
+        assert metadata["Name"] == "foo"
+        assert metadata["License"] == "MIT License\n\nCopyright (c) 2021"
+
+    def test_read_archive_metadata(self, tmp_path) -> None:
+        """Test reading metadata from wheel and sdist."""
+        wheel = str(tmp_path / "requests-2.27.1-py3-none-any.whl")
+        sdist = str(tmp_path / "requests-2.27.1.tar.gz")
+        _create_wheel(wheel)
+        _create_sdist(sdist)
+
+        assert read_archive_metadata(wheel) == parse_metadata(METADATA)
+        assert read_archive_metadata(sdist) == parse_metadata(METADATA)
+        assert get_archive_paths(str(tmp_path)) == [wheel, sdist]
+
+    def test_read_archive_metadata_wrong(self, tmp_path) -> None:
+        """Test reading metadata from broken or unsupported archives."""
+        broken = tmp_path / "broken-1.0-py3-none-any.whl"
+        broken.write_text("not a zip")
+        empty = str(tmp_path / "empty-1.0-py3-none-any.whl")
+        with zipfile.ZipFile(empty, "w") as archive:
+            archive.writestr("empty/__init__.py", "")
+
+        assert read_archive_metadata(str(broken)) is None
+        assert read_archive_metadata(empty) is None
+        assert read_archive_metadata(str(tmp_path / "file.json")) is None
+
+    def test_solve_from_archives(self, tmp_path) -> None:
+        """Test solving archives."""
+        wheel = str(tmp_path / "requests-2.27.1-py3-none-any.whl")
+        sdist = str(tmp_path / "requests-2.26.0.tar.gz")
+        _create_wheel(wheel)
+        _create_sdist(sdist, METADATA.replace("2.27.1", "2.26.0"))
+
+        solver = Solver()
+        solver.solve_from_archives([wheel, sdist], workers=2)
+
+        assert solver.get_output_dict(package_name=None, package_version=None) == {
+            "requests": {"2.27.1": PACKAGE_DATA, "2.26.0": PACKAGE_DATA}
+        }
+
+    def test_site_packages(self, tmp_path) -> None:
+        """Test solving distributions installed in site-packages."""
+        (tmp_path / "requests").mkdir()
+        (tmp_path / "requests-2.27.1.dist-info").mkdir()
+        (tmp_path / "requests-2.27.1.dist-info" / "METADATA").write_text(METADATA)
+        (tmp_path / "requests-2.26.0-py3.8.egg-info").mkdir()
+        (tmp_path / "requests-2.26.0-py3.8.egg-info" / "PKG-INFO").write_text(METADATA.replace("2.27.1", "2.26.0"))
+        (tmp_path / "broken-1.0.dist-info").mkdir()
+
+        metadata_paths = get_installed_metadata_paths(str(tmp_path))
+        assert metadata_paths == [
+            str(tmp_path / "requests-2.26.0-py3.8.egg-info" / "PKG-INFO"),
+            str(tmp_path / "requests-2.27.1.dist-info" / "METADATA"),
+        ]
+        assert read_metadata_file(metadata_paths[1]) == parse_metadata(METADATA)
+        assert read_metadata_file(str(tmp_path / "broken-1.0.dist-info" / "METADATA")) is None
+
+        solver = Solver()
+        solver.solve_from_site_packages(str(tmp_path), workers=2)
+
+        assert solver.get_output_dict(package_name=None, package_version=None) == {
+            "requests": {"2.26.0": PACKAGE_DATA, "2.27.1": PACKAGE_DATA}
+        }
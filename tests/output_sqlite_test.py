@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to class SqliteOutput."""
+
+import os
+import sqlite3
+import pytest
+from thoth.license_solver.exceptions import UnableOpenFile
+from thoth.license_solver.output_sqlite import SqliteOutput
+from thoth.license_solver.solver import Solver
+
+
+class TestSqliteOutput:
+    """Test SqliteOutput."""
+
+    def test_put_get(self, tmp_path) -> None:
+        """Test storing and loading package data."""
+        package_data = {
+            "license": {"full_name": "MIT License", "identifier_spdx": "MIT", "identifier": "MIT"},
+            "license_version": "LICENSE-WITHOUT-VERSION",
+            "classifier": [["License :: OSI Approved :: MIT License", "MIT License"]],
+            "warning": False,
+        }
+        output = SqliteOutput(str(tmp_path / "output.db"), batch_size=2)
+
+        assert output.get("test", "1.0") is None
+        output.put("test", "1.0", package_data)
+        assert output.get("test", "1.0") == package_data
+        output.close()
+
+        with pytest.raises(UnableOpenFile):
+            SqliteOutput(str(tmp_path / "missing" / "output.db"))
+
+    def test_solver(self, tmp_path) -> None:
+        """Test solver writes results to SQLite output."""
+        file_path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), "test_files", "solver", "test_solver_files"
+        )
+        database = str(tmp_path / "output.db")
+
+        solver = Solver(output_sqlite=database)
+        solver.solve_from_directory(file_path)
+        solver.close_output()
+
+        assert solver.output.file == {}
+
+        expected = Solver()
+        expected.solve_from_directory(file_path)
+
+        connection = sqlite3.connect(database)
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {
+            "packages_license_identifier_spdx",
+            "packages_license_identifier",
+            "packages_warning",
+        } <= indexes
+
+        output = SqliteOutput(database)
+        count = 0
+        for name, versions in expected.output.file.items():
+            for version, package_data in versions.items():
+                assert output.get(name, version) == package_data
+                count += 1
+
+        assert connection.execute("SELECT COUNT(*) FROM packages").fetchone() == (count,)
+        warnings = connection.execute("SELECT name, version FROM packages WHERE warning = 1 ORDER BY version")
+        assert warnings.fetchall() == [
+            ("SQLAlchemy", "1.3.15"),
+            ("SQLAlchemy", "9.10"),
+            ("SQLAlchemy", "9.9"),
+        ]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to class SummaryOutput."""
+
+import os
+from thoth.license_solver.output_summary import SummaryOutput
+from thoth.license_solver.solver import Solver
+
+
+class TestSummaryOutput:
+    """Test SummaryOutput."""
+
+    def test_add(self) -> None:
+        """Test counting packages."""
+        mit = {"full_name": "MIT License", "identifier_spdx": "MIT", "identifier": "MIT"}
+        summary = SummaryOutput(samples=1)
+        summary.add("a", "1.0", {"license": mit, "warning": False})
+        summary.add("b", "1.0", {"license": mit, "warning": True})
+        summary.add("c", "1.0", {"license": mit, "warning": False})
+        summary.add("d", "1.0", {"license": None, "warning": False})
+
+        assert summary.as_dict() == {
+            "packages": 4,
+            "warnings": 1,
+            "licenses": {
+                "MIT": {
+                    "full_name": "MIT License",
+                    "packages": 3,
+                    "warnings": 1,
+                    "samples": ["a==1.0"],
+                    "warning_samples": ["b==1.0"],
+                },
+                "UNDETECTED": {
+                    "full_name": "UNDETECTED",
+                    "packages": 1,
+                    "warnings": 0,
+                    "samples": ["d==1.0"],
+                    "warning_samples": [],
+                },
+            },
+        }
+
+    def test_solver(self) -> None:
+        """Test solver in summary mode keeps no packages."""
+        file_path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), "test_files", "solver", "test_solver_files"
+        )
+        solver = Solver(summary=2)
+        solver.solve_from_directory(file_path)
+
+        result = solver.output.get_result()
+        assert solver.output.file == {}
+        assert result["packages"] == 14
+        assert result["warnings"] == 3
+        assert result["licenses"]["MIT"]["packages"] == 4
+        assert len(result["licenses"]["MIT"]["samples"]) == 2
+        assert result["licenses"]["UNDETECTED"]["warnings"] == 1
+        assert sum(entry["packages"] for entry in result["licenses"].values()) == 14
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to license policy."""
+
+import pytest
+from typing import Any, Dict
+from thoth.license_solver.policy import LicensePolicy, license_family, ALLOW, REVIEW, DENY
+from thoth.license_solver.solver import Solver
+from thoth.license_solver.exceptions import InvalidPolicy, UnableOpenFile
+
+RULES = {
+    "default": "review",
+    "allow": {"spdx": ["MIT", "Apache-2.0"], "family": ["BSD"]},
+    "review": {"family": ["LGPL"]},
+    "deny": {
+        "family": ["GPL", "AGPL"],
+        "spdx": ["UNDETECTED"],
+        "classifier": ["GNU General Public License v3 (GPLv3)"],
+    },
+}
+
+
+class TestPolicy:
+    """Test LicensePolicy."""
+
+    solver: Solver = Solver()
+    policy: LicensePolicy = LicensePolicy(RULES, solver.licenses, solver.classifiers, solver.expressions)
+
+    def _verdict(self, metadata: Dict[str, Any]) -> str:
+        """Get verdict of package metadata."""
+        output = self.solver.detect({"name": "foo", "version": "1.0", **metadata})
+        return self.policy.evaluate(output["foo"]["1.0"])  # type: ignore[no-any-return]
+
+    def test_license_family(self) -> None:
+        """Test family of SPDX identifier."""
+        assert license_family("GPL-2.0-or-later") == "gpl"
+        assert license_family("BSD-3-Clause") == "bsd"
+        assert license_family("CC-BY-4.0") == "cc-by"
+        assert license_family("0BSD") == "0bsd"
+
+    @pytest.mark.parametrize(
+        "license_name,verdict",
+        [
+            ("MIT", ALLOW),
+            ("BSD-3-Clause", ALLOW),
+            ("LGPL-2.1-only", REVIEW),
+            ("GPL-3.0-only", DENY),
+            ("UNKNOWN", DENY),
+            ("MPL-2.0", REVIEW),
+            ("MIT OR GPL-3.0-only", ALLOW),
+            ("MIT AND GPL-3.0-only", DENY),
+            ("(MIT OR GPL-2.0-only) AND LGPL-2.1-only", REVIEW),
+        ],
+    )
+    def test_license_verdict(self, license_name: str, verdict: str) -> None:
+        """Test verdicts of licenses and expressions."""
+        assert self._verdict({"license": license_name}) == verdict
+
+    def test_classifier_verdict(self) -> None:
+        """Test classifier rule is applied even if license is allowed."""
+        classifier = "License :: OSI Approved :: GNU General Public License v3 (GPLv3)"
+        assert self._verdict({"license": "MIT", "classifiers": [classifier]}) == DENY
+        assert self._verdict({"license": "", "classifiers": []}) == DENY
+
+    def test_check(self) -> None:
+        """Test all packages of output are checked."""
+        solver = Solver()
+        for name, license_name in (("foo", "MIT"), ("bar", "GPL-3.0-only"), ("baz", "LGPL-3.0-only")):
+            solver.solve_from_file({"name": name, "version": "1.0", "license": license_name})
+
+        assert self.policy.check(solver.output.file) == {REVIEW: [("baz", "1.0")], DENY: [("bar", "1.0")]}
+
+    @pytest.mark.parametrize(
+        "rules", [[], {"default": "maybe"}, {"permit": {}}, {"deny": ["MIT"]}, {"deny": {"spdx": "MIT"}}]
+    )
+    def test_invalid(self, rules: Any) -> None:
+        """Test invalid policies."""
+        with pytest.raises(InvalidPolicy):
+            LicensePolicy(rules, self.solver.licenses, self.solver.classifiers, self.solver.expressions)
+
+    def test_from_file(self, tmp_path) -> None:
+        """Test policy is loaded from YAML file."""
+        path = tmp_path / "policy.yaml"
+        path.write_text("default: allow\ndeny:\n  spdx: [MIT]\n")
+        policy = LicensePolicy.from_file(
+            str(path), self.solver.licenses, self.solver.classifiers, self.solver.expressions
+        )
+        assert policy.default == ALLOW
+
+        with pytest.raises(UnableOpenFile):
+            LicensePolicy.from_file(
+                str(tmp_path / "missing.yaml"), self.solver.licenses, self.solver.classifiers, self.solver.expressions
+            )
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to local index of prescriptions."""
+
+import os
+import json
+import pytest
+from thoth.license_solver.comparator import Comparator
+from thoth.license_solver.prescriptions import load_prescriptions
+from thoth.license_solver.exceptions import UnableOpenFile
+
+GH_LINK = """\
+units:
+  wraps:
+  - name: {name}_gh_link
+    type: wrap
+    should_include:
+      adviser_pipeline: true
+    match:
+      state:
+        resolved_dependencies:
+          name: {name}
+    run:
+      justification:
+      - type: INFO
+        message: Found GitHub repository for {name}
+        link: {link}
+"""
+
+
+def _write_prescription(root, name: str, link: str) -> None:
+    """Write gh_link.yaml prescription in layout of thoth-station/prescriptions."""
+    directory = root / "prescriptions" / f"{name[:2]}_" / name
+    directory.mkdir(parents=True)
+    (directory / "gh_link.yaml").write_text(GH_LINK.format(name=name, link=link))
+
+
+class TestPrescriptions:
+    """Test index of prescriptions."""
+
+    def test_build_index(self, tmp_path) -> None:
+        """Test links are indexed by package name."""
+        _write_prescription(tmp_path, "flask", "https://github.com/pallets/flask")
+        _write_prescription(tmp_path, "scikit-learn", "https://gitlab.com/foo/bar")
+        (tmp_path / "prescriptions" / "broken").mkdir()
+        (tmp_path / "prescriptions" / "broken" / "gh_link.yaml").write_text("units: [")
+
+        index = load_prescriptions(str(tmp_path))
+        assert index == {"flask": "pallets/flask", "scikit-learn": "https://gitlab.com/foo/bar"}
+
+    def test_persisted_index(self, tmp_path) -> None:
+        """Test index is loaded from file until prescriptions change."""
+        _write_prescription(tmp_path, "flask", "https://github.com/pallets/flask")
+        index_path = str(tmp_path / "index.json")
+
+        assert load_prescriptions(str(tmp_path), index_path) == {"flask": "pallets/flask"}
+        with open(index_path, "w") as f:
+            json.dump({"flask": "cached/flask"}, f)
+        assert load_prescriptions(str(tmp_path), index_path) == {"flask": "cached/flask"}
+        assert load_prescriptions(None, index_path) == {"flask": "cached/flask"}
+
+        _write_prescription(tmp_path, "requests", "https://github.com/psf/requests")
+        os.utime(index_path, (0, 0))
+        assert load_prescriptions(str(tmp_path), index_path) == {
+            "flask": "pallets/flask",
+            "requests": "psf/requests",
+        }
+
+    def test_missing(self, tmp_path) -> None:
+        """Test missing directory and index."""
+        with pytest.raises(UnableOpenFile):
+            load_prescriptions(str(tmp_path / "missing"))
+        with pytest.raises(UnableOpenFile):
+            load_prescriptions(None, str(tmp_path / "missing.json"))
+
+    def test_comparator_lookup(self, monkeypatch) -> None:
+        """Test comparator uses the index instead of downloading prescriptions."""
+        comparator = Comparator(True, {"flask": "pallets/flask"})
+        monkeypatch.setattr(comparator, "_get_prescription", pytest.fail)
+
+        assert comparator._get_link("Flask") == "pallets/flask"
+        assert comparator._get_link("missing") is None
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to downloading metadata from PyPI."""
+
+import json
+import requests
+from typing import Any, List, Optional
+from thoth.license_solver.pypi import CircuitBreaker, PyPIClient
+
+
+class _Response:
+    """Response of fake session."""
+
+    def __init__(self, status_code: int, body: Any = None) -> None:
+        """Create response with JSON body."""
+        self.status_code = status_code
+        self.text = json.dumps(body)
+
+
+class _Session:
+    """Fake HTTP session which records requests and replays responses."""
+
+    def __init__(self, *responses: Any) -> None:
+        """Create session, the last response is repeated."""
+        self.responses = list(responses)
+        self.requests: List[str] = list()
+        self.timeouts: List[Any] = list()
+
+    def get(self, url: str, headers: Optional[dict] = None, timeout: Any = None) -> _Response:
+        """Record request and return next response."""
+        self.requests.append(url)
+        self.timeouts.append(timeout)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response  # type: ignore[no-any-return]
+
+
+class TestPyPIClient:
+    """Test PyPIClient."""
+
+    def test_get(self) -> None:
+        """Test metadata are downloaded with timeout."""
+        session = _Session(_Response(200, {"info": {"name": "foo"}}))
+        client = PyPIClient(timeout=(1.0, 2.0))
+
+        assert client.get("foo", "1.0", session) == {"info": {"name": "foo"}}  # type: ignore[arg-type]
+        assert session.requests == ["https://pypi.org/pypi/foo/1.0/json"]
+        assert session.timeouts == [(1.0, 2.0)]
+
+    def test_negative_cache(self) -> None:
+        """Test missing package is requested only once."""
+        session = _Session(_Response(404))
+        client = PyPIClient()
+
+        for name in ("Foo_Bar", "foo-bar", "foo.bar"):
+            assert client.get(name, "1.0", session) is None  # type: ignore[arg-type]
+        assert client.get("foo-bar", "2.0", session) is None  # type: ignore[arg-type]
+        assert len(session.requests) == 2
+
+    def test_negative_cache_expires(self) -> None:
+        """Test missing package is requested again after TTL."""
+        session = _Session(_Response(404), _Response(200, {"info": {}}))
+        client = PyPIClient(negative_ttl=0)
+
+        assert client.get("foo", None, session) is None  # type: ignore[arg-type]
+        assert client.get("foo", None, session) == {"info": {}}  # type: ignore[arg-type]
+        assert len(session.requests) == 2
+
+    def test_circuit_breaker(self) -> None:
+        """Test requests are short-circuited after consecutive failures."""
+        session = _Session(requests.Timeout("timed out"))
+        client = PyPIClient(circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=3600))
+
+        for i in range(10):
+            assert client.get(f"package-{i}", "1.0", session) is None  # type: ignore[arg-type]
+        assert len(session.requests) == 3
+        assert client.circuit_breaker.is_open
+
+    def test_circuit_breaker_probe(self) -> None:
+        """Test circuit is closed after successful probe request."""
+        session = _Session(_Response(503), _Response(503), _Response(200, {"info": {}}))
+        client = PyPIClient(circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0))
+
+        assert client.get("foo", "1.0", session) is None  # type: ignore[arg-type]
+        assert client.get("foo", "1.0", session) is None  # type: ignore[arg-type]
+        assert client.circuit_breaker.is_open
+        assert client.get("foo", "1.0", session) == {"info": {}}  # type: ignore[arg-type]
+        assert not client.circuit_breaker.is_open
+
+    def test_failed_probe_opens_circuit(self) -> None:
+        """Test only one probe is sent after reset timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert breaker.is_open
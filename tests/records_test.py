@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to interned records."""
+
+import copy
+import json
+import pickle
+import pytest
+from thoth.license_solver.package import Package
+from thoth.license_solver.output_creator import OutputCreator
+from thoth.license_solver.records import intern_license, intern_classifier, freeze_package_data
+
+
+class TestRecords:
+    """Test interned records."""
+
+    def test_intern_license(self) -> None:
+        """Test license records are shared and immutable."""
+        record = intern_license("MIT License", "MIT", "MIT")
+
+        assert record is intern_license("MIT License", "MIT", "MIT")
+        assert record == {"full_name": "MIT License", "identifier_spdx": "MIT", "identifier": "MIT"}
+        assert json.dumps(record) == '{"full_name": "MIT License", "identifier_spdx": "MIT", "identifier": "MIT"}'
+
+        with pytest.raises(TypeError):
+            record["full_name"] = "Apache"
+        with pytest.raises(TypeError):
+            record.update(full_name="Apache")
+
+        assert pickle.loads(pickle.dumps(record)) == record
+        assert copy.deepcopy(record) == record
+
+    def test_intern_classifier(self) -> None:
+        """Test classifier records are shared and immutable."""
+        record = intern_classifier([["License :: OSI Approved :: MIT License", "MIT License"]])
+
+        assert record is intern_classifier([("License :: OSI Approved :: MIT License", "MIT License")])
+        assert record == [["License :: OSI Approved :: MIT License", "MIT License"]]
+
+        with pytest.raises(TypeError):
+            record.append(["UNDETECTED"])
+        with pytest.raises(TypeError):
+            record[0].append("UNDETECTED")
+
+    def test_freeze_package_data(self) -> None:
+        """Test plain package data are converted to shared record."""
+        package_data = {
+            "license": {"full_name": "MIT License", "identifier_spdx": "MIT", "identifier": "MIT"},
+            "license_version": "LICENSE-WITHOUT-VERSION",
+            "classifier": [["UNDETECTED"]],
+            "warning": False,
+        }
+
+        assert freeze_package_data(package_data) is freeze_package_data(dict(package_data))
+        assert freeze_package_data(package_data) == package_data
+
+    def test_shared_output(self) -> None:
+        """Test packages with the same license share records in output."""
+        output_creator = OutputCreator()
+        for version in ("1.0", "2.0"):
+            package = Package()
+            package.set_package_name("test")
+            package.set_version(version)
+            package.set_license((["MIT License", "MIT", "MIT"], True))
+            package.set_classifier(["License :: OSI Approved :: MIT License", "MIT License"])
+            output_creator.add_package(package)
+
+        assert output_creator.file["test"]["1.0"] is output_creator.file["test"]["2.0"]
+
+        with pytest.raises(AttributeError):
+            package.attribute = "value"
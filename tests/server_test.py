@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to HTTP server."""
+
+import json
+import threading
+import http.client
+from typing import Any, Tuple
+from thoth.license_solver.server import SolverServer
+from thoth.license_solver.solver import Solver
+
+METADATA = {
+    "info": {
+        "name": "requests",
+        "version": "2.27.1",
+        "license": "Apache 2.0",
+        "classifiers": ["License :: OSI Approved :: Apache Software License"],
+    }
+}
+
+
+class TestServer:
+    """Test SolverServer."""
+
+    solver: Solver = Solver()
+
+    @staticmethod
+    def _request(connection: http.client.HTTPConnection, method: str, path: str, body: Any = None) -> Tuple[int, Any]:
+        """Send request over kept alive connection."""
+        connection.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_server(self) -> None:
+        """Test detection endpoints, connection is reused for all requests."""
+        server = SolverServer(("127.0.0.1", 0), self.solver)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+            expected = self.solver.detect(METADATA)
+            assert expected["requests"]["2.27.1"]["license"]["identifier_spdx"] == "Apache-2.0"
+
+            for _ in range(3):
+                assert self._request(connection, "POST", "/detect", METADATA) == (200, expected)
+
+            status, result = self._request(connection, "POST", "/detect/batch", [METADATA, {"name": "no-version"}])
+            assert (status, result) == (200, [expected, {}])
+
+            assert self._request(connection, "POST", "/detect/batch", METADATA)[0] == 400
+            status, result = self._request(connection, "POST", "/detect", {"name": "x", "version": "1", "license": 5})
+            assert status == 500 and "error" in result
+            assert self._request(connection, "POST", "/unknown", METADATA)[0] == 404
+            assert self._request(connection, "GET", "/health") == (200, {"status": "ok"})
+
+            status, metrics = self._request(connection, "GET", "/metrics")
+            assert status == 200
+            assert metrics["/detect"]["requests"] == 4
+            assert metrics["/detect"]["cache_hits"] == 2
+            assert metrics["/detect"]["errors"] == 1
+            assert metrics["/detect/batch"]["errors"] == 1
+            assert metrics["/detect"]["p50_ms"] <= metrics["/detect"]["max_ms"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_detect_does_not_change_output(self) -> None:
+        """Test detection of server does not add packages to output."""
+        self.solver.detect(METADATA)
+        assert self.solver.output.is_empty()
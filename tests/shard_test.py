@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to partitioning inputs to shards."""
+
+import io
+import os
+import json
+import pytest
+from thoth.license_solver.merge import merge_outputs
+from thoth.license_solver.shard import Shard, path_key, package_key
+from thoth.license_solver.solver import Solver
+
+_SOLVER_FILES = os.path.join("tests", "test_files", "solver", "test_solver_files")
+
+
+class TestShard:
+    """Test Shard."""
+
+    def test_parse(self) -> None:
+        """Test parsing shard."""
+        assert Shard.parse("2/5") == Shard(2, 5)
+        assert str(Shard.parse("0/1")) == "0/1"
+
+    @pytest.mark.parametrize("value", ["1", "5/5", "-1/2", "a/2", "0/0", "1/2/3"])
+    def test_parse_invalid(self, value: str) -> None:
+        """Test invalid shards."""
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+    def test_keys(self) -> None:
+        """Test keys don't depend on location of inputs."""
+        assert path_key("/mnt/a/foo-1.0.json") == path_key("/data/foo-1.0.json") == "foo-1.0.json"
+        assert path_key("/site-packages/foo-1.0.dist-info/METADATA") == "foo-1.0.dist-info"
+        assert package_key("Foo_Bar") == package_key("foo.bar") == "foo-bar"
+
+    def test_partition(self) -> None:
+        """Test each key is in exactly one shard and shards are balanced."""
+        keys = [f"package-{i}" for i in range(10000)]
+        shards = [Shard(i, 4) for i in range(4)]
+
+        sizes = [sum(1 for key in keys if shard.contains(key)) for shard in shards]
+        assert sum(sizes) == len(keys)
+        assert all(abs(size - len(keys) / 4) < len(keys) * 0.05 for size in sizes)
+        assert all(Shard(0, 1).contains(key) for key in keys)
+
+    def test_solve_directory(self, tmp_path) -> None:
+        """Test merged outputs of all shards are the same as output of one run."""
+        expected = Solver()
+        expected.solve_from_directory(_SOLVER_FILES)
+
+        paths = list()
+        for index in range(3):
+            solver = Solver(shard=Shard(index, 3))
+            solver.solve_from_directory(_SOLVER_FILES)
+            paths.append(str(tmp_path / f"shard-{index}.json"))
+            solver.save_output(paths[-1])
+
+        output = io.StringIO()
+        merge_outputs(paths, output)
+        assert json.loads(output.getvalue()) == expected.output.file
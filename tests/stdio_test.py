@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests related to co-process mode over STDIN and STDOUT."""
+
+import io
+import json
+from thoth.license_solver.solver import Solver
+from thoth.license_solver.stdio import serve_stdio, PARSE_ERROR, INVALID_PARAMS, METHOD_NOT_FOUND, SERVER_ERROR
+
+METADATA = {"name": "foo", "version": "1.0", "license": "MIT"}
+
+
+class TestStdio:
+    """Test serve_stdio."""
+
+    solver: Solver = Solver()
+
+    def _serve(self, *lines: str) -> list:
+        """Serve lines and parse responses."""
+        output = io.StringIO()
+        assert serve_stdio(self.solver, io.StringIO("\n".join(lines) + "\n"), output) == len([x for x in lines if x])
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_detect(self, monkeypatch) -> None:
+        """Test requests with metadata, file path and package name."""
+
+        def _get_from_pypi(package_name, package_version, session=None):
+            if package_name == "missing":
+                return None
+            return {"info": {"name": package_name, "version": package_version, "license": "MIT"}}
+
+        monkeypatch.setattr(Solver, "_get_from_pypi", staticmethod(_get_from_pypi))
+        expected = self.solver.detect(METADATA)
+
+        responses = self._serve(
+            json.dumps({"jsonrpc": "2.0", "id": 1, "method": "detect", "params": METADATA}),
+            "",
+            json.dumps({"id": "2", "method": "detect_pypi", "params": {"name": "foo", "version": "1.0"}}),
+            json.dumps({"id": 3, "method": "detect_file", "params": {"path": "tests/examples/request_example.json"}}),
+        )
+
+        assert responses[0] == {"jsonrpc": "2.0", "id": 1, "result": expected}
+        assert responses[1] == {"jsonrpc": "2.0", "id": "2", "result": expected}
+        assert responses[2]["result"]["requests"]["2.27.1"]["license"]["identifier_spdx"] == "Apache-2.0"
+        assert self.solver.output.is_empty()
+
+    def test_errors(self, monkeypatch) -> None:
+        """Test each wrong request gets error response."""
+        monkeypatch.setattr(Solver, "_get_from_pypi", staticmethod(lambda *args, **kwargs: None))
+
+        responses = self._serve(
+            "not json",
+            json.dumps({"id": 1, "method": "unknown", "params": {}}),
+            json.dumps({"id": 2, "method": "detect", "params": []}),
+            json.dumps({"id": 3, "method": "detect_file", "params": {"path": "missing.json"}}),
+            json.dumps({"id": 4, "method": "detect_pypi", "params": {"name": "missing"}}),
+        )
+
+        assert [(response["id"], response["error"]["code"]) for response in responses] == [
+            (None, PARSE_ERROR),
+            (1, METHOD_NOT_FOUND),
+            (2, INVALID_PARAMS),
+            (3, SERVER_ERROR),
+            (4, SERVER_ERROR),
+        ]
+
+    def test_default_streams(self, monkeypatch) -> None:
+        """Test STDIN and STDOUT are looked up when requests are served, so they can be redirected."""
+        output = io.StringIO()
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps({"id": 1, "method": "detect", "params": METADATA})))
+        monkeypatch.setattr("sys.stdout", output)
+
+        assert serve_stdio(self.solver) == 1
+        assert json.loads(output.getvalue())["result"] == self.solver.detect(METADATA)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests related to watching directories."""
+
+import io
+import os
+import json
+import pytest
+import threading
+from typing import Any, Dict, List
+from thoth.license_solver.solver import Solver
+from thoth.license_solver.watch import DirectoryWatcher, solve_files, watch
+
+
+class _Stream(io.StringIO):
+    """Stream which signals each written line."""
+
+    def __init__(self) -> None:
+        """Init stream."""
+        super().__init__()
+        self.lines: List[Dict[str, Any]] = list()
+        self.written = threading.Semaphore(0)
+
+    def write(self, text: str) -> int:
+        """Store written line."""
+        self.lines.append(json.loads(text))
+        self.written.release()
+        return len(text)
+
+
+def _write(path: Any, name: str, license_name: str) -> None:
+    """Write metadata file, it is moved to its place at once."""
+    temp = path.parent / f".{path.name}.tmp"
+    temp.write_text(json.dumps({"name": name, "version": "1.0", "license": license_name}))
+    os.replace(temp, path)
+
+
+class TestWatch:
+    """Test watching of directories."""
+
+    solver: Solver = Solver()
+
+    def test_scan(self, tmp_path) -> None:
+        """Test only new and modified JSON files are found."""
+        _write(tmp_path / "foo.json", "foo", "MIT")
+        (tmp_path / "subdirectory").mkdir()
+        (tmp_path / "README.md").write_text("# Metadata")
+        (tmp_path / ".foo.json.tmp").write_text("{")
+        watcher = DirectoryWatcher([str(tmp_path)], use_inotify=False)
+        assert watcher.scan() == [str(tmp_path / "foo.json")]
+        assert watcher.scan() == []
+
+        _write(tmp_path / "bar.json", "bar", "MIT")
+        _write(tmp_path / "foo.json", "foo", "Apache-2.0")
+        assert watcher.scan() == [str(tmp_path / "bar.json"), str(tmp_path / "foo.json")]
+        assert watcher.scan() == []
+
+    def test_solve_files(self, tmp_path) -> None:
+        """Test each solved file is appended as one line, broken files are skipped."""
+        _write(tmp_path / "foo.json", "foo", "MIT")
+        (tmp_path / "broken.json").write_text('{"name": ')
+        (tmp_path / "invalid.json").write_text(json.dumps({"name": "bar", "version": "1.0", "license": 5}))
+        paths = [str(tmp_path / file_name) for file_name in ("broken.json", "invalid.json", "foo.json")]
+        stream = io.StringIO()
+
+        assert solve_files(self.solver, paths, stream) == 1
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["foo"]["1.0"]["license"]["identifier_spdx"] == "MIT"
+        assert self.solver.output.is_empty()
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_watch(self, tmp_path, use_inotify: bool) -> None:
+        """Test existing files are solved first and new files are solved while watching."""
+        _write(tmp_path / "foo.json", "foo", "MIT")
+        stream = _Stream()
+        stop = threading.Event()
+        thread = threading.Thread(target=watch, args=(self.solver, [str(tmp_path)], stream, 0.05, stop, use_inotify))
+        thread.start()
+        try:
+            assert stream.written.acquire(timeout=10)
+            _write(tmp_path / "bar.json", "bar", "Apache-2.0")
+            assert stream.written.acquire(timeout=10)
+        finally:
+            stop.set()
+            thread.join(10)
+
+        assert not thread.is_alive()
+        assert [list(line) for line in stream.lines] == [["foo"], ["bar"]]
+        assert stream.lines[1]["bar"]["1.0"]["license"]["identifier_spdx"] == "Apache-2.0"
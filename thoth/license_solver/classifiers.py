@@ -32,8 +32,9 @@ class Classifiers:
     """Class detect all classifiers from downloaded data."""
 
     data = attr.ib(init=False, type=str)
-    classifiers: List[str] = attr.ib(init=True, default=list())
-    classifiers_list: List[Any] = list()
+    classifiers: List[str] = attr.ib(init=True, factory=list)
+    # list is created for each instance, class-level list would grow with every new instance
+    classifiers_list: List[Any] = attr.ib(init=False, factory=list)
 
     def __attrs_post_init__(self) -> None:
         """INIT method."""
@@ -19,17 +19,41 @@
 """solver-license-jon CLI."""
 import os
 import sys
+import json
 import click
 import logging
+from typing import Optional
 
 from thoth.common import init_logging
 from thoth.license_solver.solver import Solver
+from thoth.license_solver.metadata import get_archive_paths
+from thoth.license_solver.merge import merge_outputs
+from thoth.license_solver.lockfile import parse_pipfile_lock, parse_requirements, deduplicate_pins
+from thoth.license_solver.server import serve as run_server
+from thoth.license_solver.stdio import serve_stdio
+from thoth.license_solver.watch import watch as watch_directories
+from thoth.license_solver.shard import Shard
+from thoth.license_solver.prescriptions import load_prescriptions
+from thoth.license_solver.policy import LicensePolicy, DENY, REVIEW
+from thoth.license_solver.compatibility import CompatibilityMatrix
+from thoth.license_solver.exceptions import InvalidPolicy, UnableOpenFile, UnableOpenFileData
 from thoth.license_solver import __version__ as license_solver_version
 
 init_logging()
 _LOGGER = logging.getLogger("thoth.license_solver")
 
 
+def _parse_shard(ctx: click.Context, _, value: Optional[str]) -> Optional[Shard]:
+    """Parse shard in form INDEX/COUNT."""
+    if value is None:
+        return None
+
+    try:
+        return Shard.parse(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
 def _print_version(ctx: click.Context, _, value: str) -> None:
     """Print license-solver version and exit."""
     if not value or ctx.resilient_parsing:
@@ -91,7 +115,7 @@ class OptionEatAll(click.Option):
         return retval
 
 
-@click.command(context_settings=dict(max_content_width=160))
+@click.group(context_settings=dict(max_content_width=160), invoke_without_command=True)
 @click.pass_context
 @click.option(
     "-v",
@@ -124,6 +148,43 @@ class OptionEatAll(click.Option):
     help="Get licenses from folder.",
     envvar="THOTH_SOLVER_LICENSE_JOB_DIRECTORY",
 )
+@click.option(
+    "--no-dedup",
+    is_flag=True,
+    help="Solve all files of --directory inputs, also files with the same content as an already solved file.",
+    envvar="THOTH_SOLVER_LICENSE_NO_DEDUP",
+)
+@click.option(
+    "-a",
+    "--archive",
+    type=tuple,
+    cls=OptionEatAll,
+    help="Get licenses from wheel/sdist archives or from folders with archives.",
+    envvar="THOTH_SOLVER_LICENSE_JOB_ARCHIVE",
+)
+@click.option(
+    "-sp",
+    "--site-packages",
+    type=tuple,
+    cls=OptionEatAll,
+    help="Get licenses of distributions installed in site-packages folders.",
+    envvar="THOTH_SOLVER_LICENSE_SITE_PACKAGES",
+)
+@click.option(
+    "-ce",
+    "--current-environment",
+    is_flag=True,
+    help="Get licenses of distributions installed in site-packages of the current interpreter.",
+    envvar="THOTH_SOLVER_LICENSE_CURRENT_ENVIRONMENT",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    nargs=1,
+    help="Number of threads used for reading inputs in parallel.",
+    envvar="THOTH_SOLVER_LICENSE_WORKERS",
+)
 @click.option(
     "-pn",
     "--package-name",
@@ -140,6 +201,49 @@ class OptionEatAll(click.Option):
     help="Get license with specific version.",
     envvar="THOTH_SOLVER_LICENSE_PACKAGE_VERSION",
 )
+@click.option(
+    "-t",
+    "--transitive",
+    is_flag=True,
+    help="Get licenses of all transitive dependencies of --package-name packages from PyPI.",
+    envvar="THOTH_SOLVER_LICENSE_TRANSITIVE",
+)
+@click.option(
+    "--max-depth",
+    type=int,
+    help="Maximal depth of transitive dependencies, all dependencies are solved if not set.",
+    envvar="THOTH_SOLVER_LICENSE_MAX_DEPTH",
+)
+@click.option(
+    "--dependency-tree",
+    type=str,
+    help="Save tree of transitive dependencies with their licenses to JSON file.",
+    envvar="THOTH_SOLVER_LICENSE_DEPENDENCY_TREE",
+)
+@click.option(
+    "-pl",
+    "--pipfile-lock",
+    type=tuple,
+    cls=OptionEatAll,
+    help="Get licenses of all packages pinned in Pipfile.lock files from PyPI.",
+    envvar="THOTH_SOLVER_LICENSE_PIPFILE_LOCK",
+)
+@click.option(
+    "-r",
+    "--requirements",
+    type=tuple,
+    cls=OptionEatAll,
+    help="Get licenses of all packages pinned in requirements files from PyPI.",
+    envvar="THOTH_SOLVER_LICENSE_REQUIREMENTS",
+)
+@click.option(
+    "--shard",
+    type=str,
+    callback=_parse_shard,
+    help="Solve only inputs of shard INDEX/COUNT (index starts at 0), inputs are partitioned by stable hash of file "
+    "names and package names.",
+    envvar="THOTH_SOLVER_LICENSE_SHARD",
+)
 @click.option(
     "-o",
     "--output",
@@ -147,6 +251,51 @@ class OptionEatAll(click.Option):
     help="Save output to JSON file.",
     envvar="THOTH_SOLVER_LICENSE_OUTPUT",
 )
+@click.option(
+    "-os",
+    "--output-sqlite",
+    type=str,
+    help="Save output to SQLite database while solving, JSON output is not created (except --summary).",
+    envvar="THOTH_SOLVER_LICENSE_OUTPUT_SQLITE",
+)
+@click.option(
+    "-s",
+    "--summary",
+    is_flag=True,
+    help="Create only summary of packages per license and warning, packages are not kept in memory.",
+    envvar="THOTH_SOLVER_LICENSE_SUMMARY",
+)
+@click.option(
+    "-ss",
+    "--summary-samples",
+    type=int,
+    nargs=1,
+    default=5,
+    show_default=True,
+    help="Number of sample packages per license in summary.",
+    envvar="THOTH_SOLVER_LICENSE_SUMMARY_SAMPLES",
+)
+@click.option(
+    "--stdio",
+    is_flag=True,
+    help="Answer JSON-RPC requests read line by line from STDIN, responses are written line by line to STDOUT.",
+    envvar="THOTH_SOLVER_LICENSE_STDIO",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep solving new and modified files in --directory inputs until interrupted, results are appended to "
+    "--output (or printed) as one JSON object per line.",
+    envvar="THOTH_SOLVER_LICENSE_WATCH",
+)
+@click.option(
+    "--watch-interval",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Seconds between scans of watched directories, directories are scanned only after a change with inotify.",
+    envvar="THOTH_SOLVER_LICENSE_WATCH_INTERVAL",
+)
 @click.option(
     "-np",
     "--no-print",
@@ -171,16 +320,61 @@ class OptionEatAll(click.Option):
     help="Check licenses with Github repository.",
     envvar="THOTH_SOLVER_LICENSE_GITHUB_CHECK",
 )
+@click.option(
+    "--prescriptions",
+    type=str,
+    help="Local checkout of thoth-station/prescriptions used by --github-check instead of downloading prescriptions.",
+    envvar="THOTH_SOLVER_LICENSE_PRESCRIPTIONS",
+)
+@click.option(
+    "--prescriptions-index",
+    type=str,
+    help="File where index of prescriptions is persisted, it is rebuilt only if prescriptions changed.",
+    envvar="THOTH_SOLVER_LICENSE_PRESCRIPTIONS_INDEX",
+)
+@click.option(
+    "--policy",
+    type=str,
+    help="Check packages with allow/review/deny rules from YAML or JSON file, exit with status 1 if any is denied.",
+    envvar="THOTH_SOLVER_LICENSE_POLICY",
+)
+@click.option(
+    "--project-license",
+    type=str,
+    help="Check that licenses of all packages can be used by project with SPDX license, exit with status 1 if not.",
+    envvar="THOTH_SOLVER_LICENSE_PROJECT_LICENSE",
+)
 def cli(
     ctx: click.Context,
     directory: tuple,
+    no_dedup: bool,
+    archive: tuple,
+    site_packages: tuple,
     file: tuple,
     package_name: str,
     package_version: str,
+    transitive: bool,
+    max_depth: Optional[int],
+    dependency_tree: Optional[str],
+    pipfile_lock: tuple,
+    requirements: tuple,
+    shard: Optional[Shard],
     output: str,
+    output_sqlite: Optional[str],
+    summary: bool,
+    summary_samples: int,
+    stdio: bool,
+    watch: bool,
+    watch_interval: float,
     no_print: bool,
     pretty_printing: int,
     github_check: bool = False,
+    prescriptions: Optional[str] = None,
+    prescriptions_index: Optional[str] = None,
+    policy: Optional[str] = None,
+    project_license: Optional[str] = None,
+    current_environment: bool = False,
+    workers: Optional[int] = None,
     verbose: bool = False,
 ) -> None:
     """
@@ -193,10 +387,102 @@ def cli(
         _LOGGER.setLevel(logging.DEBUG)
         _LOGGER.debug("Debug mode is on")
 
-    license_solver = Solver(github_check)
+    prescriptions_links = None
+    if github_check and (prescriptions or prescriptions_index):
+        try:
+            prescriptions_links = load_prescriptions(prescriptions, prescriptions_index)
+        except UnableOpenFile as e:
+            _LOGGER.error("%s", e)
+            exit(1)
+
+    ctx.obj = dict(github_check=github_check, prescriptions=prescriptions_links)
+    if ctx.invoked_subcommand is not None:
+        # subcommand creates its own solver
+        return
+
+    try:
+        license_solver = Solver(
+            github_check,
+            output_sqlite,
+            summary_samples if summary else None,
+            shard,
+            prescriptions_links,
+            deduplicate=not no_dedup,
+        )
+    except UnableOpenFile as e:
+        _LOGGER.error("%s", e)
+        exit(1)
+
+    license_policy = None
+    if policy:
+        if summary or output_sqlite:
+            _LOGGER.error("Policy can't be checked with --summary or --output-sqlite, packages are not kept in memory")
+            exit(1)
+
+        try:
+            license_policy = LicensePolicy.from_file(
+                policy, license_solver.licenses, license_solver.classifiers, license_solver.expressions
+            )
+        except (UnableOpenFile, InvalidPolicy) as e:
+            _LOGGER.error("%s", e)
+            exit(1)
+
+    compatibility = None
+    if project_license:
+        if summary or output_sqlite:
+            _LOGGER.error(
+                "Compatibility can't be checked with --summary or --output-sqlite, packages are not kept in memory"
+            )
+            exit(1)
+
+        try:
+            compatibility = CompatibilityMatrix(license_solver.expressions)
+        except UnableOpenFileData as e:
+            _LOGGER.error("%s", e)
+            exit(1)
+
+        if compatibility.row(project_license) is None:
+            _LOGGER.error("License %s is not in compatibility matrix", project_license)
+            exit(1)
+
+    if stdio:
+        # co-process mode, other inputs are not solved
+        serve_stdio(license_solver)
+        return
+    if watch:
+        if not directory:
+            print(ctx.get_help(), "\n\n--watch is used with --directory.", file=sys.stderr)
+            exit(1)
+
+        output_stream = open(output, "a") if output else sys.stdout
+        try:
+            count = watch_directories(license_solver, directory, output_stream, watch_interval)
+        except KeyboardInterrupt:
+            _LOGGER.info("Watching of directories was stopped")
+            return
+        finally:
+            if output:
+                output_stream.close()
+
+        _LOGGER.info("Solved %d packages", count)
+        return
 
     # package argument
-    if package_name is not None:
+    if package_name and transitive:
+        if len(package_name) > 1 and package_version:
+            _LOGGER.warning("Can't insert version to multiple package_name entry.")
+            exit(1)
+
+        tree = license_solver.solve_dependencies([(pn, package_version) for pn in package_name], workers, max_depth)
+        _LOGGER.info("Resolved %d packages in dependency tree", sum(len(versions) for versions in tree.values()))
+        if dependency_tree:
+            try:
+                with open(dependency_tree, "w") as f:
+                    json.dump(tree, f, indent=pretty_printing if pretty_printing >= 0 else None)
+            except OSError as e:
+                _LOGGER.error("Dependency tree can't be saved to %s: %s", dependency_tree, e)
+                exit(1)
+    elif package_name is not None:
         if len(package_name) > 1:
             if package_version:
                 _LOGGER.warning("Can't insert version to multiple package_name entry.")
@@ -211,6 +497,28 @@ def cli(
             print(ctx.get_help(), "\n\n--package-version is used with --package-name.", file=sys.stderr)
             exit(1)
 
+    # lockfile arguments
+    if pipfile_lock or requirements:
+        pins = list()
+        try:
+            for pl in pipfile_lock or ():
+                pins.extend(parse_pipfile_lock(pl))
+            for r in requirements or ():
+                pins.extend(parse_requirements(r))
+        except UnableOpenFile as e:
+            _LOGGER.error("%s", e)
+            exit(1)
+
+        pins = deduplicate_pins(pins)
+        latency = sorted(license_solver.solve_from_pins(pins, workers).values())
+        if latency:
+            _LOGGER.info(
+                "Resolved %d pins, latency p50: %.3f s, max: %.3f s",
+                len(latency),
+                latency[len(latency) // 2],
+                latency[-1],
+            )
+
     # directory argument
     if directory:
         for d in directory:
@@ -221,6 +529,42 @@ def cli(
             _LOGGER.debug("Parsing directory: %s", d)
             license_solver.solve_from_directory(d)
 
+        deduplicator = license_solver.deduplicator
+        if deduplicator is not None and deduplicator.duplicates:
+            _LOGGER.info(
+                "Skipped %d files (%d bytes) with the same content as an already solved file",
+                deduplicator.duplicates,
+                deduplicator.duplicate_bytes,
+            )
+
+    # archive argument
+    if archive:
+        archive_paths = list()
+        for a in archive:
+            if os.path.isdir(a):
+                archive_paths.extend(get_archive_paths(a))
+            elif os.path.isfile(a):
+                archive_paths.append(a)
+            else:
+                _LOGGER.warning("Not a valid archive or directory %r [SKIPPED].", a)
+
+        _LOGGER.debug("Parsing %d archives", len(archive_paths))
+        license_solver.solve_from_archives(archive_paths, workers)
+
+    # site-packages argument
+    if site_packages:
+        for sp in site_packages:
+            if not os.path.isdir(sp):
+                _LOGGER.warning("Not a valid site-packages directory %r [SKIPPED].", sp)
+                continue
+
+            _LOGGER.debug("Parsing site-packages: %s", sp)
+            license_solver.solve_from_site_packages(sp, workers)
+
+    if current_environment:
+        _LOGGER.debug("Parsing site-packages of the current interpreter")
+        license_solver.solve_from_site_packages(workers=workers)
+
     # file argument
     if file:
         for f in file:
@@ -231,11 +575,118 @@ def cli(
             _LOGGER.debug("Parsing file: %s", f)
             license_solver.solve_from_file(f)
 
+    if output_sqlite:
+        license_solver.close_output()
+        _LOGGER.debug("Output saved to SQLite database %s", output_sqlite)
+        if not summary:
+            return
+
     if output:
         license_solver.save_output(output, pretty_printing)
 
     if not no_print:
         license_solver.print_output(pretty_printing)
 
+    if license_policy is not None:
+        violations = license_policy.check(license_solver.output.file)
+        for name, version in violations[REVIEW]:
+            _LOGGER.warning("License of package %s==%s needs review", name, version)
+        for name, version in violations[DENY]:
+            _LOGGER.error("License of package %s==%s is denied by policy", name, version)
+
+        if violations[DENY]:
+            exit(1)
+
+    if compatibility is not None and project_license:
+        report = compatibility.check(project_license, license_solver.output.file)
+        for name, version, identifier in report["unknown"]:
+            _LOGGER.warning("Compatibility of license %s of package %s==%s is unknown", identifier, name, version)
+        for name, version, identifier in report["conflicts"]:
+            _LOGGER.error(
+                "License %s of package %s==%s is not compatible with %s", identifier, name, version, project_license
+            )
+
+        if report["conflicts"]:
+            exit(1)
+
+
+@cli.command()
+@click.pass_context
+@click.option(
+    "-H",
+    "--host",
+    type=str,
+    default="127.0.0.1",
+    show_default=True,
+    help="Address to listen on.",
+    envvar="THOTH_SOLVER_LICENSE_HOST",
+)
+@click.option(
+    "-p",
+    "--port",
+    type=int,
+    default=8080,
+    show_default=True,
+    help="Port to listen on.",
+    envvar="THOTH_SOLVER_LICENSE_PORT",
+)
+def serve(ctx: click.Context, host: str, port: int) -> None:
+    """
+    Run HTTP server with preloaded solver.
+
+    POST /detect accepts metadata dictionary, POST /detect/batch accepts list of them, GET /metrics shows request
+    latencies.
+    """
+    try:
+        license_solver = Solver(ctx.obj["github_check"], prescriptions=ctx.obj["prescriptions"])
+    except UnableOpenFile as e:
+        _LOGGER.error("%s", e)
+        exit(1)
+
+    run_server(host, port, license_solver)
+
+
+@cli.command()
+@click.argument("inputs", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "-o",
+    "--output",
+    type=str,
+    help="Save merged output to file instead of printing it on STDOUT.",
+    envvar="THOTH_SOLVER_LICENSE_OUTPUT",
+)
+@click.option(
+    "--ndjson",
+    is_flag=True,
+    help="Write one package per line.",
+    envvar="THOTH_SOLVER_LICENSE_NDJSON",
+)
+@click.option(
+    "--run-size",
+    type=int,
+    default=100000,
+    show_default=True,
+    help="Number of package versions sorted in memory at once.",
+    envvar="THOTH_SOLVER_LICENSE_RUN_SIZE",
+)
+def merge(inputs: tuple, output: Optional[str], ndjson: bool, run_size: int) -> None:
+    """
+    Merge outputs of more runs, e.g. of shards.
+
+    Inputs are JSON outputs or NDJSON files with one output object per line. Duplicate package versions are
+    reconciled the same way as in one run, packages are sorted in the merged output.
+    """
+    try:
+        if output:
+            with open(output, "w") as f:
+                count = merge_outputs(inputs, f, ndjson, run_size)
+        else:
+            count = merge_outputs(inputs, sys.stdout, ndjson, run_size)
+    except UnableOpenFile as e:
+        _LOGGER.error("%s", e)
+        exit(1)
+
+    _LOGGER.debug("Merged %d packages from %d files", count, len(inputs))
+
 
 __name__ == "__main__" and cli()
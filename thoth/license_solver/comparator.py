@@ -20,12 +20,13 @@
 import os
 import re
 import yaml
-import json
 import logging
 import urllib.request
 import urllib.error
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional
 from .package import Package
+from .github import GitHubLicenseResolver, Repository, github_license_matches, parse_repository
+from .prescriptions import prescription_name, get_prescription_link
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,14 +42,25 @@ def _delete_brackets_and_content(license_list: str) -> str:
 class Comparator:
     """Class Comparator compare classifiers and licenses."""
 
-    def __init__(self, github: bool = False) -> None:
+    def __init__(
+        self,
+        github: bool = False,
+        prescriptions: Optional[Dict[str, str]] = None,
+        resolver: Optional[GitHubLicenseResolver] = None,
+    ) -> None:
         """
         Init class variables.
 
         :param: github: check license with github repository
+        :param prescriptions: index of GitHub repositories from local prescriptions, None to download prescriptions
+        :param resolver: resolver of licenses of GitHub repositories, a default one is created for github check
         :return: None
         """
         self.github: bool = github
+        self.prescriptions: Optional[Dict[str, str]] = prescriptions
+        self.resolver: Optional[GitHubLicenseResolver] = resolver
+        if github and resolver is None:
+            self.resolver = GitHubLicenseResolver()
         self._comparator_dictionary: Dict[str, Any] = self.open_dictionary()
 
     def open_dictionary(self) -> Any:
@@ -72,30 +84,51 @@ class Comparator:
         :param package: Package from input
         :return: True if match, False if not
         """
+        matched = self.compare_classifier(package)
+        if matched is None:
+            return True
+
+        return matched if not self.github or not matched else self.check_github(package)
+
+    def compare_classifier(self, package: Package) -> Optional[bool]:
+        """
+        Compare License and Classifier from package data without github check.
+
+        :param package: Package from input
+        :return: True if match, False if not, None if license or classifier is missing
+        """
         license_name = package.license
         classifier_name = package.classifier
 
         debug_tab = 10 * "\t"
 
         if not license_name or not classifier_name:
-            return True
-
-        license_list = [license_name["full_name"], license_name["identifier_spdx"], license_name["identifier"]]
+            return None
+
+        if package.license_expression is not None:
+            # any license of compound expression can match classifier
+            license_lists = [
+                [symbol.full_name, symbol.identifier, symbol.identifier.replace("-", " ")]
+                for symbol in package.license_expression.symbols
+            ]
+        else:
+            license_lists = [[license_name["full_name"], license_name["identifier_spdx"], license_name["identifier"]]]
 
         for x in classifier_name:
 
             _LOGGER.debug("Compare license and classifier:\n" "%s%s\n" "%s%s", debug_tab, license_name, debug_tab, x)
 
-            if (
-                list(set(license_list) & set(x))
-                or self.search_in_dictionary(license_list, x)
-                or classifier_name[0][0] == "UNDETECTED"
-                or license_list[0] == "UNKNOWN"
-                or license_list[0].lower() == "the unlicense"
-            ):
-                _LOGGER.debug("Found match or alias")
+            for license_list in license_lists:
+                if (
+                    list(set(license_list) & set(x))
+                    or self.search_in_dictionary(license_list, x)
+                    or classifier_name[0][0] == "UNDETECTED"
+                    or license_list[0] == "UNKNOWN"
+                    or license_list[0].lower() == "the unlicense"
+                ):
+                    _LOGGER.debug("Found match or alias")
 
-                return True if not self.github else self.check_github(package)
+                    return True
 
         _LOGGER.debug("No match")
         return False
@@ -105,20 +138,34 @@ class Comparator:
         Compare github license with PyPI license.
 
         :param package: name of package to check
-        :return: True if match, False if not
+        :return: True if match, False if not or if license of repository can't be resolved
         """
-        prescription = self._get_prescription(package.name)
+        repository = self.get_repository(package.name)
 
-        if prescription is None:
-            _LOGGER.warning("Failed to check github license for %s", package.name)
+        if repository is None or self.resolver is None:
             return True
 
-        link = prescription["units"]["wraps"][0]["run"]["justification"][0]["link"]
-        owner, repo = link.split("/")[-2:]
-        url = f"https://api.github.com/repos/{owner}/{repo}/license"
-        data_api_github = json.loads(urllib.request.urlopen(url).read().decode())
+        verdicts = self.resolver.resolve([repository])
+        if repository not in verdicts:
+            _LOGGER.warning("License of %s can't be verified with GitHub repository", package.name)
+            return False
 
-        return True if data_api_github["license"]["spdx_id"] in package.license["identifier_spdx"] else False
+        return github_license_matches(package.license["identifier_spdx"], verdicts[repository])
+
+    def get_repository(self, package_name: str) -> Optional[Repository]:
+        """
+        Get owner and name of GitHub repository of package from its prescription.
+
+        :param package_name: Package name
+        :return: owner and name, None if package has no prescription
+        """
+        link = self._get_link(package_name)
+        repository = parse_repository(link) if link is not None else None
+
+        if repository is None:
+            _LOGGER.warning("Failed to check github license for %s", package_name)
+
+        return repository
 
     def search_in_dictionary(self, license_name: List[str], classifier: List[str]) -> bool:
         """
@@ -142,6 +189,22 @@ class Comparator:
 
         return False
 
+    def _get_link(self, package_name: str) -> Optional[str]:
+        """
+        Get link to GitHub repository of package, local index of prescriptions is used if it was loaded.
+
+        :param package_name: Package name
+        :return: link or "owner/repo", None if package has no prescription
+        """
+        if self.prescriptions is not None:
+            return self.prescriptions.get(prescription_name(package_name).lower())
+
+        prescription = self._get_prescription(package_name)
+        if prescription is None:
+            return None
+
+        return get_prescription_link(prescription)
+
     def _get_prescription(self, package_name: str) -> Any:
         """
         Get prescription from https://github.com/thoth-station/prescriptions.
@@ -149,7 +212,7 @@ class Comparator:
         :param package_name: Package name
         :return: None if method failed, yaml if prescription is found
         """
-        name = re.sub("[^a-zA-z0-9]", "-", package_name)
+        name = prescription_name(package_name)
         url = "https://raw.githubusercontent.com/thoth-station/prescriptions/master/prescriptions/"
 
         if len(name) == 1:
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Check compatibility of project license with licenses of its dependencies using precomputed matrix."""
+
+import os
+import re
+import json
+import base64
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .expression import Expression, ExpressionParser, LicenseExpression
+from .exceptions import UnableOpenFileData
+
+_LOGGER = logging.getLogger(__name__)
+
+_MATRIX_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data", "license_compatibility.json")
+
+# coarse categories of licenses, licenses without category (e.g. licenses with exceptions) are reported as unknown
+_CATEGORIES = (
+    ("agpl-3", r"AGPL-3\.0(-only|-or-later)?"),
+    ("gpl-3", r"GPL-3\.0(-only|-or-later|\+)?"),
+    ("gpl-2-or-later", r"GPL-2\.0(-or-later|\+)"),
+    ("gpl-2", r"GPL-2\.0(-only)?"),
+    ("lgpl-3", r"LGPL-3\.0(-only|-or-later|\+)?"),
+    ("weak", r"LGPL-2\.[01](-only|-or-later|\+)?|MPL-2\.0"),
+    ("weak-gpl-incompatible", r"MPL-1\.1|MPL-2\.0-no-copyleft-exception|EPL-[12]\.0|CDDL-1\.[01]"),
+    (
+        "permissive",
+        r"MIT|MIT-0|X11|ISC|0BSD|BSD-[123]-Clause|BSD-2-Clause-(FreeBSD|NetBSD|Patent|Views)|BSD-3-Clause-(Clear|LBNL)"
+        r"|Zlib|Unlicense|CC0-1\.0|PSF-2\.0|Python-2\.0|BSL-1\.0|NCSA|UPL-1\.0|PostgreSQL|WTFPL|HPND|ZPL-2\.1"
+        r"|Artistic-2\.0|AFL-3\.0|Apache-1\.1|Apache-2\.0",
+    ),
+)
+_CATEGORY_REGEXES = tuple((category, re.compile(f"^(?:{regex})$")) for category, regex in _CATEGORIES)
+
+_GPL_PROJECTS = frozenset(("gpl-2", "gpl-2-or-later", "gpl-3", "agpl-3"))
+# projects which can be distributed under the license of dependency of each copyleft category
+_COPYLEFT_PROJECTS = {
+    "gpl-2": frozenset(("gpl-2", "gpl-2-or-later")),
+    "gpl-2-or-later": _GPL_PROJECTS,
+    "gpl-3": frozenset(("gpl-2-or-later", "gpl-3", "agpl-3")),
+    "agpl-3": frozenset(("gpl-2-or-later", "gpl-3", "agpl-3")),
+}
+
+
+def license_category(identifier: str) -> Optional[str]:
+    """Get category of SPDX license identifier, None if it has no category."""
+    for category, regex in _CATEGORY_REGEXES:
+        if regex.match(identifier):
+            return category
+
+    return None
+
+
+def is_compatible(project: str, dependency: str) -> Optional[bool]:
+    """
+    Check if project can use dependency with the license, the rules are coarse and follow FSF compatibility notes.
+
+    :param project: SPDX identifier of project license
+    :param dependency: SPDX identifier of dependency license
+    :return: None if any of licenses has no category
+    """
+    if project == dependency:
+        return True
+
+    project_category = license_category(project)
+    dependency_category = license_category(dependency)
+    if project_category is None or dependency_category is None:
+        return None
+
+    if dependency_category == "permissive":
+        # patent clauses of Apache licenses are not compatible with GPL 2, Apache 1.1 with any GPL
+        if dependency == "Apache-2.0":
+            return project_category != "gpl-2"
+        if dependency == "Apache-1.1":
+            return project_category not in _GPL_PROJECTS
+        return True
+
+    if dependency_category == "weak":
+        return True
+
+    if dependency_category == "lgpl-3":
+        return project_category != "gpl-2"
+
+    if dependency_category == "weak-gpl-incompatible":
+        return project_category not in _GPL_PROJECTS
+
+    return project_category in _COPYLEFT_PROJECTS[dependency_category]
+
+
+def build_compatibility_matrix(identifiers: Iterable[str]) -> Dict[str, Any]:
+    """
+    Compute compatibility matrix of licenses, the result is stored in data/license_compatibility.json.
+
+    :param identifiers: SPDX identifiers, only licenses with category are stored
+    :return: licenses and one packed row per project license, bit i is set if license i can be used by the project
+    """
+    licenses = sorted(identifier for identifier in set(identifiers) if license_category(identifier) is not None)
+    size = (len(licenses) + 7) // 8
+
+    rows = list()
+    for project in licenses:
+        row = 0
+        for position, dependency in enumerate(licenses):
+            if is_compatible(project, dependency):
+                row |= 1 << position
+        rows.append(base64.b64encode(row.to_bytes(size, "little")).decode())
+
+    return {"licenses": licenses, "matrix": rows}
+
+
+class CompatibilityMatrix:
+    """
+    Precomputed N×N compatibility matrix of SPDX licenses.
+
+    Each row is a bitset of dependency licenses which can be used by the project license, so a whole dependency set
+    is checked with one AND of its license bitset with the row of the project license.
+    """
+
+    def __init__(self, expressions: Optional[ExpressionParser] = None) -> None:
+        """
+        Load precomputed matrix from data/license_compatibility.json.
+
+        :param expressions: parser of SPDX license expressions of dependencies, expressions are skipped if not given
+        """
+        try:
+            with open(_MATRIX_PATH) as f:
+                data = json.load(f)
+        except Exception:
+            raise UnableOpenFileData
+
+        self.expressions = expressions
+        self.licenses: List[str] = data["licenses"]
+        self._index = {identifier.lower(): position for position, identifier in enumerate(self.licenses)}
+        self._rows = [int.from_bytes(base64.b64decode(row), "little") for row in data["matrix"]]
+        _LOGGER.debug("Loaded compatibility matrix of %d licenses", len(self.licenses))
+
+    def _bit(self, identifier: str) -> int:
+        """Get bit of license, 0 if license is not in matrix."""
+        position = self._index.get(identifier.lower())
+        return 1 << position if position is not None else 0
+
+    def row(self, project_license: str) -> Optional[int]:
+        """Get bitset of licenses which can be used by project, None if project license is not in matrix."""
+        position = self._index.get(project_license.lower())
+        return self._rows[position] if position is not None else None
+
+    def is_compatible(self, project_license: str, dependency_license: str) -> Optional[bool]:
+        """Check if project can use dependency, None if any of licenses is not in matrix."""
+        row = self.row(project_license)
+        bit = self._bit(dependency_license)
+        if row is None or not bit:
+            return None
+
+        return bool(row & bit)
+
+    def _expression_compatible(self, row: int, expression: Expression) -> Optional[bool]:
+        """Check expression, any license of OR can be chosen, all licenses of AND must be compatible."""
+        if not isinstance(expression, LicenseExpression):
+            bit = self._bit(expression.identifier) if not expression.is_compound else 0
+            return bool(row & bit) if bit else None
+
+        results = [self._expression_compatible(row, operand) for operand in expression.operands]
+        if expression.operator == "OR":
+            return True if True in results else (None if None in results else False)
+
+        return False if False in results else (None if None in results else True)
+
+    def check(self, project_license: str, output: Dict[str, Dict[str, Any]]) -> Dict[str, List[Tuple[str, str, str]]]:
+        """
+        Check all packages of output, e.g. resolved dependencies of a project.
+
+        :param project_license: SPDX identifier of project license
+        :param output: output dictionary of solver
+        :return: name, version and license of packages with incompatible and unknown licenses
+        """
+        row = self.row(project_license)
+        result: Dict[str, List[Tuple[str, str, str]]] = {"conflicts": list(), "unknown": list()}
+
+        packages: Dict[str, List[Tuple[str, str]]] = dict()
+        dependencies = 0
+        for name, versions in output.items():
+            for version, package_data in versions.items():
+                expression = package_data.get("license_expression")
+                if expression:
+                    parsed = self.expressions.parse(expression) if self.expressions is not None else None
+                    compatible = self._expression_compatible(row, parsed) if row is not None and parsed else None
+                    if compatible is not True:
+                        result["conflicts" if compatible is False else "unknown"].append((name, version, expression))
+                    continue
+
+                identifier = (package_data["license"] or {}).get("identifier_spdx") or ""
+                bit = self._bit(identifier)
+                if row is None or not bit:
+                    result["unknown"].append((name, version, identifier))
+                    continue
+
+                dependencies |= bit
+                packages.setdefault(identifier.lower(), list()).append((name, version))
+
+        if row is None:
+            return result
+
+        # one AND over all licenses of dependencies
+        conflicts = dependencies & ~row
+        for position, identifier in enumerate(self.licenses):
+            if conflicts >> position & 1:
+                result["conflicts"].extend(
+                    (name, version, identifier) for name, version in packages[identifier.lower()]
+                )
+
+        result["conflicts"].sort()
+        return result
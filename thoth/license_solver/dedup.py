@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Skip inputs whose content is byte-identical to an already solved input."""
+
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional, Set
+
+_LOGGER = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 65536
+
+
+def content_hash(path: str) -> Optional[str]:
+    """Compute hash of file content, the file is read in chunks, None if file can't be read."""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError as e:
+        _LOGGER.debug("File %s can't be hashed: %s", path, e)
+        return None
+
+    return digest.hexdigest()
+
+
+class ContentDeduplicator:
+    """
+    Find inputs with the same content as an already seen input.
+
+    Only files with the same size as an already seen file are hashed, the first file of each size is hashed lazily
+    when another file of the same size appears, so files with unique sizes are never read twice.
+    """
+
+    def __init__(self) -> None:
+        """Init empty deduplicator."""
+        self.duplicates = 0
+        self.duplicate_bytes = 0
+        # the first seen file of each size whose content was not hashed yet
+        self._unhashed: Dict[int, Optional[str]] = dict()
+        self._hashes: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def is_duplicate(self, path: str, size: int) -> bool:
+        """
+        Check if content of file was already seen, the file is remembered otherwise.
+
+        :param path: path to file
+        :param size: size of file in bytes
+        :return: True if the file has the same content as another seen file and it can be skipped
+        """
+        with self._lock:
+            if size not in self._unhashed:
+                self._unhashed[size] = path
+                return False
+
+            first = self._unhashed[size]
+            if first is not None:
+                self._unhashed[size] = None
+                first_hash = content_hash(first)
+                if first_hash is not None:
+                    self._hashes.add(first_hash)
+
+            digest = content_hash(path)
+            if digest is None:
+                return False
+
+            if digest not in self._hashes:
+                self._hashes.add(digest)
+                return False
+
+            self.duplicates += 1
+            self.duplicate_bytes += size
+
+        _LOGGER.debug("File %s has the same content as an already solved file [SKIPPED]", path)
+        return True
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Parse dependencies of packages from ``requires_dist`` of PyPI metadata."""
+
+import re
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import InvalidVersion, Version
+from .lockfile import normalize_package_name
+
+_LOGGER = logging.getLogger(__name__)
+
+# name, optional extras, version specifier (optionally in parentheses) and environment marker
+_REQUIREMENT_REGEX = re.compile(
+    r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*\(?\s*([^;()]*?)\s*\)?\s*(?:;\s*(.*))?$"
+)
+_PIN_REGEX = re.compile(r"^===?\s*([^\s,*]+)$")
+_EXTRA_MARKER_REGEX = re.compile(r"\bextra\s*==")
+
+
+def parse_requirement(requirement: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Parse one ``requires_dist`` entry, e.g. ``idna (<4,>=2.5)`` or ``PySocks!=1.5.7,>=1.5.6; extra == "socks"``.
+
+    Dependencies of extras are optional and they are skipped, other environment markers are ignored, so the result
+    covers all environments.
+
+    :param requirement: requirement in PEP 508 format
+    :return: normalized package name and version specifier (None if any version can be used), None if requirement
+        is skipped
+    """
+    match = _REQUIREMENT_REGEX.match(requirement)
+    if match is None:
+        _LOGGER.warning("Requirement %r can't be parsed [SKIPPED]", requirement)
+        return None
+
+    name, specifier, marker = match.groups()
+    if marker and _EXTRA_MARKER_REGEX.search(marker):
+        return None
+
+    return normalize_package_name(name), specifier or None
+
+
+def get_dependencies(info: Dict[str, Any]) -> List[Tuple[str, Optional[str]]]:
+    """
+    Parse ``requires_dist`` of ``info`` of PyPI JSON response, dependencies of extras are skipped.
+
+    :param info: ``info`` of PyPI JSON response
+    :return: unique pairs of normalized package name and version specifier, the first specifier of package is kept
+    """
+    requires_dist: Iterable[str] = info.get("requires_dist") or ()
+    dependencies: Dict[str, Optional[str]] = dict()
+    for requirement in requires_dist:
+        parsed = parse_requirement(requirement)
+        if parsed is not None:
+            dependencies.setdefault(*parsed)
+
+    return list(dependencies.items())
+
+
+def get_pinned_version(specifier: Optional[str]) -> Optional[str]:
+    """Get version of specifier which allows exactly one version, e.g. ``==1.0``, None for other specifiers."""
+    pin = _PIN_REGEX.match(specifier or "")
+    return pin.group(1) if pin else None
+
+
+def get_release_versions(response: Dict[str, Any]) -> List[str]:
+    """Get versions which can be installed from PyPI JSON response, only the version of info if releases are missing."""
+    releases = response.get("releases")
+    if not isinstance(releases, dict):
+        version = (response.get("info") or {}).get("version")
+        return [version] if version else []
+
+    # releases without files or with only yanked files are not installed by pip
+    return [version for version, files in releases.items() if files and not all(f.get("yanked") for f in files)]
+
+
+def select_version(versions: Iterable[str], specifier: Optional[str]) -> Optional[str]:
+    """
+    Select the newest version allowed by specifier, pre-releases are selected only if no final release is allowed.
+
+    :param versions: released versions, e.g. keys of ``releases`` of PyPI JSON response
+    :param specifier: version specifier, e.g. ``<4,>=2.5``, None if any version can be used
+    :return: selected version, None if no version is allowed
+    """
+    try:
+        specifier_set = SpecifierSet(specifier or "")
+    except InvalidSpecifier:
+        _LOGGER.warning("Version specifier %r can't be parsed, the newest version is selected", specifier)
+        specifier_set = SpecifierSet()
+
+    parsed: Dict[Version, str] = dict()
+    for version in versions:
+        try:
+            parsed[Version(version)] = version
+        except InvalidVersion:
+            _LOGGER.debug("Version %r can't be parsed [SKIPPED]", version)
+
+    allowed = list(specifier_set.filter(parsed))
+    return parsed[max(allowed)] if allowed else None
@@ -32,3 +32,11 @@ class UnableOpenFileData(UnableOpenFile):  # noqa: N818
     def __init__(self, txt: str = "Internal file can't be loaded"):
         """Create message."""
         super().__init__(f"{txt}")
+
+
+class MissingOptionalDependency(LicenseSolverException):  # noqa: N818
+    """An exception raised if a feature needs a package from extras which is not installed."""
+
+
+class InvalidPolicy(LicenseSolverException):  # noqa: N818
+    """An exception raised if license policy has invalid rules."""
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Parse SPDX license expressions such as ``MIT OR Apache-2.0``."""
+
+import re
+import attr
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from .licenses import Licenses
+
+_LOGGER = logging.getLogger(__name__)
+
+_TOKEN_REGEX = re.compile(r"\s*(?:(\()|(\))|([A-Za-z0-9.+:-]+))")
+_OPERATORS = ("AND", "OR", "WITH")
+
+
+class ExpressionSyntaxError(ValueError):
+    """An exception raised if string is not a valid SPDX license expression."""
+
+
+@attr.s(slots=True, frozen=True)
+class LicenseSymbol:
+    """License identifier in expression, optionally with exception."""
+
+    identifier = attr.ib(type=str)
+    full_name = attr.ib(type=str)
+    exception = attr.ib(type=Optional[str], default=None)
+
+    @property
+    def is_compound(self) -> bool:
+        """Check if symbol is more than a plain license identifier."""
+        return self.exception is not None
+
+    @property
+    def symbols(self) -> Tuple["LicenseSymbol", ...]:
+        """Get all license symbols in expression."""
+        return (self,)
+
+    def __str__(self) -> str:
+        """Render symbol in SPDX syntax."""
+        return self.identifier if self.exception is None else f"{self.identifier} WITH {self.exception}"
+
+
+@attr.s(slots=True, frozen=True)
+class LicenseExpression:
+    """Licenses joined with AND or OR operator."""
+
+    operator = attr.ib(type=str)
+    operands = attr.ib(type=Tuple[Union[LicenseSymbol, "LicenseExpression"], ...])
+
+    @property
+    def is_compound(self) -> bool:
+        """Check if expression is more than a plain license identifier."""
+        return True
+
+    @property
+    def symbols(self) -> Tuple[LicenseSymbol, ...]:
+        """Get all license symbols in expression."""
+        return tuple(symbol for operand in self.operands for symbol in operand.symbols)
+
+    def __str__(self) -> str:
+        """Render expression in SPDX syntax."""
+        return f" {self.operator} ".join(
+            f"({operand})" if isinstance(operand, LicenseExpression) else str(operand) for operand in self.operands
+        )
+
+
+Expression = Union[LicenseSymbol, LicenseExpression]
+
+
+class ExpressionParser:
+    """Parse SPDX license expressions, license identifiers are resolved with the SPDX license list."""
+
+    def __init__(self, licenses: Licenses, cache_size: int = 4096) -> None:
+        """
+        Create index of SPDX license identifiers.
+
+        :param licenses: loaded SPDX licenses
+        :param cache_size: number of parsed expressions kept in LRU cache
+        """
+        self._index: Dict[str, Tuple[str, str]] = {lic[1].lower(): (lic[1], lic[0]) for lic in licenses.licenses_list}
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    def _parse(self, expression: str) -> Optional[Expression]:
+        """
+        Parse license expression, results are cached by the ``parse`` wrapper.
+
+        :param expression: SPDX license expression
+        :return: parsed expression, None if string is not a valid expression of known licenses
+        """
+        try:
+            tokens = self._tokenize(expression)
+            result, position = self._parse_or(tokens, 0)
+            if position != len(tokens):
+                raise ExpressionSyntaxError(f"Unexpected token {tokens[position]!r}")
+        except ExpressionSyntaxError as e:
+            _LOGGER.debug("String %r is not a license expression: %s", expression, e)
+            return None
+
+        return result
+
+    @staticmethod
+    def _tokenize(expression: str) -> List[str]:
+        """Split expression to parentheses, operators and identifiers."""
+        tokens = list()
+        position = 0
+        expression = expression.strip()
+        while position < len(expression):
+            match = _TOKEN_REGEX.match(expression, position)
+            if match is None:
+                raise ExpressionSyntaxError(f"Unexpected character {expression[position]!r}")
+
+            token = match.group(0).strip()
+            tokens.append(token.upper() if token.upper() in _OPERATORS else token)
+            position = match.end()
+
+        if not tokens:
+            raise ExpressionSyntaxError("Empty expression")
+
+        return tokens
+
+    def _parse_or(self, tokens: List[str], position: int) -> Tuple[Expression, int]:
+        """Parse operands joined with OR, it has the lowest precedence."""
+        return self._parse_operator(tokens, position, "OR", self._parse_and)
+
+    def _parse_and(self, tokens: List[str], position: int) -> Tuple[Expression, int]:
+        """Parse operands joined with AND."""
+        return self._parse_operator(tokens, position, "AND", self._parse_with)
+
+    def _parse_operator(
+        self,
+        tokens: List[str],
+        position: int,
+        operator: str,
+        operand_parser: Callable[[List[str], int], Tuple[Expression, int]],
+    ) -> Tuple[Expression, int]:
+        """Parse operands of operator, nested expressions with the same operator are flattened."""
+        operands: List[Expression] = list()
+        while True:
+            operand, position = operand_parser(tokens, position)
+            if isinstance(operand, LicenseExpression) and operand.operator == operator:
+                operands.extend(operand.operands)
+            else:
+                operands.append(operand)
+
+            if position < len(tokens) and tokens[position] == operator:
+                position += 1
+            else:
+                break
+
+        if len(operands) == 1:
+            return operands[0], position
+
+        return LicenseExpression(operator, tuple(operands)), position
+
+    def _parse_with(self, tokens: List[str], position: int) -> Tuple[Expression, int]:
+        """Parse license identifier with optional exception or parenthesized expression."""
+        if position >= len(tokens):
+            raise ExpressionSyntaxError("Unexpected end of expression")
+
+        token = tokens[position]
+        if token == "(":
+            result, position = self._parse_or(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ")":
+                raise ExpressionSyntaxError("Missing closing parenthesis")
+            return result, position + 1
+
+        symbol = self._resolve(token)
+        position += 1
+
+        if position < len(tokens) and tokens[position] == "WITH":
+            if position + 1 >= len(tokens) or tokens[position + 1] in _OPERATORS + ("(", ")"):
+                raise ExpressionSyntaxError("Missing exception identifier")
+            return LicenseSymbol(symbol.identifier, symbol.full_name, tokens[position + 1]), position + 2
+
+        return symbol, position
+
+    def _resolve(self, token: str) -> LicenseSymbol:
+        """Resolve license identifier to its canonical SPDX form."""
+        if token in _OPERATORS or token in ("(", ")"):
+            raise ExpressionSyntaxError(f"Expected license identifier, got {token!r}")
+
+        if token.startswith(("LicenseRef-", "DocumentRef-")):
+            return LicenseSymbol(token, token)
+
+        found = self._index.get(token.lower())
+        if found is not None:
+            return LicenseSymbol(*found)
+
+        # deprecated "or later" syntax of licenses which are not on the list with "+"
+        if token.endswith("+"):
+            found = self._index.get(token[:-1].lower())
+            if found is not None:
+                return LicenseSymbol(f"{found[0]}+", f"{found[1]} or later")
+
+        raise ExpressionSyntaxError(f"Unknown license identifier {token!r}")
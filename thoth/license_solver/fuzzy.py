@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Fuzzy matching of license names backed by character trigram index."""
+
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Any
+from .licenses import Licenses
+
+_LOGGER = logging.getLogger(__name__)
+
+# words which distinguish otherwise similar licenses, e.g. GPL and LGPL
+_QUALIFIERS = ("lesser", "library", "affero", "lgpl", "agpl", "later", "invariants", "exception")
+# words which join more licenses, e.g. "MIT or Apache 2.0", they must be part of the matched name
+_CONJUNCTIONS = frozenset(("and", "or", "with"))
+
+
+def _normalize(text: str) -> str:
+    """Lowercase text and replace punctuation with spaces."""
+    return " ".join(re.sub(r"[^a-z0-9+]+", " ", text.lower()).split())
+
+
+def _version(text: str) -> Tuple[str, ...]:
+    """Get numbers of normalized text without trailing zeros, e.g. ``("2",)`` for both "2" and "2.0"."""
+    numbers = re.findall(r"\d+", text)
+    while numbers and int(numbers[-1]) == 0 and len(numbers) > 1:
+        numbers.pop()
+    return tuple(str(int(number)) for number in numbers)
+
+
+def _qualifiers(text: str) -> FrozenSet[str]:
+    """Get distinguishing words present in normalized text."""
+    return frozenset(qualifier for qualifier in _QUALIFIERS if qualifier in text)
+
+
+def _conjunctions(text: str) -> FrozenSet[str]:
+    """Get words of normalized text which join more licenses."""
+    return _CONJUNCTIONS.intersection(text.split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Get character trigrams of normalized text, the text is padded to give weight to word boundaries."""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyMatcher:
+    """Find the most similar SPDX license name, identifier or alias using Dice coefficient of trigrams."""
+
+    def __init__(
+        self,
+        licenses: Licenses,
+        license_dictionary: Dict[str, Any],
+        threshold: float = 0.75,
+        max_length: int = 200,
+        cache_size: int = 4096,
+    ) -> None:
+        """
+        Build inverted index of trigrams.
+
+        :param licenses: loaded SPDX licenses
+        :param license_dictionary: aliases of licenses from data/license_dictionary.json
+        :param threshold: minimal similarity in range 0-1 for a match
+        :param max_length: longer strings are not matched, they are not license names
+        :param cache_size: number of matched strings kept in LRU cache
+        """
+        self.threshold = threshold
+        self.max_length = max_length
+        self._groups: List[List[str]] = list()
+        self._sizes: List[int] = list()
+        self._versions: List[Tuple[str, ...]] = list()
+        self._qualifiers: List[FrozenSet[str]] = list()
+        self._conjunctions: List[FrozenSet[str]] = list()
+        self._index: Dict[str, List[int]] = dict()
+
+        # license groups are deduplicated, each one gets candidate names from its names and aliases
+        groups: Dict[str, int] = dict()
+        for lic_li in licenses.licenses_list:
+            for name in lic_li:
+                groups.setdefault(name, len(self._groups))
+            if groups[lic_li[1]] == len(self._groups):
+                self._groups.append(lic_li)
+
+        candidates = [(name, group_id) for group_id, lic_li in enumerate(self._groups) for name in lic_li]
+        candidates.extend((alias, groups[value]) for alias, value in license_dictionary.items() if value in groups)
+
+        seen: Set[Tuple[str, int]] = set()
+        self._candidates: List[int] = list()
+        for name, group_id in candidates:
+            normalized = _normalize(name)
+            if not normalized or (normalized, group_id) in seen:
+                continue
+            seen.add((normalized, group_id))
+
+            candidate_id = len(self._candidates)
+            self._candidates.append(group_id)
+            trigrams = _trigrams(normalized)
+            self._sizes.append(len(trigrams))
+            self._versions.append(_version(normalized))
+            self._qualifiers.append(_qualifiers(normalized))
+            self._conjunctions.append(_conjunctions(normalized))
+            for trigram in trigrams:
+                self._index.setdefault(trigram, list()).append(candidate_id)
+
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+        _LOGGER.debug("Fuzzy matcher indexed %d license names", len(self._candidates))
+
+    def _match(self, license_name: str) -> Optional[Tuple[List[str], float]]:
+        """
+        Find license group of the most similar license name, results are cached by the ``match`` wrapper.
+
+        :param license_name: license name from metadata
+        :return: license group and similarity, None if nothing is similar enough
+        """
+        if len(license_name) > self.max_length:
+            return None
+
+        normalized = _normalize(license_name)
+        if not normalized:
+            return None
+
+        version = _version(normalized)
+        qualifiers = _qualifiers(normalized)
+        conjunctions = _conjunctions(normalized)
+        trigrams = _trigrams(normalized)
+        size = len(trigrams)
+        # Dice coefficient can reach threshold only for candidates of similar size
+        min_size = self.threshold * size / (2 - self.threshold)
+        max_size = (2 - self.threshold) * size / self.threshold
+
+        shared: Dict[int, int] = dict()
+        for trigram in trigrams:
+            for candidate_id in self._index.get(trigram, ()):
+                shared[candidate_id] = shared.get(candidate_id, 0) + 1
+
+        best_id = None
+        best_score = self.threshold
+        for candidate_id, count in shared.items():
+            candidate_size = self._sizes[candidate_id]
+            if candidate_size < min_size or candidate_size > max_size:
+                continue
+            # a typo is tolerated in name, never in version or license variant
+            if self._versions[candidate_id] != version or self._qualifiers[candidate_id] != qualifiers:
+                continue
+            # more licenses joined in one string are never reduced to one of them
+            if not conjunctions <= self._conjunctions[candidate_id]:
+                continue
+
+            score = 2 * count / (size + candidate_size)
+            if score > best_score or (score == best_score and best_id is None):
+                best_id = candidate_id
+                best_score = score
+
+        if best_id is None:
+            return None
+
+        _LOGGER.debug("License %r fuzzy matched with score %.2f", license_name, best_score)
+        return self._groups[self._candidates[best_id]], best_score
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Resolve licenses of GitHub repositories in batches with GraphQL API, or with REST API without token."""
+
+import os
+import queue
+import logging
+import threading
+import requests
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+from .records import FrozenDict
+
+_LOGGER = logging.getLogger(__name__)
+
+_GRAPHQL_URL = "https://api.github.com/graphql"
+_REST_URL = "https://api.github.com"
+
+Repository = Tuple[str, str]
+PendingPackage = Tuple[str, str, FrozenDict]
+
+
+def github_license_matches(identifier_spdx: str, github_spdx: Optional[str]) -> bool:
+    """
+    Check license of package with license of its GitHub repository.
+
+    :param identifier_spdx: SPDX identifier of package license
+    :param github_spdx: SPDX identifier reported by GitHub, None if it is not known
+    :return: False only if GitHub reports a different license
+    """
+    return github_spdx is None or github_spdx in identifier_spdx
+
+
+def parse_repository(link: str) -> Optional[Repository]:
+    """Get owner and name of repository from link or "owner/repo"."""
+    parts = link.rstrip("/").split("/")
+    if len(parts) < 2 or not parts[-2] or not parts[-1]:
+        return None
+
+    return parts[-2], parts[-1]
+
+
+class GitHubLicenseResolver:
+    """
+    Get SPDX identifiers of licenses of GitHub repositories, up to batch_size repositories in one GraphQL query.
+
+    GraphQL API needs authentication, without token each repository is resolved with one request to REST API.
+    """
+
+    def __init__(
+        self,
+        url: str = _GRAPHQL_URL,
+        token: Optional[str] = None,
+        batch_size: int = 100,
+        timeout: Tuple[float, float] = (3.05, 30.0),
+        rest_url: str = _REST_URL,
+    ) -> None:
+        """
+        Init resolver.
+
+        :param url: URL of GitHub GraphQL API
+        :param token: GitHub token, GITHUB_TOKEN environment variable is used if not given
+        :param batch_size: maximal number of repositories in one query, GitHub allows 100 nodes
+        :param timeout: connect and read timeout of each query in seconds
+        :param rest_url: URL of GitHub REST API used without token
+        """
+        self.url = url
+        self.rest_url = rest_url.rstrip("/")
+        self.token = token if token is not None else os.getenv("GITHUB_TOKEN")
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = "license-solver"
+        if not self.token:
+            _LOGGER.warning(
+                "GITHUB_TOKEN is not set, licenses are resolved one repository per request and GitHub allows only "
+                "60 unauthenticated requests per hour"
+            )
+
+    def resolve(self, repositories: Sequence[Repository]) -> Dict[Repository, Optional[str]]:
+        """
+        Resolve licenses of repositories.
+
+        :param repositories: owners and names of repositories
+        :return: SPDX identifier of each resolved repository, None if repository or its license was not found,
+            repositories of failed requests are missing
+        """
+        result: Dict[Repository, Optional[str]] = dict()
+        unique = list(dict.fromkeys(repositories))
+        if not self.token:
+            for repository in unique:
+                result.update(self._query_rest(repository))
+            return result
+
+        for start in range(0, len(unique), self.batch_size):
+            result.update(self._query(unique[start : start + self.batch_size]))
+
+        return result
+
+    def _query_rest(self, repository: Repository) -> Dict[Repository, Optional[str]]:
+        """Resolve one repository with REST API, it doesn't need authentication."""
+        owner, name = repository
+        try:
+            response = self._session.get(f"{self.rest_url}/repos/{owner}/{name}/license", timeout=self.timeout)
+            if response.status_code == 404:
+                # repository doesn't exist or GitHub didn't detect its license
+                return {repository: None}
+
+            response.raise_for_status()
+            body = response.json()
+            if not isinstance(body, dict) or not isinstance(body.get("license") or {}, dict):
+                raise ValueError(f"unexpected response {str(body)[:80]!r}")
+        except (requests.RequestException, ValueError) as e:
+            _LOGGER.warning("Failed to resolve license of GitHub repository %s/%s: %s", owner, name, e)
+            return dict()
+
+        return {repository: (body.get("license") or {}).get("spdx_id")}
+
+    def _query(self, repositories: Sequence[Repository]) -> Dict[Repository, Optional[str]]:
+        """Resolve one batch of repositories, owners and names are passed as variables."""
+        parameters = list()
+        fields = list()
+        variables = dict()
+        for i, (owner, name) in enumerate(repositories):
+            parameters.append(f"$o{i}: String!, $n{i}: String!")
+            fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ licenseInfo {{ spdxId }} }}")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+
+        query = f"query({', '.join(parameters)}) {{ {' '.join(fields)} }}"
+        try:
+            response = self._session.post(
+                self.url,
+                json={"query": query, "variables": variables},
+                headers={"Authorization": f"bearer {self.token}"},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            body = response.json()
+            data = body.get("data") if isinstance(body, dict) else None
+            if not isinstance(data, dict):
+                # errors of the whole query, e.g. bad credentials, come without data
+                raise ValueError(f"unexpected response {str(body)[:80]!r}")
+        except (requests.RequestException, ValueError) as e:
+            _LOGGER.warning("Failed to resolve licenses of %d GitHub repositories: %s", len(repositories), e)
+            return dict()
+
+        _LOGGER.debug("Resolved licenses of %d GitHub repositories in one query", len(repositories))
+        result = dict()
+        for i, repository in enumerate(repositories):
+            node = data.get(f"r{i}")
+            license_info = node.get("licenseInfo") if isinstance(node, dict) else None
+            result[repository] = license_info.get("spdxId") if isinstance(license_info, dict) else None
+
+        return result
+
+
+class GitHubVerification:
+    """
+    Background stage which verifies licenses of already added packages with their GitHub repositories.
+
+    Packages are queued while they are solved and a worker thread looks up their repositories and resolves licenses
+    in batches of batch_size repositories. Packages whose license differs from the license of their repository or
+    whose repository can't be resolved are reported to on_mismatch, so local detection never waits for the network.
+    """
+
+    def __init__(
+        self,
+        resolver: GitHubLicenseResolver,
+        get_repository: Callable[[str], Optional[Repository]],
+        on_mismatch: Callable[[str, str, FrozenDict], None],
+        idle_timeout: float = 0.5,
+    ) -> None:
+        """
+        Init stage, the worker thread is started with the first package.
+
+        :param resolver: resolver of licenses of repositories
+        :param get_repository: get repository of package name, None if it is not known
+        :param on_mismatch: called with name, version and package data of package with different or unverified license
+        :param idle_timeout: seconds without new packages after which an incomplete batch is resolved
+        """
+        self.resolver = resolver
+        self.get_repository = get_repository
+        self.on_mismatch = on_mismatch
+        self.idle_timeout = idle_timeout
+        self.mismatches = 0
+        self.unverified = 0
+        self._queue: "queue.Queue[Union[PendingPackage, threading.Event]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, version: str, package_data: FrozenDict) -> None:
+        """Queue package for verification."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="github-verification", daemon=True)
+                    self._thread.start()
+
+        self._queue.put((name, version, package_data))
+
+    def join(self) -> None:
+        """Wait until all queued packages are verified."""
+        if self._thread is None:
+            return
+
+        done = threading.Event()
+        self._queue.put(done)
+        # the worker never dies on errors of batches, the check only guards against waiting forever
+        while not done.wait(self.idle_timeout):
+            if not self._thread.is_alive():
+                _LOGGER.error("GitHub verification stopped, not all packages were verified")
+                return
+
+    def _run(self) -> None:
+        """Collect packages with repositories and verify them in batches."""
+        batch: List[Tuple[Repository, str, str, FrozenDict]] = list()
+        repositories: Set[Repository] = set()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout if batch else None)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple):
+                name, version, package_data = item
+                repository = self._get_repository(name)
+                if repository is not None:
+                    batch.append((repository, name, version, package_data))
+                    repositories.add(repository)
+                if len(repositories) < self.resolver.batch_size:
+                    continue
+
+            try:
+                if batch:
+                    self._verify(batch)
+            except Exception as e:
+                _LOGGER.error("Failed to verify licenses of %d packages with GitHub: %s", len(batch), e)
+            finally:
+                batch = list()
+                repositories = set()
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _get_repository(self, name: str) -> Optional[Repository]:
+        """Get repository of package, failed lookup doesn't stop the worker."""
+        try:
+            return self.get_repository(name)
+        except Exception as e:
+            _LOGGER.warning("Failed to get GitHub repository of %s: %s", name, e)
+            return None
+
+    def _verify(self, batch: List[Tuple[Repository, str, str, FrozenDict]]) -> None:
+        """Resolve licenses of repositories of batch and report packages with different or unverified license."""
+        try:
+            verdicts = self.resolver.resolve([repository for repository, _, _, _ in batch])
+        except Exception as e:
+            _LOGGER.error("Failed to resolve licenses of %d GitHub repositories: %s", len(batch), e)
+            verdicts = dict()
+
+        for repository, name, version, package_data in batch:
+            package_license: Dict[str, Any] = package_data["license"] or {}
+            if repository not in verdicts:
+                # package which can't be verified is never reported as verified
+                _LOGGER.warning("License of %s==%s can't be verified with GitHub repository", name, version)
+                self.unverified += 1
+            else:
+                github_spdx = verdicts[repository]
+                if github_license_matches(package_license.get("identifier_spdx") or "", github_spdx):
+                    continue
+
+                _LOGGER.info(
+                    "License of %s==%s differs from license %s of GitHub repository", name, version, github_spdx
+                )
+                self.mismatches += 1
+
+            try:
+                self.on_mismatch(name, version, package_data)
+            except Exception as e:
+                _LOGGER.error("Failed to update package %s==%s: %s", name, version, e)
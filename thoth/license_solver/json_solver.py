@@ -50,6 +50,14 @@ class JsonSolver:
         """Get license name from metadata."""
         return self.json_file.get("License") or self.json_file.get("license")
 
+    def get_license_expression(self) -> Optional[Any]:
+        """Get SPDX license expression from metadata."""
+        return self.json_file.get("License-Expression") or self.json_file.get("license_expression")
+
+    def get_license_text(self) -> Optional[Any]:
+        """Get content of license file read together with metadata."""
+        return self.json_file.get("license_text")
+
     def get_classifier_name(self) -> Union[List[Any], Any, None]:
         """Get classifier name from metadata."""
         return self.json_file.get("Classifier") or self.json_file.get("classifiers")
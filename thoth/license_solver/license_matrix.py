@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Identify batches of license texts with vectorized NumPy scoring against SPDX license fingerprints."""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+from .license_text import load_fingerprints, shingle_hashes
+from .exceptions import MissingOptionalDependency
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore[assignment]
+
+_LOGGER = logging.getLogger(__name__)
+
+# hashes are 32-bit, sketch of a text holds its smallest hashes
+_HASH_RANGE = 2**32
+
+
+class LicenseTextMatrix:
+    """
+    Score license texts against a sparse matrix of SPDX license fingerprints.
+
+    Columns of the matrix are hashes present in any SPDX fingerprint, a batch of texts is converted to a sparse matrix
+    over the same columns and the batch is scored by a single sparse matrix product. As a fingerprint is a uniform
+    sample of shingles of the SPDX text, the product estimates the share of the SPDX text contained in each input text,
+    which is then converted to Jaccard similarity.
+    """
+
+    def __init__(self, threshold: float = 0.5, batch_size: int = 1024) -> None:
+        """
+        Build SPDX license matrix.
+
+        :param threshold: minimal estimated Jaccard similarity in range 0-1 for a match
+        :param batch_size: number of texts scored at once, it bounds memory used by score matrix
+        """
+        if numpy is None:
+            raise MissingOptionalDependency(
+                "NumPy is required for batch identification, install thoth-license-solver[numpy]"
+            )
+
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.shingle_size, self.sketch_size, sketches = load_fingerprints()
+        self._identifiers: List[str] = list(sketches)
+        self._columns: Dict[int, int] = dict()
+
+        license_ids: List[int] = list()
+        columns: List[int] = list()
+        for license_id, sketch in enumerate(sketches.values()):
+            for value in sketch:
+                license_ids.append(license_id)
+                columns.append(self._columns.setdefault(value, len(self._columns)))
+
+        # compressed sparse column layout, licenses of column c are in _column_licenses from _column_start[c]
+        # to _column_start[c + 1]
+        order = numpy.argsort(columns, kind="stable")
+        self._column_licenses = numpy.asarray(license_ids, dtype=numpy.int64)[order]
+        self._column_start = numpy.searchsorted(
+            numpy.asarray(columns, dtype=numpy.int64)[order], numpy.arange(len(self._columns) + 1)
+        )
+
+        lengths = numpy.array([len(sketch) for sketch in sketches.values()], dtype=numpy.float64)
+        maximums = numpy.array([max(sketch) for sketch in sketches.values()], dtype=numpy.float64)
+        self._sketch_lengths = lengths
+        # number of shingles of SPDX texts, a sketch which is not full holds all shingles of the text
+        self._sizes = numpy.where(
+            lengths < self.sketch_size, lengths, (self.sketch_size - 1) * _HASH_RANGE / (maximums + 1)
+        )
+        _LOGGER.debug("Built license matrix of %d licenses and %d hashes", len(self._identifiers), len(self._columns))
+
+    def identify(self, texts: Sequence[str]) -> List[Optional[Tuple[str, float]]]:
+        """
+        Identify license texts.
+
+        :param texts: full license texts, e.g. contents of LICENSE files
+        :return: SPDX identifier and estimated similarity for each text, None if no license text is similar enough
+        """
+        result: List[Optional[Tuple[str, float]]] = list()
+        for start in range(0, len(texts), self.batch_size):
+            best, confidence = self.score(texts[start : start + self.batch_size])
+            for license_id, score in zip(best.tolist(), confidence.tolist()):
+                result.append((self._identifiers[license_id], score) if score >= self.threshold else None)
+
+        return result
+
+    def score(self, texts: Sequence[str]) -> Tuple["numpy.ndarray", "numpy.ndarray"]:
+        """
+        Score a batch of license texts against all SPDX licenses.
+
+        :param texts: full license texts
+        :return: index of the most similar license and its estimated Jaccard similarity for each text
+        """
+        rows: List[int] = list()
+        columns: List[int] = list()
+        sizes = numpy.zeros(len(texts), dtype=numpy.float64)
+        for row, text in enumerate(texts):
+            hashes = shingle_hashes(text, self.shingle_size)
+            sizes[row] = len(hashes)
+            for value in hashes:
+                column = self._columns.get(value)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+
+        # sparse product of batch matrix and transposed license matrix, each nonzero is expanded to its licenses
+        column_array = numpy.asarray(columns, dtype=numpy.int64)
+        starts = self._column_start[column_array]
+        counts = self._column_start[column_array + 1] - starts
+        offsets = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        licenses = self._column_licenses[numpy.repeat(starts, counts) + offsets]
+        text_rows = numpy.repeat(numpy.asarray(rows, dtype=numpy.int64), counts)
+
+        license_count = len(self._identifiers)
+        shared = numpy.bincount(text_rows * license_count + licenses, minlength=len(texts) * license_count)
+        shared = shared.reshape(len(texts), license_count)
+
+        intersection = shared / self._sketch_lengths * self._sizes
+        union = sizes[:, numpy.newaxis] + self._sizes - intersection
+        jaccard = numpy.divide(intersection, union, out=numpy.zeros_like(intersection), where=union > 0)
+
+        best = jaccard.argmax(axis=1)
+        return best, jaccard[numpy.arange(len(texts)), best]
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Identify full license texts using MinHash fingerprints of SPDX license texts."""
+
+import os
+import re
+import json
+import base64
+import hashlib
+import struct
+import logging
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Set, Tuple
+from .exceptions import UnableOpenFileData
+
+_LOGGER = logging.getLogger(__name__)
+
+_FINGERPRINTS_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data", "license_fingerprints.json")
+
+# copyright lines differ in every project, they are not part of the license text
+_COPYRIGHT_REGEX = re.compile(r"^\s*(?:copyright|\(c\)|©).*$", re.IGNORECASE | re.MULTILINE)
+# markup of SPDX license templates, variables are replaced with their original text and optional markers are dropped
+_TEMPLATE_VARIABLE_REGEX = re.compile(r"<<var;.*?original=(.*?);match=.*?>>", re.DOTALL)
+_TEMPLATE_REGEX = re.compile(r"<<.*?>>", re.DOTALL)
+_WORD_REGEX = re.compile(r"[a-z0-9]+")
+
+SHINGLE_SIZE = 4
+SKETCH_SIZE = 128
+
+
+def normalize_text(text: str) -> List[str]:
+    """Get lowercase words of license text, punctuation, whitespace and copyright lines are dropped."""
+    text = _TEMPLATE_REGEX.sub(" ", _TEMPLATE_VARIABLE_REGEX.sub(r"\1", text))
+    text = _COPYRIGHT_REGEX.sub(" ", text)
+    return _WORD_REGEX.findall(text.lower())
+
+
+def _hash(shingle: str) -> int:
+    """Get 32-bit hash of shingle."""
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "big")
+
+
+def shingle_hashes(text: str, shingle_size: int = SHINGLE_SIZE) -> Set[int]:
+    """Get hashes of all word shingles of license text."""
+    words = normalize_text(text)
+    if len(words) < shingle_size:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {" ".join(words[i : i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+
+    return {_hash(shingle) for shingle in shingles}
+
+
+def fingerprint(text: str, shingle_size: int = SHINGLE_SIZE, sketch_size: int = SKETCH_SIZE) -> Tuple[int, ...]:
+    """
+    Compute bottom-k MinHash sketch of license text.
+
+    Each word shingle is hashed once and the smallest hashes are kept, the sketch estimates Jaccard similarity of
+    shingle sets of two texts.
+
+    :param text: license text
+    :param shingle_size: number of words in shingle
+    :param sketch_size: number of hashes kept in sketch
+    :return: sorted hashes
+    """
+    return tuple(sorted(shingle_hashes(text, shingle_size))[:sketch_size])
+
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...], sketch_size: int = SKETCH_SIZE) -> float:
+    """Estimate Jaccard similarity of texts from their sketches."""
+    union = sorted(set(first) | set(second))[:sketch_size]
+    if not union:
+        return 0.0
+
+    first_set = set(first)
+    second_set = set(second)
+    return sum(1 for value in union if value in first_set and value in second_set) / len(union)
+
+
+def build_fingerprints(texts_directory: str) -> Dict[str, Any]:
+    """
+    Compute fingerprints of SPDX license texts, the result is stored in data/license_fingerprints.json.
+
+    Licenses with the same text (e.g. ``GPL-2.0-only`` and ``GPL-2.0-or-later``) are stored only once, under the
+    first identifier in alphabetical order.
+
+    :param texts_directory: directory with license texts named ``<SPDX identifier>.txt``, e.g. text/ directory
+        of the SPDX license-list-data repository
+    :return: dictionary with packed sketches
+    """
+    data: Dict[str, str] = dict()
+    seen: Set[Tuple[int, ...]] = set()
+    for file_name in sorted(os.listdir(texts_directory)):
+        if not file_name.endswith(".txt"):
+            continue
+
+        with open(os.path.join(texts_directory, file_name), encoding="utf-8", errors="replace") as f:
+            sketch = fingerprint(f.read())
+
+        if not sketch or sketch in seen:
+            continue
+        seen.add(sketch)
+
+        packed = struct.pack(f">{len(sketch)}I", *sketch)
+        data[file_name[: -len(".txt")]] = base64.b64encode(packed).decode()
+
+    return {"shingle_size": SHINGLE_SIZE, "sketch_size": SKETCH_SIZE, "data": data}
+
+
+def _unpack(packed: str) -> Tuple[int, ...]:
+    """Unpack sketch stored in fingerprints file."""
+    raw = base64.b64decode(packed)
+    return struct.unpack(f">{len(raw) // 4}I", raw)
+
+
+def load_fingerprints() -> Tuple[int, int, Dict[str, Tuple[int, ...]]]:
+    """
+    Load precomputed fingerprints of SPDX license texts from data/license_fingerprints.json.
+
+    :return: shingle size, sketch size and sketches of licenses
+    """
+    try:
+        with open(_FINGERPRINTS_PATH) as f:
+            fingerprints = json.load(f)
+    except Exception:
+        raise UnableOpenFileData
+
+    sketches = {identifier: _unpack(packed) for identifier, packed in fingerprints["data"].items()}
+    _LOGGER.debug("Loaded fingerprints of %d license texts", len(sketches))
+    return fingerprints["shingle_size"], fingerprints["sketch_size"], sketches
+
+
+class LicenseTextClassifier:
+    """Find SPDX license with the most similar text, candidates are looked up in inverted index of sketch hashes."""
+
+    def __init__(self, threshold: float = 0.5, min_shared: int = 8, cache_size: int = 1024) -> None:
+        """
+        Load precomputed fingerprints of SPDX license texts.
+
+        :param threshold: minimal estimated Jaccard similarity in range 0-1 for a match
+        :param min_shared: minimal number of hashes shared with a sketch of a candidate license
+        :param cache_size: number of identified texts kept in LRU cache
+        """
+        self.threshold = threshold
+        self.min_shared = min_shared
+        self.shingle_size, self.sketch_size, sketches = load_fingerprints()
+        self._identifiers: List[str] = list()
+        self._sketches: List[Tuple[int, ...]] = list()
+        self._index: Dict[int, List[int]] = dict()
+
+        for identifier, sketch in sketches.items():
+            license_id = len(self._identifiers)
+            self._identifiers.append(identifier)
+            self._sketches.append(sketch)
+            for value in sketch:
+                self._index.setdefault(value, list()).append(license_id)
+
+        self.identify = lru_cache(maxsize=cache_size)(self._identify)
+
+    def _identify(self, text: str) -> Optional[Tuple[str, float]]:
+        """
+        Identify license text, results are cached by the ``identify`` wrapper.
+
+        :param text: full license text, e.g. content of LICENSE file
+        :return: SPDX identifier and estimated similarity, None if no license text is similar enough
+        """
+        sketch = fingerprint(text, self.shingle_size, self.sketch_size)
+
+        shared: Dict[int, int] = dict()
+        for value in sketch:
+            for license_id in self._index.get(value, ()):
+                shared[license_id] = shared.get(license_id, 0) + 1
+
+        best_id = None
+        best_score = self.threshold
+        for license_id, count in sorted(shared.items()):
+            if count < self.min_shared:
+                continue
+
+            score = similarity(sketch, self._sketches[license_id], self.sketch_size)
+            if score > best_score or (score == best_score and best_id is None):
+                best_id = license_id
+                best_score = score
+
+        if best_id is None:
+            return None
+
+        _LOGGER.debug("License text identified as %s with similarity %.2f", self._identifiers[best_id], best_score)
+        return self._identifiers[best_id], best_score
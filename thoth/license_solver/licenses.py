@@ -32,9 +32,10 @@ class Licenses:
     """Class detect all licenses from downloaded data."""
 
     data = attr.ib(init=False, type=str)
-    json_data = attr.ib(init=True, type=Dict[str, Any], default=dict())
-    licenses: List[Any] = list()
-    licenses_list: List[Any] = list()
+    json_data = attr.ib(init=True, type=Dict[str, Any], factory=dict)
+    # lists are created for each instance, class-level lists would grow with every new instance
+    licenses = attr.ib(init=False, type=List[Any], factory=list)
+    licenses_list = attr.ib(init=False, type=List[Any], factory=list)
 
     def __attrs_post_init__(self) -> None:
         """Run methods."""
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Parse pinned packages from Pipfile.lock and requirements.txt files."""
+
+import re
+import json
+import logging
+from typing import List, Tuple, Iterable
+from .exceptions import UnableOpenFile
+
+_LOGGER = logging.getLogger(__name__)
+
+_PIN_REGEX = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*===?\s*([^\s;,#]+)\s*(?:;.*)?$")
+
+
+def normalize_package_name(package_name: str) -> str:
+    """Normalize package name as described in PEP 503."""
+    return re.sub(r"[-_.]+", "-", package_name).lower()
+
+
+def deduplicate_pins(pins: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Remove duplicate pins, package names are compared normalized.
+
+    :param pins: pairs of package name and version
+    :return: pins in order of their first occurrence
+    """
+    seen = set()
+    result = list()
+    for package_name, package_version in pins:
+        key = (normalize_package_name(package_name), package_version)
+        if key not in seen:
+            seen.add(key)
+            result.append((package_name, package_version))
+
+    return result
+
+
+def parse_pipfile_lock(file_path: str) -> List[Tuple[str, str]]:
+    """
+    Parse pinned packages from Pipfile.lock, both default and develop sections are used.
+
+    :param file_path: path to Pipfile.lock
+    :return: pairs of package name and version
+    """
+    try:
+        with open(file_path) as f:
+            content = json.load(f)
+    except (OSError, ValueError) as e:
+        raise UnableOpenFile(f"Broken or can't find Pipfile.lock {file_path}: {e}")
+
+    pins = list()
+    for section in ("default", "develop"):
+        for package_name, entry in content.get(section, {}).items():
+            version = entry.get("version") if isinstance(entry, dict) else None
+            if not version or not version.startswith("=="):
+                _LOGGER.warning("Package %r in %s is not pinned to a version. SKIPPED", package_name, file_path)
+                continue
+
+            pins.append((package_name, version.lstrip("=")))
+
+    return deduplicate_pins(pins)
+
+
+def parse_requirements(file_path: str) -> List[Tuple[str, str]]:
+    """
+    Parse pinned packages (``name==version``) from requirements.txt.
+
+    :param file_path: path to requirements file
+    :return: pairs of package name and version
+    """
+    try:
+        with open(file_path) as f:
+            content = f.read()
+    except OSError as e:
+        raise UnableOpenFile(f"Broken or can't find requirements file {file_path}: {e}")
+
+    pins = list()
+    # join line continuations, hashes are commonly placed on the following lines
+    for line in content.replace("\\\n", " ").splitlines():
+        line = re.sub(r"(^|\s)#.*$", "", line).strip()
+        # drop pip options such as --hash
+        line = re.sub(r"\s+--?[A-Za-z-]+(?:[=\s]\S+)?", "", line).strip()
+        if not line or line.startswith("-"):
+            continue
+
+        match = _PIN_REGEX.match(line)
+        if match is None:
+            _LOGGER.warning("Requirement %r in %s is not pinned to a version. SKIPPED", line, file_path)
+            continue
+
+        pins.append((match.group(1), match.group(2)))
+
+    return deduplicate_pins(pins)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Find license names mentioned in free-form text using Aho-Corasick automaton."""
+
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Any
+from .licenses import Licenses
+
+_LOGGER = logging.getLogger(__name__)
+
+# license joined with another one by conjunction, the other license can be an unknown name, e.g. "MIT or Apache Licence"
+_LICENSE_WORD = r"(?:licen[cs]e|gpl|bsd|apache|mit|mpl|v?\d)"
+_JOINED_AFTER_REGEX = re.compile(
+    rf"[\s,;/]*(?:and|or)\s+(?!(?:any\s+)?later\b)(?:the\s+)?\S*?{_LICENSE_WORD}", re.IGNORECASE
+)
+_JOINED_BEFORE_REGEX = re.compile(rf"{_LICENSE_WORD}\S*[\s,;/]+(?:and|or)[\s,;/]*$", re.IGNORECASE)
+# qualifiers following license name in normalized text, e.g. "GNU GPL v2 or later" or "GPL v2 with classpath exception"
+_OR_LATER_REGEX = re.compile(r"\+| or (?:any )?later(?: version)?\b")
+_EXCEPTION_REGEX = re.compile(r" with (?:the )?([a-z0-9 ]+?) exception\b")
+_VARIANT_SUFFIXES = ("-only", "-or-later", "+")
+
+
+def _normalize(text: str) -> Tuple[str, List[int]]:
+    """
+    Lowercase text and collapse punctuation and whitespace to single spaces.
+
+    :param text: text to normalize
+    :return: normalized text and position in the original text for each character of normalized text
+    """
+    characters: List[str] = list()
+    positions: List[int] = list()
+    for position, character in enumerate(text):
+        if character.isalnum() or character == "+":
+            lowered = character.lower()
+            characters.append(lowered if len(lowered) == 1 else character)
+            positions.append(position)
+        elif characters and characters[-1] != " ":
+            characters.append(" ")
+            positions.append(position)
+
+    if characters and characters[-1] == " ":
+        characters.pop()
+        positions.pop()
+
+    return "".join(characters), positions
+
+
+class LicenseMentionScanner:
+    """
+    Find SPDX license names, identifiers and aliases mentioned in text, e.g. "Licensed under the MIT license".
+
+    All names are compiled to a single Aho-Corasick automaton, so text is scanned in one linear pass regardless of the
+    number of names.
+    """
+
+    def __init__(
+        self,
+        licenses: Licenses,
+        license_dictionary: Dict[str, Any],
+        max_length: int = 4096,
+        case_sensitive_length: int = 3,
+        cache_size: int = 4096,
+    ) -> None:
+        """
+        Build automaton of license names.
+
+        :param licenses: loaded SPDX licenses
+        :param license_dictionary: aliases of licenses from data/license_dictionary.json
+        :param max_length: only the beginning of longer texts is scanned
+        :param case_sensitive_length: names up to this length (e.g. MIT or GD) must match with the same case
+        :param cache_size: number of scanned texts kept in LRU cache, texts are keyed by their hash
+        """
+        self.max_length = max_length
+        self.case_sensitive_length = case_sensitive_length
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, List[List[str]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._groups: List[List[str]] = list()
+        self._patterns: List[Tuple[str, int]] = list()
+
+        # license groups are deduplicated, each one gets patterns from its names and aliases
+        groups: Dict[str, int] = dict()
+        for lic_li in licenses.licenses_list:
+            for name in lic_li:
+                groups.setdefault(name, len(self._groups))
+            if groups[lic_li[1]] == len(self._groups):
+                self._groups.append(lic_li)
+
+        names = [(name, group_id) for group_id, lic_li in enumerate(self._groups) for name in lic_li]
+        names.extend((alias, groups[value]) for alias, value in license_dictionary.items() if value in groups)
+
+        # automaton is stored in lists indexed by state, state 0 is the root
+        self._goto: List[Dict[str, int]] = [dict()]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [list()]
+
+        seen = set()
+        for name, group_id in names:
+            normalized, _ = _normalize(name)
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            self._add_pattern(normalized, name, group_id)
+
+        self._build_fail_links()
+        self._identifiers = {lic_li[1].lower(): lic_li for lic_li in self._groups}
+        _LOGGER.debug("License mention automaton has %d states", len(self._goto))
+
+    def _add_pattern(self, normalized: str, name: str, group_id: int) -> None:
+        """Add normalized pattern to trie of automaton."""
+        state = 0
+        for character in normalized:
+            next_state = self._goto[state].get(character)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][character] = next_state
+                self._goto.append(dict())
+                self._fail.append(0)
+                self._output.append(list())
+            state = next_state
+
+        self._output[state].append(len(self._patterns))
+        # short names are checked against the original text, normalized pattern is kept for length
+        self._patterns.append((name if len(normalized) <= self.case_sensitive_length else normalized, group_id))
+
+    def _build_fail_links(self) -> None:
+        """Compute fail links in breadth-first order, outputs of fail states are merged to each state."""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for character, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and character not in self._goto[fail]:
+                    fail = self._fail[fail]
+                found = self._goto[fail].get(character, 0)
+                self._fail[next_state] = found if found != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+                queue.append(next_state)
+
+    def _qualify(self, lic_li: List[str], or_later: bool, exception: Optional[str]) -> Optional[List[str]]:
+        """
+        Get license group of license followed by "or later" or exception.
+
+        :param lic_li: mentioned license group
+        :param or_later: license is followed by "or later" or "+"
+        :param exception: name of exception following the license, e.g. "classpath"
+        :return: qualified license group, None if there is no such license
+        """
+        identifier = lic_li[1]
+        if exception is None and (not or_later or identifier.endswith(("-or-later", "+"))):
+            return lic_li
+
+        base = identifier
+        for suffix in _VARIANT_SUFFIXES:
+            if base.endswith(suffix):
+                base = base[: -len(suffix)]
+                break
+
+        if exception is not None:
+            if or_later or "-with-" in identifier:
+                return None
+            candidates = [f"{base}-with-{'-'.join(exception.split())}-exception"]
+        else:
+            candidates = [f"{base}-or-later", f"{base}+"]
+
+        for candidate in candidates:
+            found = self._identifiers.get(candidate.lower())
+            if found is not None:
+                return found
+
+        return None
+
+    def mentions(self, text: str) -> List[Tuple[int, int, Optional[List[str]]]]:
+        """
+        Find license names in text, overlapping names are resolved to the leftmost longest one.
+
+        Names followed by "or later" (or "+") and by exception are resolved to the license with the qualifier.
+
+        :param text: free-form text
+        :return: start and end position in text and license group of each mention, None if the license with qualifier
+            is not known, e.g. "MIT or later"
+        """
+        text = text[: self.max_length]
+        normalized, positions = _normalize(text)
+
+        found: List[Tuple[int, int, int]] = list()
+        state = 0
+        for end, character in enumerate(normalized, start=1):
+            while state and character not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(character, 0)
+
+            for pattern_id in self._output[state]:
+                pattern, _ = self._patterns[pattern_id]
+                start = end - len(pattern)
+                # mentions are whole words only, e.g. MIT is not found in "submit"
+                if (start > 0 and normalized[start - 1] != " ") or (
+                    end < len(normalized) and normalized[end] not in " +"
+                ):
+                    continue
+                if len(pattern) <= self.case_sensitive_length and (
+                    text[positions[start] : positions[end - 1] + 1] != pattern
+                ):
+                    continue
+                found.append((start, end, pattern_id))
+
+        result: List[Tuple[int, int, Optional[List[str]]]] = list()
+        last_end = 0
+        for start, end, pattern_id in sorted(found, key=lambda item: (item[0], item[0] - item[1])):
+            if start < last_end:
+                continue
+
+            or_later = _OR_LATER_REGEX.match(normalized, end)
+            if or_later is not None:
+                end = or_later.end()
+            exception = _EXCEPTION_REGEX.match(normalized, end)
+            if exception is not None:
+                end = exception.end()
+
+            lic_li = self._qualify(
+                self._groups[self._patterns[pattern_id][1]],
+                or_later is not None,
+                exception.group(1) if exception is not None else None,
+            )
+            last_end = end
+            result.append((positions[start], positions[end - 1] + 1, lic_li))
+
+        return result
+
+    def licenses(self, text: str) -> List[List[str]]:
+        """
+        Find distinct license groups mentioned in text, results are cached by hash of text.
+
+        :param text: free-form text, e.g. license field of metadata
+        :return: license groups in order of their first mention, an empty group stands for an unknown license, e.g.
+            joined with a mentioned one by "and" or "or"
+        """
+        key = hashlib.blake2b(text.encode(errors="replace"), digest_size=16).digest()
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        groups: List[List[str]] = list()
+        for start, end, lic_li in self.mentions(text):
+            # license with unknown qualifier is counted as an unknown license
+            lic_li = lic_li or list()
+            if lic_li not in groups:
+                groups.append(lic_li)
+            if _JOINED_AFTER_REGEX.match(text, end) or _JOINED_BEFORE_REGEX.search(text[:start]):
+                # the other license is not known, it is counted as a different one
+                groups.append(list())
+
+        with self._cache_lock:
+            self._cache[key] = groups
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return groups
+
+    def find(self, text: str) -> Optional[List[str]]:
+        """
+        Find license group mentioned in text.
+
+        :param text: free-form text, e.g. license field of metadata
+        :return: license group, None if no license or more different licenses are mentioned
+        """
+        groups = self.licenses(text)
+        if len(groups) > 1:
+            _LOGGER.debug("Text %r mentions more licenses %s", text[:80], [lic_li[1:2] for lic_li in groups])
+
+        return groups[0] if len(groups) == 1 and groups[0] else None
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Merge outputs of more license-solver runs, e.g. of shards, with bounded memory."""
+
+import os
+import re
+import json
+import heapq
+import logging
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+from .output_creator import OutputCreator
+from .exceptions import UnableOpenFile
+
+_LOGGER = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1 << 16
+_WHITESPACE_REGEX = re.compile(r"\s*")
+_PACKAGE_DATA_KEYS = frozenset(("license", "license_version", "classifier", "warning"))
+
+Record = Tuple[str, str, Dict[str, Any]]
+
+
+class _StreamDecoder:
+    """Decode items of top-level objects one by one, a JSON output is one object and NDJSON has one per line."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Init empty buffer."""
+        self._stream = stream
+        self._buffer = ""
+        self._position = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read next chunk to buffer, return False at the end of stream."""
+        chunk = self._stream.read(_CHUNK_SIZE)
+        if not chunk:
+            return False
+
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and get next character, empty string at the end of stream."""
+        while True:
+            self._position = _WHITESPACE_REGEX.match(self._buffer, self._position).end()  # type: ignore[union-attr]
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        """Consume one of expected characters."""
+        character = self._peek()
+        if not character or character not in characters:
+            raise ValueError(f"Expected one of {characters!r}, got {character or 'end of file'!r}")
+
+        self._position += 1
+        return character
+
+    def _decode(self) -> Any:
+        """Decode next JSON value, buffer is extended until the value is complete."""
+        self._peek()
+        while True:
+            try:
+                value, self._position = self._decoder.raw_decode(self._buffer, self._position)
+                return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Get key and value of each item of all top-level objects."""
+        while self._peek():
+            self._expect("{")
+            if self._peek() == "}":
+                self._position += 1
+                continue
+
+            while True:
+                key = self._decode()
+                if not isinstance(key, str):
+                    raise ValueError(f"Expected package name, got {key!r}")
+                self._expect(":")
+                yield key, self._decode()
+
+                if self._expect(",}") == "}":
+                    break
+
+
+def read_output(path: str) -> Iterator[Record]:
+    """
+    Read package versions from output file without loading the whole file.
+
+    :param path: path to JSON output or NDJSON file with one output object per line
+    :return: package name, version and package data
+    """
+    try:
+        with open(path) as f:
+            for name, versions in _StreamDecoder(f).items():
+                if not isinstance(versions, dict):
+                    _LOGGER.warning("Package %r in %s has no versions [SKIPPED]", name, path)
+                    continue
+
+                for version, package_data in versions.items():
+                    if not isinstance(package_data, dict) or not _PACKAGE_DATA_KEYS.issubset(package_data):
+                        _LOGGER.warning("Package %r version %r in %s is not valid [SKIPPED]", name, version, path)
+                        continue
+
+                    yield name, version, package_data
+    except (OSError, ValueError) as e:
+        raise UnableOpenFile(f"Can't read output file {path}: {e}")
+
+
+def _write_run(directory: str, run: List[Record]) -> str:
+    """Write sorted run of records to temporary file, one record per line."""
+    run.sort(key=itemgetter(0, 1))
+    fd, path = tempfile.mkstemp(suffix=".ndjson", dir=directory)
+    with os.fdopen(fd, "w") as f:
+        for record in run:
+            f.write(json.dumps(record))
+            f.write("\n")
+
+    _LOGGER.debug("Sorted run of %d package versions written to %s", len(run), path)
+    return path
+
+
+def _read_run(stream: TextIO) -> Iterator[Record]:
+    """Read records of sorted run."""
+    for line in stream:
+        name, version, package_data = json.loads(line)
+        yield name, version, package_data
+
+
+def _write_runs(paths: Iterable[str], directory: str, run_size: int) -> List[str]:
+    """Split records of all output files to sorted runs of at most run_size records."""
+    runs = list()
+    run: List[Record] = list()
+    for path in paths:
+        _LOGGER.debug("Reading output file %s", path)
+        for record in read_output(path):
+            run.append(record)
+            if len(run) >= run_size:
+                runs.append(_write_run(directory, run))
+                run = list()
+
+    if run:
+        runs.append(_write_run(directory, run))
+
+    return runs
+
+
+def _merge_versions(records: Iterable[Record]) -> Dict[str, Any]:
+    """Reconcile records of one package sorted by version."""
+    versions = dict()
+    for version, version_records in groupby(records, key=itemgetter(1)):
+        distinct: List[Dict[str, Any]] = list()
+        for _, _, package_data in version_records:
+            if package_data not in distinct:
+                distinct.append(package_data)
+
+        versions[version] = OutputCreator.reconcile(distinct)
+
+    return versions
+
+
+def merge_outputs(paths: Iterable[str], output: TextIO, ndjson: bool = False, run_size: int = 100000) -> int:
+    """
+    Merge output files, duplicate package versions are reconciled with the same rules as in OutputCreator.
+
+    Records are sorted in runs written to temporary files and the runs are merged with k-way merge, so at most
+    run_size package versions are kept in memory. Packages and versions are sorted in the merged output.
+
+    :param paths: paths to JSON outputs or NDJSON files
+    :param output: stream for merged output
+    :param ndjson: write one package per line instead of one JSON object
+    :param run_size: number of package versions sorted in memory at once
+    :return: number of packages written
+    """
+    with tempfile.TemporaryDirectory(prefix="license-solver-merge-") as directory:
+        runs = _write_runs(paths, directory, run_size)
+        streams = [open(run) for run in runs]
+        try:
+            merged = heapq.merge(*(_read_run(stream) for stream in streams), key=itemgetter(0, 1))
+
+            count = 0
+            output.write("" if ndjson else "{")
+            for name, records in groupby(merged, key=itemgetter(0)):
+                versions = _merge_versions(records)
+                if ndjson:
+                    output.write(json.dumps({name: versions}))
+                    output.write("\n")
+                else:
+                    output.write(", " if count else "")
+                    output.write(f"{json.dumps(name)}: {json.dumps(versions)}")
+                count += 1
+
+            output.write("" if ndjson else "}\n")
+        finally:
+            for stream in streams:
+                stream.close()
+
+    _LOGGER.debug("Merged %d packages from %d sorted runs", count, len(runs))
+    return count
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Read core metadata (METADATA/PKG-INFO) of Python distributions."""
+
+import os
+import re
+import json
+import tarfile
+import zipfile
+import logging
+import sysconfig
+from typing import Dict, Any, List, Optional, Iterable, Callable
+from .exceptions import UnableOpenFile
+
+_LOGGER = logging.getLogger(__name__)
+
+_WHEEL_SUFFIXES = (".whl",)
+_ZIP_SDIST_SUFFIXES = (".zip",)
+_TAR_SDIST_SUFFIXES = (".tar.gz", ".tgz", ".tar.bz2", ".tbz", ".tar.xz", ".txz", ".tar")
+
+# e.g. LICENSE, LICENSE.txt, LICENCE.md, LICENSE-MIT or COPYING
+_LICENSE_FILE_REGEX = re.compile(r"^(?:licen[cs]e|copying)(?:[.-][\w.-]*)?$", re.IGNORECASE)
+# longer files are truncated, license texts are a few kilobytes
+_MAX_LICENSE_TEXT_SIZE = 64 * 1024
+
+# fields which can occur more times in core metadata, they are kept as lists
+_MULTIPLE_USE_FIELDS = frozenset(
+    {
+        "Classifier",
+        "Dynamic",
+        "License-File",
+        "Obsoletes-Dist",
+        "Platform",
+        "Project-URL",
+        "Provides-Dist",
+        "Provides-Extra",
+        "Requires-Dist",
+        "Requires-External",
+        "Supported-Platform",
+    }
+)
+
+
+def _canonical_field(field: str) -> str:
+    """Convert header name to the form used in the core metadata specification (e.g. ``Requires-Dist``)."""
+    return "-".join(part.capitalize() if part.lower() != "url" else "URL" for part in field.strip().split("-"))
+
+
+def parse_metadata(content: str) -> Dict[str, Any]:
+    """
+    Parse RFC 822 headers of core metadata to dictionary understood by JsonSolver.
+
+    Only the header block is parsed, the body (long description) is never touched.
+
+    :param content: METADATA or PKG-INFO file content
+    :return: dictionary with field names as keys, multiple-use fields are lists
+    """
+    return _parse_headers(content.splitlines())
+
+
+def _parse_headers(lines: Iterable[str]) -> Dict[str, Any]:
+    """Parse header lines, iteration stops on the first empty line so the body is never read."""
+    result: Dict[str, Any] = dict()
+    field: Optional[str] = None
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            # end of headers, rest is message body
+            break
+
+        if line[0] in (" ", "\t"):
+            # continuation line of the previous field
+            if field is None:
+                continue
+
+            value = line.strip()
+            if value.startswith("|"):
+                value = value[1:].strip()
+
+            if field in _MULTIPLE_USE_FIELDS:
+                result[field][-1] = f"{result[field][-1]}\n{value}"
+            else:
+                result[field] = f"{result[field]}\n{value}"
+            continue
+
+        name, separator, value = line.partition(":")
+        if not separator:
+            _LOGGER.debug("Malformed metadata header line SKIPPED: %r", line)
+            field = None
+            continue
+
+        field = _canonical_field(name)
+        value = value.strip()
+
+        if field in _MULTIPLE_USE_FIELDS:
+            result.setdefault(field, list()).append(value)
+        else:
+            result[field] = value
+
+    return result
+
+
+def read_metadata_file(metadata_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read and parse headers of METADATA or PKG-INFO file.
+
+    :param metadata_path: path to metadata file
+    :return: parsed metadata, None if the file can't be read
+    """
+    try:
+        with open(metadata_path, encoding="utf-8", errors="replace") as f:
+            metadata = _parse_headers(f)
+    except OSError as e:
+        _LOGGER.error("Broken or can't find file: %s\nerror: %s.", metadata_path, e)
+        return None
+
+    _LOGGER.debug("Loaded metadata file %s", metadata_path)
+    if _is_license_missing(metadata):
+        _add_license_text(metadata, _read_directory_license_text(os.path.dirname(metadata_path)))
+
+    return metadata
+
+
+def _is_license_missing(metadata: Dict[str, Any]) -> bool:
+    """Check if metadata have no license, license file is read only in that case."""
+    if metadata.get("License-Expression"):
+        return False
+
+    license_name = metadata.get("License")
+    return not license_name or license_name.lower() == "unknown"
+
+
+def _add_license_text(metadata: Dict[str, Any], content: Optional[bytes]) -> None:
+    """Add content of license file to metadata, it is read by JsonSolver.get_license_text."""
+    if content is not None:
+        metadata["license_text"] = content[:_MAX_LICENSE_TEXT_SIZE].decode("utf-8", errors="replace")
+
+
+def _is_license_file(parts: List[str]) -> bool:
+    """Check if path parts relative to distribution directory point to license file, PEP 639 uses licenses/."""
+    if len(parts) == 2 and parts[0] == "licenses":
+        parts = parts[1:]
+
+    return len(parts) == 1 and _LICENSE_FILE_REGEX.match(parts[0]) is not None
+
+
+def _read_directory_license_text(directory: str) -> Optional[bytes]:
+    """Read the first license file of installed distribution, e.g. ``foo-1.0.dist-info/LICENSE``."""
+    candidates: List[str] = list()
+    for root in (directory, os.path.join(directory, "licenses")):
+        if os.path.isdir(root):
+            candidates.extend(os.path.join(root, name) for name in sorted(os.listdir(root)) if _is_license_file([name]))
+
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            try:
+                with open(candidate, "rb") as f:
+                    return f.read(_MAX_LICENSE_TEXT_SIZE)
+            except OSError as e:
+                _LOGGER.debug("Can't read license file %s: %s", candidate, e)
+
+    return None
+
+
+def get_site_packages_paths() -> List[str]:
+    """Get site-packages directories of the current interpreter."""
+    paths = sysconfig.get_paths()
+    return sorted({paths["purelib"], paths["platlib"]})
+
+
+def get_installed_metadata_paths(site_packages: str) -> List[str]:
+    """
+    List metadata files of distributions installed in site-packages.
+
+    :param site_packages: site-packages directory
+    :return: paths to *.dist-info/METADATA and *.egg-info/PKG-INFO files
+    """
+    result = list()
+    for entry in os.scandir(site_packages):
+        if not entry.is_dir():
+            continue
+
+        if entry.name.endswith(".dist-info"):
+            metadata_path = os.path.join(entry.path, "METADATA")
+        elif entry.name.endswith(".egg-info"):
+            metadata_path = os.path.join(entry.path, "PKG-INFO")
+        else:
+            continue
+
+        if os.path.isfile(metadata_path):
+            result.append(metadata_path)
+
+    return sorted(result)
+
+
+def is_archive(path: str) -> bool:
+    """Check if path points to a supported wheel or sdist archive."""
+    return path.endswith(_WHEEL_SUFFIXES + _ZIP_SDIST_SUFFIXES + _TAR_SDIST_SUFFIXES)
+
+
+def _is_metadata_member(member: str, directory_suffix: str, file_name: str) -> bool:
+    """Check if archive member is a top-level metadata file, e.g. ``foo-1.0.dist-info/METADATA``."""
+    parts = member.split("/")
+    return len(parts) == 2 and parts[0].endswith(directory_suffix) and parts[1] == file_name
+
+
+def _is_license_member(member: str, directory_suffix: str) -> bool:
+    """Check if archive member is a license file, e.g. ``foo-1.0.dist-info/LICENSE`` or ``foo-1.0/COPYING``."""
+    parts = member.split("/")
+    return len(parts) > 1 and parts[0].endswith(directory_suffix) and _is_license_file(parts[1:])
+
+
+def _read_zip_member(archive_path: str, match: Callable[[str], bool]) -> Optional[bytes]:
+    """Read only the first matching member from a zip archive."""
+    with zipfile.ZipFile(archive_path) as archive:
+        for member in archive.namelist():
+            if match(member):
+                return archive.read(member)
+
+    return None
+
+
+def _read_tar_member(archive_path: str, match: Callable[[str], bool]) -> Optional[bytes]:
+    """Read only the first matching member from a tar archive, other members are skipped without extracting."""
+    with tarfile.open(archive_path, "r:*") as archive:
+        for member in archive:
+            if member.isfile() and match(member.name):
+                extracted = archive.extractfile(member)
+                return extracted.read() if extracted is not None else None
+
+    return None
+
+
+def _read_archive_member(archive_path: str, license_file: bool = False) -> Optional[bytes]:
+    """Read metadata or license file member of wheel or sdist archive."""
+    if archive_path.endswith(_WHEEL_SUFFIXES):
+        directory_suffix = ".dist-info"
+        file_name = "METADATA"
+    else:
+        directory_suffix = ""
+        file_name = "PKG-INFO"
+
+    def _match(member: str) -> bool:
+        if license_file:
+            return _is_license_member(member, directory_suffix)
+        return _is_metadata_member(member, directory_suffix, file_name)
+
+    if archive_path.endswith(_TAR_SDIST_SUFFIXES):
+        return _read_tar_member(archive_path, _match)
+
+    return _read_zip_member(archive_path, _match)
+
+
+def read_archive_metadata(archive_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read and parse core metadata from wheel or sdist archive.
+
+    :param archive_path: path to .whl, .zip or .tar.* archive
+    :return: parsed metadata, None if the archive is not supported or metadata were not found
+    """
+    if not is_archive(archive_path):
+        _LOGGER.warning("File %s is not a supported archive. SKIPPED", archive_path)
+        return None
+
+    try:
+        content = _read_archive_member(archive_path)
+        if content is None:
+            _LOGGER.warning("Metadata not found in archive %s. SKIPPED", archive_path)
+            return None
+
+        metadata = parse_metadata(content.decode("utf-8", errors="replace"))
+        if _is_license_missing(metadata):
+            # many sdists ship only LICENSE file, the archive is read once more only in that case
+            _add_license_text(metadata, _read_archive_member(archive_path, license_file=True))
+    except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+        _LOGGER.error("Broken or can't open archive: %s\nerror: %s.", archive_path, e)
+        return None
+
+    _LOGGER.debug("Loaded metadata from archive %s", archive_path)
+    return metadata
+
+
+def get_archive_paths(directory: str) -> List[str]:
+    """List supported archives in directory, subdirectories are skipped."""
+    return sorted(entry.path for entry in os.scandir(directory) if entry.is_file() and is_archive(entry.name))
+
+
+def load_metadata_file(path: str) -> Dict[str, Any]:
+    """
+    Load metadata from JSON file, wheel/sdist archive or METADATA/PKG-INFO file.
+
+    :param path: path to file
+    :return: metadata dictionary
+    """
+    metadata: Optional[Dict[str, Any]]
+    if path.endswith(".json"):
+        try:
+            with open(path) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError) as e:
+            raise UnableOpenFile(f"Broken or can't find file {path}: {e}")
+    elif is_archive(path):
+        metadata = read_archive_metadata(path)
+    else:
+        metadata = read_metadata_file(path)
+
+    if not isinstance(metadata, dict):
+        raise UnableOpenFile(f"Metadata not found in file {path}")
+
+    return metadata
@@ -20,24 +20,74 @@
 import json
 import sys
 import logging
+import threading
 from .comparator import Comparator
+from .github import GitHubVerification
 from .package import Package
-from typing import Dict, Any
+from .records import FrozenDict, intern_classifier, intern_package_data, freeze_package_data
+from .output_sqlite import SqliteOutput
+from .output_summary import SummaryOutput
+from typing import Dict, Any, List, Optional, Sequence
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class _Partial:
+    """Packages added by one thread since the output was last merged, one reconciled record per package version."""
+
+    __slots__ = ("packages", "lock")
+
+    def __init__(self) -> None:
+        """Init empty partial output."""
+        self.packages: Dict[str, Dict[str, FrozenDict]] = dict()
+        # taken by the owner thread while adding and by the thread merging outputs
+        self.lock = threading.Lock()
+
+
+def _canonical(value: Any) -> str:
+    """Get sort key of a value of package data, the smallest one is kept when values of duplicates differ."""
+    return json.dumps(value, sort_keys=True)
+
+
 class OutputCreator:
-    """Propose of this class is to create dictionary for all packages (input)."""
+    """
+    Propose of this class is to create dictionary for all packages (input).
 
-    def __init__(self, github: bool = False) -> None:
+    Packages can be added from more threads at once. Each thread adds packages to its own partial output and the
+    partial outputs are moved to the merged output when it is read. Duplicate records of a package version are
+    reconciled right away and the reconciliation does not depend on their order, so the output does not depend on
+    the order of inputs or on the thread which added them. Packages and their versions are sorted in the output.
+    """
+
+    def __init__(
+        self,
+        github: bool = False,
+        sqlite: Optional[SqliteOutput] = None,
+        summary: Optional[SummaryOutput] = None,
+        prescriptions: Optional[Dict[str, str]] = None,
+    ) -> None:
         """
         Init variables for OutputCreator.
 
         :param github:
+        :param sqlite: store packages to SQLite database instead of keeping them in memory
+        :param summary: only count packages per license instead of keeping them in memory
+        :param prescriptions: index of GitHub repositories from local prescriptions used by the github check
         """
-        self.file: Dict[Any, Any] = dict()
-        self.comparator: Comparator = Comparator(github)
+        self.comparator: Comparator = Comparator(github, prescriptions)
+        # packages are added right after local detection, github check updates them later in background
+        self.github_verification: Optional[GitHubVerification] = None
+        if self.comparator.resolver is not None:
+            self.github_verification = GitHubVerification(
+                self.comparator.resolver, self.comparator.get_repository, self._set_github_warning
+            )
+        self.sqlite: Optional[SqliteOutput] = sqlite
+        self.summary: Optional[SummaryOutput] = summary
+        self._local = threading.local()
+        self._partials: List[_Partial] = list()
+        # guards list of partial outputs, merged output and shared SQLite and summary outputs
+        self._lock = threading.Lock()
+        self._merged: Dict[str, Dict[str, FrozenDict]] = dict()
 
     def add_package(self, package: Package) -> None:
         """
@@ -46,36 +96,200 @@ class OutputCreator:
         :param package: Package data
         :return: None
         """
-        warning = False
-
         # save only package with name and version
-        if package.name and package.version:
-            if not self.comparator.cmp(package):
+        if not package.name or not package.version:
+            _LOGGER.debug("The file %s has no package name or version. SKIPPED to create OUTPUT", package.file_path)
+            return
+
+        if self.github_verification is None:
+            self._store(
+                package.name, package.version, self._create_package_data(package, not self.comparator.cmp(package))
+            )
+            return
+
+        matched = self.comparator.compare_classifier(package)
+        package_data = self._create_package_data(package, matched is False)
+        self._store(package.name, package.version, package_data)
+        if matched:
+            self.github_verification.submit(package.name, package.version, package_data)
+
+    def verify_github(self) -> None:
+        """Wait until github check of all added packages is finished."""
+        if self.github_verification is not None:
+            self.github_verification.join()
+
+    def _set_github_warning(self, name: str, version: str, package_data: FrozenDict) -> None:
+        """Set warning of package whose license differs from license of its GitHub repository."""
+        warned = freeze_package_data({**package_data, "warning": True})
+        if self.summary is not None:
+            with self._lock:
+                self.summary.set_warning(name, version, package_data)
+
+        # record with warning is reconciled with the stored one as a duplicate, warning is kept
+        if self.sqlite is not None:
+            with self._lock:
+                self._add_to_sqlite(self.sqlite, name, version, warned)
+        elif self.summary is None:
+            self._add_to_file(name, version, warned)
+
+    def _store(self, name: str, version: str, package_data: FrozenDict) -> None:
+        """Add package data to summary, SQLite or in-memory output."""
+        if self.summary is not None:
+            with self._lock:
+                self.summary.add(name, version, package_data)
+
+        if self.sqlite is not None:
+            with self._lock:
+                self._add_to_sqlite(self.sqlite, name, version, package_data)
+        elif self.summary is None:
+            self._add_to_file(name, version, package_data)
+
+        _LOGGER.debug("Add package to OutputCreator: %s", package_data)
+
+    def get_package_data(self, package: Package) -> Optional[FrozenDict]:
+        """
+        Compare license with classifier and create package data, output is not changed.
+
+        The github check is not done in background here, the result waits for the repository to be resolved.
+
+        :param package: Package data
+        :return: shared package data record, None if package has no name or version
+        """
+        if not package.name or not package.version:
+            return None
+
+        return self._create_package_data(package, not self.comparator.cmp(package))
+
+    @staticmethod
+    def _create_package_data(package: Package, warning: bool) -> FrozenDict:
+        """Create package data record of package."""
+        # records are interned, packages with the same license share one immutable object
+        return intern_package_data(
+            package.license,  # type: ignore[arg-type]
+            str(package.license_version),
+            intern_classifier(package.classifier),
+            warning,
+            str(package.license_expression) if package.license_expression is not None else None,
+        )
+
+    def _add_to_file(self, name: str, version: str, package_data: FrozenDict) -> None:
+        """Add package data to partial output of the current thread."""
+        partial = getattr(self._local, "partial", None)
+        if partial is None:
+            partial = _Partial()
+            self._local.partial = partial
+            with self._lock:
+                self._partials.append(partial)
+
+        with partial.lock:
+            self._add_record(partial.packages, name, version, package_data)
+
+    @classmethod
+    def _add_record(
+        cls, packages: Dict[str, Dict[str, FrozenDict]], name: str, version: str, package_data: FrozenDict
+    ) -> bool:
+        """Add record of package version, it is reconciled with the stored one, return True if packages changed."""
+        versions = packages.setdefault(name, dict())
+        old = versions.get(version)
+        new = package_data if old is None else cls.reconcile((old, package_data))
+        if new is old:
+            return False
+
+        versions[version] = new  # type: ignore[assignment]
+        return True
+
+    @property
+    def file(self) -> Dict[str, Dict[str, Any]]:
+        """Get output dictionary, packages added by all threads are merged to it."""
+        self.verify_github()
+        return self._merge()
+
+    def _merge(self) -> Dict[str, Dict[str, Any]]:
+        """Move packages from partial outputs to the merged output, github check is not waited for."""
+        with self._lock:
+            changed = False
+            for partial in self._partials:
+                with partial.lock:
+                    packages, partial.packages = partial.packages, dict()
+
+                for name, versions in packages.items():
+                    for version, package_data in versions.items():
+                        changed |= self._add_record(self._merged, name, version, package_data)
+
+            if changed:
+                # sorted order does not depend on threads which added packages
+                self._merged = {name: dict(sorted(self._merged[name].items())) for name in sorted(self._merged)}
+
+            return self._merged
+
+    @staticmethod
+    def reconcile(records: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Reconcile records of the same package version, the result does not depend on order of records.
+
+        Records are merged pairwise by ``merge_records``, which is commutative and associative, so records can be
+        reconciled as they are added.
+
+        :param records: package data of package version
+        :return: package data, warning is set if records don't match
+        """
+        result = records[0]
+        for record in records[1:]:
+            result = OutputCreator.merge_records(result, record)
+
+        return result
+
+    @staticmethod
+    def merge_records(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge two records of the same package version, the result does not depend on their order.
+
+        Missing values are filled from the other record. If values differ, warning is set and the value which is
+        smaller in canonical JSON is kept, license version is always kept with its license.
+
+        :param first: package data
+        :param second: package data
+        :return: merged package data, the first record if records are equal
+        """
+        if first == second:
+            return first
+
+        warning = bool(first["warning"] or second["warning"])
+        merged: Dict[str, Any] = dict()
+        for keys in (("license", "license_version"), ("classifier",), ("license_expression",)):
+            values = sorted(
+                {_canonical([record.get(key) for key in keys]): record for record in (first, second)}.items()
+            )
+            present = [(canonical, record) for canonical, record in values if record.get(keys[0]) is not None]
+            if len(present) > 1:
                 warning = True
+            chosen = (present or values)[0][1]
+            merged.update((key, chosen.get(key)) for key in keys)
 
-            package_data: Dict[str, Any] = {
-                "license": package.license,
-                "license_version": str(package.license_version),
-                "classifier": package.classifier,
-            }
+        merged["warning"] = warning
+        if merged["license_expression"] is None:
+            del merged["license_expression"]
 
-            if warning:
-                package_data["warning"] = True
-            else:
-                package_data["warning"] = False
+        merged_data = freeze_package_data(merged)
+        return first if merged_data == first else merged_data
 
-            if self.file.get(package.name) is None:
-                self.file[package.name] = {package.version: package_data}
-            else:
-                if self.file[package.name].get(package.version) is None:
-                    self.file[package.name][package.version] = package_data
-                else:
-                    self._check_duplicity(self.file[package.name].get(package.version), package_data)
+    def _add_to_sqlite(self, sqlite: SqliteOutput, name: str, version: str, package_data: Dict[str, Any]) -> None:
+        """Add package data to SQLite output, duplicities are checked against stored row."""
+        old = sqlite.get(name, version)
+        if old is None:
+            sqlite.put(name, version, package_data)
+            return
 
-            _LOGGER.debug("Add package to OutputCreator: %s", package_data)
+        new = dict(old)
+        self._check_duplicity(new, package_data)
+        if new != old:
+            sqlite.put(name, version, new)
 
-        else:
-            _LOGGER.debug("The file %s has no package name or version. SKIPPED to create OUTPUT", package.file_path)
+    def close(self) -> None:
+        """Flush and close SQLite output if used."""
+        self.verify_github()
+        if self.sqlite is not None:
+            self.sqlite.close()
 
     @staticmethod
     def _check_duplicity(old: Dict[str, Any], new: Dict[str, Any]) -> None:
@@ -90,7 +304,7 @@ class OutputCreator:
             return
         else:
             for index in old:
-                if old[index] is None and old[index] != new[index]:
+                if old[index] is None and old[index] != new.get(index):
                     if index != "license_version":
                         old[index] = new[index]
 
@@ -99,18 +313,33 @@ class OutputCreator:
 
                     _LOGGER.debug("Update package information %s to %s", index, new[index])
 
-                elif old[index] != new[index]:
+                elif old[index] != new.get(index):
                     _LOGGER.debug("Found not same duplicity set warning=True")
                     old["warning"] = True
 
+    def get_result(self) -> Dict[str, Any]:
+        """Get final output, summary is returned in summary mode."""
+        self.verify_github()
+        return self.summary.as_dict() if self.summary is not None else self.file
+
     def is_empty(self) -> bool:
         """Check if variable file is empty."""
-        return True if not self.file else False
+        self.verify_github()
+        with self._lock:
+            if self._merged:
+                return False
+
+            for partial in self._partials:
+                with partial.lock:
+                    if partial.packages:
+                        return False
+
+        return True
 
     def print(self, indent: int = -1) -> None:
         """Print dictionary on STDOUT."""
         _LOGGER.debug("Print on STDOUT final json")
         if indent < 0:
-            print(json.dumps(self.file), file=sys.stdout)
+            print(json.dumps(self.get_result()), file=sys.stdout)
         else:
-            print(json.dumps(self.file, indent=indent), file=sys.stdout)
+            print(json.dumps(self.get_result(), indent=indent), file=sys.stdout)
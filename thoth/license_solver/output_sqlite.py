@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Class store output in SQLite database."""
+
+import json
+import sqlite3
+import logging
+from typing import Dict, Any, Optional
+from .exceptions import UnableOpenFile
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS packages (
+        name TEXT NOT NULL,
+        version TEXT NOT NULL,
+        license_full_name TEXT,
+        license_identifier_spdx TEXT,
+        license_identifier TEXT,
+        license_expression TEXT,
+        license_version TEXT,
+        classifier TEXT,
+        warning INTEGER NOT NULL,
+        PRIMARY KEY (name, version)
+    )
+    """,
+    # the primary key index serves lookups by package name
+    "CREATE INDEX IF NOT EXISTS packages_license_identifier_spdx ON packages (license_identifier_spdx)",
+    "CREATE INDEX IF NOT EXISTS packages_license_identifier ON packages (license_identifier)",
+    "CREATE INDEX IF NOT EXISTS packages_warning ON packages (warning)",
+)
+
+
+class SqliteOutput:
+    """Store package data in SQLite database, rows are written in batched transactions."""
+
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        """
+        Open database and create schema.
+
+        :param path: path to database file
+        :param batch_size: number of written packages after which transaction is committed
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = 0
+
+        try:
+            # writes are serialized by OutputCreator, they can come from more threads
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+            self._connection.commit()
+        except sqlite3.Error as e:
+            raise UnableOpenFile(f"Can't open SQLite database {path}: {e}")
+
+        _LOGGER.debug("SQLite output %s was opened", path)
+
+    def get(self, name: str, version: str) -> Optional[Dict[str, Any]]:
+        """Get package data of stored package version, None if not stored yet."""
+        row = self._connection.execute(
+            "SELECT license_full_name, license_identifier_spdx, license_identifier, license_version, classifier,"
+            " warning, license_expression FROM packages WHERE name = ? AND version = ?",
+            (name, version),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        package_data = {
+            "license": {"full_name": row[0], "identifier_spdx": row[1], "identifier": row[2]},
+            "license_version": row[3],
+            "classifier": json.loads(row[4]),
+            "warning": bool(row[5]),
+        }
+        if row[6] is not None:
+            package_data["license_expression"] = row[6]
+
+        return package_data
+
+    def put(self, name: str, version: str, package_data: Dict[str, Any]) -> None:
+        """Insert or replace package data of package version."""
+        package_license = package_data["license"] or {}
+        self._connection.execute(
+            "INSERT OR REPLACE INTO packages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                name,
+                version,
+                package_license.get("full_name"),
+                package_license.get("identifier_spdx"),
+                package_license.get("identifier"),
+                package_data.get("license_expression"),
+                package_data["license_version"],
+                json.dumps(package_data["classifier"]),
+                int(package_data["warning"]),
+            ),
+        )
+
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.commit()
+
+    def commit(self) -> None:
+        """Commit pending transaction."""
+        if self._pending:
+            self._connection.commit()
+            _LOGGER.debug("Committed %d packages to SQLite output", self._pending)
+            self._pending = 0
+
+    def close(self) -> None:
+        """Commit pending transaction and close database."""
+        self.commit()
+        self._connection.close()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Class aggregate output to counters per license."""
+
+import logging
+from typing import Dict, Any, List
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SummaryOutput:
+    """
+    Count packages per license identifier and warning state.
+
+    Per-package records are never retained, only counters and a few samples, so memory depends only on the number of
+    distinct licenses. Duplicate package versions are counted every time they are added.
+    """
+
+    def __init__(self, samples: int = 5) -> None:
+        """
+        Init counters.
+
+        :param samples: number of sample packages kept for each license and warning state
+        """
+        self.samples = samples
+        self.packages = 0
+        self.warnings = 0
+        self.licenses: Dict[str, Dict[str, Any]] = dict()
+
+    def add(self, name: str, version: str, package_data: Dict[str, Any]) -> None:
+        """Count package data of package version."""
+        package_license = package_data["license"] or {}
+        identifier = package_license.get("identifier_spdx") or "UNDETECTED"
+        warning = bool(package_data["warning"])
+
+        entry = self.licenses.get(identifier)
+        if entry is None:
+            entry = {
+                "full_name": package_license.get("full_name") if identifier != "UNDETECTED" else "UNDETECTED",
+                "packages": 0,
+                "warnings": 0,
+                "samples": list(),
+                "warning_samples": list(),
+            }
+            self.licenses[identifier] = entry
+
+        self.packages += 1
+        entry["packages"] += 1
+
+        samples: List[str] = entry["samples"]
+        if warning:
+            self.warnings += 1
+            entry["warnings"] += 1
+            samples = entry["warning_samples"]
+
+        if len(samples) < self.samples:
+            samples.append(f"{name}=={version}")
+
+    def set_warning(self, name: str, version: str, package_data: Dict[str, Any]) -> None:
+        """Move already counted package version without warning to packages with warning."""
+        package_license = package_data["license"] or {}
+        entry = self.licenses.get(package_license.get("identifier_spdx") or "UNDETECTED")
+        if entry is None or package_data["warning"]:
+            return
+
+        self.warnings += 1
+        entry["warnings"] += 1
+
+        sample = f"{name}=={version}"
+        if sample in entry["samples"]:
+            entry["samples"].remove(sample)
+        if len(entry["warning_samples"]) < self.samples:
+            entry["warning_samples"].append(sample)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get summary, licenses are sorted by number of packages."""
+        return {
+            "packages": self.packages,
+            "warnings": self.warnings,
+            "licenses": dict(sorted(self.licenses.items(), key=lambda item: (-item[1]["packages"], item[0]))),
+        }
@@ -21,11 +21,16 @@ import re
 import yaml
 import os
 import logging
-from typing import Union, Tuple, List, Optional, Dict
+from functools import lru_cache
+from typing import Union, Tuple, List, Optional, Dict, FrozenSet
 from .exceptions import UnableOpenFileData
+from .records import FrozenDict, intern_license
+from .expression import Expression
 
 _LOGGER = logging.getLogger(__name__)
 
+_NO_LICENSE = FrozenDict()
+
 
 def _detect_version_and_delete(string: str) -> Union[Tuple[str, str], Tuple[str, None]]:
     """
@@ -47,14 +52,29 @@ def _detect_version_and_delete(string: str) -> Union[Tuple[str, str], Tuple[str,
         return re.sub(regex, "", string).strip(), None
 
 
+@lru_cache(maxsize=1)
+def _get_licenses_without_version() -> FrozenSet[str]:
+    """Load names of licenses which have no versions, file is read only once."""
+    file_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data", "license_without_versions.yaml")
+    try:
+        with open(file_path) as f:
+            data = yaml.safe_load(f)
+            return frozenset(data["license-no-versions"])
+    except Exception:
+        raise UnableOpenFileData
+
+
 class Package:
     """Object which store values metadata."""
 
+    __slots__ = ("name", "version", "license", "license_expression", "license_version", "classifier", "file_path")
+
     def __init__(self) -> None:
         """Init."""
         self.name: str = ""
         self.version: str = ""
-        self.license: Dict[str, str] = dict()
+        self.license: Dict[str, str] = _NO_LICENSE
+        self.license_expression: Optional[Expression] = None
         self.license_version: str = ""
         self.classifier: List[List[str]] = list()
         self.file_path: str = ""
@@ -76,29 +96,19 @@ class Package:
             _LOGGER.debug("Unsuccessful set version package")
 
     def set_license(self, license_name: Tuple[List[str], bool]) -> None:
-        """Set type of license."""
-        file_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data", "license_without_versions.yaml")
-        try:
-            with open(file_path) as f:
-                data = yaml.safe_load(f)
-                licenses_without_version = data["license-no-versions"]
-        except Exception:
-            raise UnableOpenFileData
+        """Set type of license, the license record is shared with all packages with the same license."""
+        licenses_without_version = _get_licenses_without_version()
 
         if len(license_name[0]) > 1:
+            self.license = intern_license(license_name[0][0], license_name[0][1], license_name[0][2])
+
             if license_name[0][0] in licenses_without_version:
-                self.license["full_name"] = license_name[0][0]
-                self.license["identifier_spdx"] = license_name[0][1]
-                self.license["identifier"] = license_name[0][2]
                 self.set_license_version("LICENSE-WITHOUT-VERSION")
                 _LOGGER.debug("Set license %s and version %s", license_name[0], "LICENSE-WITHOUT-VERSION")
             elif license_name[1]:
                 _license_name_no_version, _license_version = _detect_version_and_delete(
                     license_name[0][len(license_name[0]) - 1]
                 )
-                self.license["full_name"] = license_name[0][0]
-                self.license["identifier_spdx"] = license_name[0][1]
-                self.license["identifier"] = license_name[0][2]
 
                 if _license_version is None:
                     self.set_license_version("UNDETECTED")
@@ -107,24 +117,25 @@ class Package:
                     self.set_license_version(_license_version)
                     _LOGGER.debug("Set license %s and version %s", license_name[0], _license_version)
             else:
-                self.license["full_name"] = license_name[0][0]
-                self.license["identifier_spdx"] = license_name[0][1]
-                self.license["identifier"] = license_name[0][2]
                 self.set_license_version("UNDETECTED")
                 _LOGGER.debug("Set license %s and version %s", license_name[0], "UNDETECTED")
         elif len(license_name[0]) == 1:
-            self.license["full_name"] = license_name[0][0]
-            self.license["identifier_spdx"] = "UNDETECTED"
-            self.license["identifier"] = "UNDETECTED"
+            self.license = intern_license(license_name[0][0], "UNDETECTED", "UNDETECTED")
             self.set_license_version("UNDETECTED")
             _LOGGER.debug("Set license %s and version %s", license_name[0], "UNDETECTED")
         else:
-            self.license["full_name"] = "UNDETECTED"
-            self.license["identifier_spdx"] = "UNDETECTED"
-            self.license["identifier"] = "UNDETECTED"
+            self.license = intern_license("UNDETECTED", "UNDETECTED", "UNDETECTED")
             self.set_license_version("UNDETECTED")
             _LOGGER.debug("Set license %s and version %s", list(["UNDETECTED"]), "UNDETECTED")
 
+    def set_license_expression(self, expression: Expression) -> None:
+        """Set license from compound SPDX license expression, e.g. ``MIT OR Apache-2.0``."""
+        rendered = str(expression)
+        self.license_expression = expression
+        self.license = intern_license(rendered, rendered, rendered)
+        self.set_license_version("UNDETECTED")
+        _LOGGER.debug("Set license expression %s", rendered)
+
     def set_license_version(self, license_version: str) -> None:
         """Set version of license."""
         self.license_version = license_version
@@ -151,6 +162,7 @@ class Package:
             f"package:\t\t {self.name}\n"
             f"version:\t\t {self.version}\n"
             f"license:\t\t {self.license}\n"
+            f"expression:\t\t {self.license_expression}\n"
             f"license_version: {self.license_version}\n"
             f"classifier:\t\t {self.classifier}\n"
             f"file_path:\t\t {self.file_path}"
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Evaluate allow/review/deny license policy compiled to bitsets over SPDX licenses and classifiers."""
+
+import re
+import yaml
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .classifiers import Classifiers
+from .expression import Expression, ExpressionParser, LicenseExpression
+from .licenses import Licenses
+from .records import FrozenDict
+from .exceptions import InvalidPolicy, UnableOpenFile
+
+_LOGGER = logging.getLogger(__name__)
+
+ALLOW = "allow"
+REVIEW = "review"
+DENY = "deny"
+
+# verdicts ordered by severity, the most severe one wins
+VERDICTS = (ALLOW, REVIEW, DENY)
+_RULE_KINDS = ("spdx", "family", "classifier")
+
+# packages without detected license are in the index too, so they can be matched by rules
+_SPECIAL_LICENSES = ("UNDETECTED", "UNKNOWN")
+
+_FAMILY_REGEX = re.compile(r"^(.*?)(?:-v?\d.*)?$")
+
+
+def license_family(identifier: str) -> str:
+    """Get family of SPDX identifier, it is the identifier without version and variant, e.g. "GPL" for "GPL-2.0+"."""
+    return _FAMILY_REGEX.match(identifier).group(1).lower()  # type: ignore[union-attr]
+
+
+class LicensePolicy:
+    """
+    License policy with allow, review and deny rules matching SPDX identifiers, license families and classifiers.
+
+    Rules are compiled to one bitset per verdict over the index of SPDX licenses and one over the index of license
+    classifiers. Each package is then checked with a few bitwise tests and verdicts are cached per shared record.
+    """
+
+    def __init__(
+        self,
+        rules: Dict[str, Any],
+        licenses: Licenses,
+        classifiers: Classifiers,
+        expressions: ExpressionParser,
+        cache_size: int = 8192,
+    ) -> None:
+        """
+        Compile policy rules.
+
+        :param rules: policy, e.g. ``{"default": "review", "deny": {"family": ["GPL"]}, "allow": {"spdx": ["MIT"]}}``
+        :param licenses: loaded SPDX licenses
+        :param classifiers: loaded license classifiers
+        :param expressions: parser of SPDX license expressions
+        :param cache_size: number of evaluated package records kept in LRU cache
+        """
+        if not isinstance(rules, dict):
+            raise InvalidPolicy("Policy must be a mapping of verdicts to rules")
+
+        unknown = set(rules) - set(VERDICTS) - {"default"}
+        if unknown:
+            raise InvalidPolicy(f"Unknown policy keys: {', '.join(sorted(unknown))}")
+
+        self.default: str = rules.get("default", REVIEW)
+        if self.default not in VERDICTS:
+            raise InvalidPolicy(f"Default verdict must be one of {', '.join(VERDICTS)}, got {self.default!r}")
+
+        self.expressions = expressions
+        self._licenses: Dict[str, int] = dict()
+        self._families: Dict[str, int] = dict()
+        for identifier in [lic[1] for lic in licenses.licenses_list] + list(_SPECIAL_LICENSES):
+            bit = 1 << len(self._licenses)
+            self._licenses.setdefault(identifier.lower(), bit)
+            family = license_family(identifier)
+            self._families[family] = self._families.get(family, 0) | bit
+
+        self._classifiers: Dict[str, int] = dict()
+        for position, group in enumerate(classifiers.classifiers_list + [["UNDETECTED"]]):
+            bit = 1 << position
+            for name in group:
+                self._classifiers.setdefault(name.lower(), bit)
+
+        self._license_masks = {verdict: self._compile_licenses(verdict, rules.get(verdict)) for verdict in VERDICTS}
+        self._classifier_masks = {
+            verdict: self._compile(verdict, "classifier", rules.get(verdict), self._classifiers) for verdict in VERDICTS
+        }
+        self._matched_licenses = self._license_masks[ALLOW] | self._license_masks[REVIEW] | self._license_masks[DENY]
+
+        self.evaluate = lru_cache(maxsize=cache_size)(self._evaluate)
+
+    @classmethod
+    def from_file(
+        cls, path: str, licenses: Licenses, classifiers: Classifiers, expressions: ExpressionParser
+    ) -> "LicensePolicy":
+        """Load policy from YAML or JSON file."""
+        try:
+            with open(path) as f:
+                rules = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError) as e:
+            raise UnableOpenFile(f"Can't open policy file {path}: {e}")
+
+        return cls(rules or {}, licenses, classifiers, expressions)
+
+    @staticmethod
+    def _rule_values(verdict: str, kind: str, rule: Any) -> List[str]:
+        """Get values of one kind of rule."""
+        if rule is None:
+            return list()
+        if not isinstance(rule, dict) or set(rule) - set(_RULE_KINDS):
+            raise InvalidPolicy(f"Rules of {verdict!r} must be a mapping with keys {', '.join(_RULE_KINDS)}")
+
+        values = rule.get(kind) or []
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise InvalidPolicy(f"Rule {verdict}.{kind} must be a list of strings")
+
+        return values
+
+    def _compile(self, verdict: str, kind: str, rule: Any, index: Dict[str, int]) -> int:
+        """Compile rule values of one kind to bitset."""
+        mask = 0
+        for value in self._rule_values(verdict, kind, rule):
+            bit = index.get(value.lower())
+            if bit is None:
+                _LOGGER.warning("Policy rule %s.%s has unknown value %r", verdict, kind, value)
+                continue
+            mask |= bit
+
+        return mask
+
+    def _compile_licenses(self, verdict: str, rule: Any) -> int:
+        """Compile SPDX identifier and family rules to bitset over SPDX licenses."""
+        return self._compile(verdict, "spdx", rule, self._licenses) | self._compile(
+            verdict, "family", rule, self._families
+        )
+
+    def _license_verdict(self, identifier: str) -> str:
+        """Get verdict of one SPDX identifier."""
+        bit = self._licenses.get(identifier.lower(), 0)
+        if not bit & self._matched_licenses:
+            return self.default
+
+        for verdict in (DENY, REVIEW, ALLOW):
+            if bit & self._license_masks[verdict]:
+                return verdict
+
+        return self.default  # pragma: no cover
+
+    def _expression_verdict(self, expression: Expression) -> str:
+        """Get verdict of expression, any license of OR can be chosen, all licenses of AND apply."""
+        if not isinstance(expression, LicenseExpression):
+            return self._license_verdict(expression.identifier)
+
+        verdicts = [VERDICTS.index(self._expression_verdict(operand)) for operand in expression.operands]
+        return VERDICTS[min(verdicts) if expression.operator == "OR" else max(verdicts)]
+
+    def _classifier_verdict(self, classifier: Iterable[List[str]]) -> Optional[str]:
+        """Get verdict of classifiers, None if no rule matches them."""
+        mask = 0
+        for group in classifier:
+            mask |= self._classifiers.get(group[0].lower(), 0) if group else 0
+
+        for verdict in (DENY, REVIEW, ALLOW):
+            if mask & self._classifier_masks[verdict]:
+                return verdict
+
+        return None
+
+    def _evaluate(self, package_data: Dict[str, Any]) -> str:
+        """
+        Get verdict of package data, results are cached by the ``evaluate`` wrapper.
+
+        :param package_data: package data of package version from output
+        :return: allow, review or deny
+        """
+        expression = None
+        if package_data.get("license_expression"):
+            expression = self.expressions.parse(package_data["license_expression"])
+
+        if expression is not None:
+            verdict = self._expression_verdict(expression)
+        else:
+            package_license = package_data["license"] or {}
+            verdict = self._license_verdict(package_license.get("identifier_spdx") or "UNDETECTED")
+
+        classifier_verdict = self._classifier_verdict(package_data["classifier"] or [])
+        if classifier_verdict is not None and VERDICTS.index(classifier_verdict) > VERDICTS.index(verdict):
+            verdict = classifier_verdict
+
+        return verdict
+
+    def check(self, output: Dict[str, Dict[str, Any]]) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Check all packages of output.
+
+        :param output: output dictionary of solver
+        :return: package names and versions for review and deny verdicts
+        """
+        result: Dict[str, List[Tuple[str, str]]] = {REVIEW: list(), DENY: list()}
+        for name, versions in output.items():
+            for version, package_data in versions.items():
+                # only shared immutable records are hashable, e.g. records read from SQLite are not
+                if isinstance(package_data, FrozenDict):
+                    verdict = self.evaluate(package_data)
+                else:
+                    verdict = self._evaluate(package_data)
+
+                if verdict != ALLOW:
+                    result[verdict].append((name, version))
+
+        return result
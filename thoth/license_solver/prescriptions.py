@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Index of GitHub repositories of packages from a local checkout of thoth-station/prescriptions."""
+
+import os
+import re
+import json
+import yaml
+import logging
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+from .exceptions import UnableOpenFile
+
+_LOGGER = logging.getLogger(__name__)
+
+_PRESCRIPTION_FILE_NAME = "gh_link.yaml"
+_GITHUB_URL = "https://github.com/"
+
+# C loader is several times faster, it is used when PyYAML is built with libyaml
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def prescription_name(package_name: str) -> str:
+    """Get name of prescription directory of package."""
+    return re.sub("[^a-zA-z0-9]", "-", package_name)
+
+
+def get_prescription_link(prescription: Any) -> Optional[str]:
+    """
+    Get link to GitHub repository from parsed gh_link.yaml prescription.
+
+    :param prescription: parsed prescription
+    :return: link, None if prescription has no link
+    """
+    try:
+        return str(prescription["units"]["wraps"][0]["run"]["justification"][0]["link"])
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def _scan(directory: str) -> Tuple[List[str], float]:
+    """Find prescription files in directory, the newest modification time of files and directories is returned too."""
+    paths = list()
+    newest = os.stat(directory).st_mtime
+    for dir_path, dir_names, file_names in os.walk(directory):
+        # hidden directories, e.g. .git, don't contain prescriptions
+        dir_names[:] = [name for name in dir_names if not name.startswith(".")]
+        newest = max(newest, os.stat(dir_path).st_mtime)
+        if _PRESCRIPTION_FILE_NAME in file_names:
+            path = os.path.join(dir_path, _PRESCRIPTION_FILE_NAME)
+            paths.append(path)
+            newest = max(newest, os.stat(path).st_mtime)
+
+    return sorted(paths), newest
+
+
+def build_prescriptions_index(paths: List[str]) -> Dict[str, str]:
+    """
+    Parse prescriptions and create index of package name to GitHub repository.
+
+    :param paths: paths to gh_link.yaml prescriptions, directory of each one is named after the package
+    :return: lowercase prescription name to repository link, links to GitHub are stored as "owner/repo"
+    """
+    index = dict()
+    for path in paths:
+        try:
+            with open(path) as f:
+                link = get_prescription_link(yaml.load(f, Loader=_YAML_LOADER))
+        except (OSError, yaml.YAMLError) as e:
+            _LOGGER.warning("Failed to open prescription %s: %s", path, e)
+            continue
+
+        if link is None:
+            _LOGGER.debug("Prescription %s has no link [SKIPPED]", path)
+            continue
+
+        name = os.path.basename(os.path.dirname(path)).lower()
+        index[name] = link[len(_GITHUB_URL) :] if link.startswith(_GITHUB_URL) else link
+
+    return index
+
+
+def save_prescriptions_index(index: Dict[str, str], path: str) -> None:
+    """Write index atomically as compact JSON."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        os.unlink(tmp_path)
+        raise UnableOpenFile(f"Can't write prescriptions index {path}: {e}")
+
+
+def load_prescriptions(directory: Optional[str] = None, index_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Load index of prescriptions, the index is built from directory only if index file is missing or outdated.
+
+    :param directory: local checkout of thoth-station/prescriptions or its prescriptions/ directory
+    :param index_path: file where the index is persisted
+    :return: lowercase prescription name to repository link
+    """
+    index_mtime = None
+    if index_path is not None and os.path.isfile(index_path):
+        index_mtime = os.stat(index_path).st_mtime
+
+    paths: List[str] = list()
+    if directory is not None:
+        if not os.path.isdir(directory):
+            raise UnableOpenFile(f"Prescriptions directory {directory} doesn't exist")
+
+        paths, newest = _scan(directory)
+        if index_mtime is not None and newest > index_mtime:
+            _LOGGER.debug("Prescriptions in %s changed after index %s was built", directory, index_path)
+            index_mtime = None
+
+    if index_mtime is not None:
+        try:
+            with open(index_path) as f:  # type: ignore[arg-type]
+                index: Dict[str, str] = json.load(f)
+            _LOGGER.debug("Loaded index of %d prescriptions from %s", len(index), index_path)
+            return index
+        except (OSError, ValueError) as e:
+            if directory is None:
+                raise UnableOpenFile(f"Can't open prescriptions index {index_path}: {e}")
+            _LOGGER.warning("Prescriptions index %s is broken, it is rebuilt: %s", index_path, e)
+
+    if directory is None:
+        raise UnableOpenFile(f"Prescriptions index {index_path} doesn't exist and no prescriptions directory is given")
+
+    index = build_prescriptions_index(paths)
+    _LOGGER.debug("Built index of %d prescriptions from %s", len(index), directory)
+    if index_path is not None:
+        save_prescriptions_index(index, index_path)
+
+    return index
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Download package metadata from PyPI JSON API, failing requests don't stall the whole run."""
+
+import sys
+import json
+import time
+import logging
+import threading
+import requests
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+from .lockfile import normalize_package_name
+
+_LOGGER = logging.getLogger(__name__)
+
+# responses which signal that PyPI itself is failing, not the requested package
+_FAILURE_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+
+class CircuitBreaker:
+    """Stop sending requests to a failing service, one probe request is let through after reset timeout."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Init closed circuit breaker.
+
+        :param failure_threshold: number of consecutive failures which opens the circuit
+        :param reset_timeout: seconds after which a probe request is sent to an open circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Check if requests are short-circuited."""
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Check if request can be sent, only one probe request is allowed when reset timeout of open circuit passed."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Close circuit after successful request."""
+        with self._lock:
+            if self._opened_at is not None:
+                _LOGGER.info("PyPI responds again, requests are sent")
+
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count failed request, circuit is opened after too many consecutive failures or a failed probe."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    _LOGGER.warning(
+                        "PyPI failed %d times in a row, requests are skipped for %.0f s",
+                        self._failures,
+                        self.reset_timeout,
+                    )
+
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class PyPIClient:
+    """Get package metadata from PyPI with request timeouts, negative cache of missing packages and circuit breaker."""
+
+    def __init__(
+        self,
+        url: str = "https://pypi.org/pypi",
+        timeout: Union[float, Tuple[float, float]] = (3.05, 10.0),
+        negative_ttl: float = 3600.0,
+        negative_cache_size: int = 65536,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        """
+        Init client.
+
+        :param url: URL of PyPI JSON API
+        :param timeout: connect and read timeout of each request in seconds
+        :param negative_ttl: seconds for which missing package versions are not requested again
+        :param negative_cache_size: maximal number of missing package versions kept in cache
+        :param circuit_breaker: circuit breaker of requests, a default one is created if not given
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self.negative_cache_size = negative_cache_size
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._not_found: "OrderedDict[Tuple[str, Optional[str]], float]" = OrderedDict()
+        self._not_found_lock = threading.Lock()
+
+    def _is_not_found(self, key: Tuple[str, Optional[str]]) -> bool:
+        """Check if package version was recently not found."""
+        with self._not_found_lock:
+            expires = self._not_found.get(key)
+            if expires is None:
+                return False
+
+            if expires <= time.monotonic():
+                del self._not_found[key]
+                return False
+
+            return True
+
+    def _add_not_found(self, key: Tuple[str, Optional[str]]) -> None:
+        """Remember package version which was not found."""
+        with self._not_found_lock:
+            self._not_found[key] = time.monotonic() + self.negative_ttl
+            self._not_found.move_to_end(key)
+            if len(self._not_found) > self.negative_cache_size:
+                self._not_found.popitem(last=False)
+
+    def get(
+        self, package_name: str, package_version: Optional[str], session: Optional[requests.Session] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Download package metadata from PyPI.
+
+        :param package_name: package name to download
+        :param package_version: package version to download, None for latest release
+        :param session: HTTP session to use, new connection is opened if not given
+        :return: PyPI JSON response, None if package was not found or PyPI is failing
+        """
+        key = (normalize_package_name(package_name), package_version or None)
+        if self._is_not_found(key):
+            _LOGGER.debug("Package %r with version %r is cached as not found on PyPI", package_name, package_version)
+            return None
+
+        if not self.circuit_breaker.allow():
+            _LOGGER.debug("Package %r with version %r skipped, PyPI is failing", package_name, package_version)
+            return None
+
+        if package_version:
+            url = f"{self.url}/{package_name}/{package_version}/json"
+        else:
+            # get latest licenses
+            url = f"{self.url}/{package_name}/json"
+
+        http = session or requests
+        try:
+            response = http.get(url, headers={"User-Agent": "license-solver"}, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.circuit_breaker.record_failure()
+            _LOGGER.warning(
+                "Package %r with version %r can't be downloaded from PyPI: %s", package_name, package_version, e
+            )
+            return None
+
+        if response.status_code in _FAILURE_STATUS_CODES:
+            self.circuit_breaker.record_failure()
+            _LOGGER.warning(
+                "Package %r with version %r can't be downloaded from PyPI, status code %d",
+                package_name,
+                package_version,
+                response.status_code,
+            )
+            return None
+
+        self.circuit_breaker.record_success()
+        if response.status_code != 200:
+            if response.status_code == 404:
+                self._add_not_found(key)
+
+            if package_version:
+                _LOGGER.warning("Package %r with version %r was not found on PyPI.", package_name, package_version)
+                print(f"Package {package_name} with {package_version} was not found on PyPI.", file=sys.stderr)
+            else:
+                _LOGGER.warning("Package %r was not found on PyPI.", package_name)
+                print(f"Package {package_name} was not found on PyPI.", file=sys.stderr)
+            return None
+
+        # convert to dictionary
+        return json.loads(response.text)  # type: ignore[no-any-return]
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Interned immutable records shared by all packages with the same license and classifier."""
+
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Iterable, NoReturn, Optional, Sequence, Tuple
+
+# only a few hundred distinct records exist in practice, the bound protects from unlimited free-form license names
+_CACHE_SIZE = 8192
+
+
+def _immutable(*args: Any, **kwargs: Any) -> NoReturn:
+    """Raise error on any attempt to modify a shared record."""
+    raise TypeError("Interned records are immutable, create a copy to modify them")
+
+
+class FrozenDict(Dict[str, Any]):
+    """Immutable and hashable dictionary, it is serialized to JSON as a plain dictionary."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable  # type: ignore[assignment]
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        """Compute hash from items."""
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Support pickle and copy."""
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(List[Any]):
+    """Immutable and hashable list, it is serialized to JSON as a plain list."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = remove = pop = clear = sort = reverse = _immutable  # type: ignore[assignment]
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        """Compute hash from items."""
+        return hash(tuple(self))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Support pickle and copy."""
+        return FrozenList, (list(self),)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def intern_license(full_name: str, identifier_spdx: str, identifier: str) -> FrozenDict:
+    """Get shared license record."""
+    return FrozenDict(
+        full_name=sys.intern(full_name), identifier_spdx=sys.intern(identifier_spdx), identifier=sys.intern(identifier)
+    )
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _intern_classifier(classifier: Tuple[Tuple[str, ...], ...]) -> FrozenList:
+    """Get shared classifier record from hashable representation."""
+    return FrozenList(FrozenList(sys.intern(x) for x in group) for group in classifier)
+
+
+def intern_classifier(classifier: Iterable[Sequence[str]]) -> FrozenList:
+    """Get shared classifier record, a list of classifier groups."""
+    return _intern_classifier(tuple(tuple(group) for group in classifier))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def intern_package_data(
+    package_license: FrozenDict,
+    license_version: str,
+    classifier: FrozenList,
+    warning: bool,
+    license_expression: Optional[str] = None,
+) -> FrozenDict:
+    """Get shared package data record stored in output for each package version."""
+    package_data = dict(
+        license=package_license,
+        license_version=sys.intern(license_version),
+        classifier=classifier,
+        warning=warning,
+    )
+
+    # expression is present only for compound SPDX expressions
+    if license_expression is not None:
+        package_data["license_expression"] = license_expression
+
+    return FrozenDict(package_data)
+
+
+def freeze_package_data(package_data: Dict[str, Any]) -> FrozenDict:
+    """Get shared package data record from a plain dictionary, e.g. after it was updated."""
+    package_license = package_data["license"]
+    if isinstance(package_license, dict) and not isinstance(package_license, FrozenDict):
+        package_license = FrozenDict(package_license)
+
+    classifier = package_data["classifier"]
+    if isinstance(classifier, list) and not isinstance(classifier, FrozenList):
+        classifier = intern_classifier(classifier)
+
+    return intern_package_data(
+        package_license,
+        str(package_data["license_version"]),
+        classifier,
+        package_data["warning"],
+        package_data.get("license_expression"),
+    )
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""HTTP server answering license detection requests with a preloaded solver."""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Optional, Tuple
+from .solver import Solver
+
+_LOGGER = logging.getLogger(__name__)
+
+# request bodies are JSON documents with metadata, bigger bodies are refused
+_MAX_BODY_SIZE = 16 * 1024 * 1024
+
+
+class LatencyMetrics:
+    """Count requests and keep latencies of recent requests of each endpoint."""
+
+    def __init__(self, window: int = 10000) -> None:
+        """
+        Init counters.
+
+        :param window: number of recent requests of each endpoint used for percentiles
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._requests: Dict[str, int] = dict()
+        self._errors: Dict[str, int] = dict()
+        self._cache_hits: Dict[str, int] = dict()
+        self._latencies: Dict[str, Deque[float]] = dict()
+
+    def observe(self, endpoint: str, seconds: float, error: bool = False, cache_hit: bool = False) -> None:
+        """Record one request of endpoint."""
+        with self._lock:
+            self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+            self._errors[endpoint] = self._errors.get(endpoint, 0) + int(error)
+            self._cache_hits[endpoint] = self._cache_hits.get(endpoint, 0) + int(cache_hit)
+            self._latencies.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get counters and latency percentiles in milliseconds."""
+        result = dict()
+        with self._lock:
+            for endpoint, requests in sorted(self._requests.items()):
+                latencies = sorted(self._latencies[endpoint])
+                result[endpoint] = {
+                    "requests": requests,
+                    "errors": self._errors[endpoint],
+                    "cache_hits": self._cache_hits[endpoint],
+                    "p50_ms": 1000 * latencies[int(0.5 * (len(latencies) - 1))],
+                    "p90_ms": 1000 * latencies[int(0.9 * (len(latencies) - 1))],
+                    "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+                    "max_ms": 1000 * latencies[-1],
+                }
+
+        return result
+
+
+class SolverServer(ThreadingHTTPServer):
+    """
+    Threading HTTP server holding one warm solver.
+
+    Endpoints:
+        * ``POST /detect`` - metadata dictionary in, output of the package out
+        * ``POST /detect/batch`` - list of metadata dictionaries in, list of outputs out
+        * ``GET /metrics`` - number of requests and latency percentiles of each endpoint
+        * ``GET /health`` - liveness check
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], solver: Optional[Solver] = None, cache_size: int = 4096) -> None:
+        """
+        Load solver and bind the server.
+
+        :param address: host and port, port 0 picks a free port
+        :param solver: solver used for detection, a new one is created if not given
+        :param cache_size: number of responses kept in LRU cache, requests are keyed by hash of their body
+        """
+        self.solver = solver if solver is not None else Solver()
+        self.metrics = LatencyMetrics()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        super().__init__(address, _RequestHandler)
+
+    def get_cached(self, key: bytes) -> Optional[bytes]:
+        """Get cached response."""
+        with self._cache_lock:
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+            return response
+
+    def set_cached(self, key: bytes, response: bytes) -> None:
+        """Cache response."""
+        with self._cache_lock:
+            self._cache[key] = response
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handle requests of SolverServer, connections are kept alive."""
+
+    server: SolverServer
+    protocol_version = "HTTP/1.1"
+    # small responses are written right away instead of waiting for delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer health and metrics requests."""
+        start = time.perf_counter()
+        if self.path == "/health":
+            self._send(200, json.dumps({"status": "ok"}).encode())
+        elif self.path == "/metrics":
+            self._send(200, json.dumps(self.server.metrics.as_dict()).encode())
+        else:
+            self._send_error(404, f"Unknown endpoint {self.path}")
+            return
+
+        self.server.metrics.observe(self.path, time.perf_counter() - start)
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Answer detection requests."""
+        start = time.perf_counter()
+        if self.path not in ("/detect", "/detect/batch"):
+            self._read_body()
+            self._send_error(404, f"Unknown endpoint {self.path}")
+            return
+
+        body = self._read_body()
+        if body is None:
+            self._send_error(413, "Request body is missing or too big")
+            self.server.metrics.observe(self.path, time.perf_counter() - start, error=True)
+            return
+
+        key = hashlib.blake2b(self.path.encode() + b"\0" + body, digest_size=16).digest()
+        response = self.server.get_cached(key)
+        if response is not None:
+            self._send(200, response)
+            self.server.metrics.observe(self.path, time.perf_counter() - start, cache_hit=True)
+            return
+
+        try:
+            request = json.loads(body)
+            if self.path == "/detect":
+                result: Any = self._detect(request)
+            elif isinstance(request, list):
+                result = [self._detect(metadata) for metadata in request]
+            else:
+                raise ValueError("Batch request must be a list of metadata")
+        except ValueError as e:
+            self._send_error(400, str(e))
+            self.server.metrics.observe(self.path, time.perf_counter() - start, error=True)
+            return
+        except Exception as e:
+            # one bad request must never drop the connection without response
+            _LOGGER.exception("Failed to answer request of %s", self.path)
+            self._send_error(500, f"Detection failed: {e}")
+            self.server.metrics.observe(self.path, time.perf_counter() - start, error=True)
+            return
+
+        response = json.dumps(result).encode()
+        self.server.set_cached(key, response)
+        self._send(200, response)
+        self.server.metrics.observe(self.path, time.perf_counter() - start)
+
+    def _detect(self, metadata: Any) -> Dict[str, Any]:
+        """Detect license of one metadata dictionary."""
+        if not isinstance(metadata, dict):
+            raise ValueError("Metadata must be a JSON object")
+
+        return self.server.solver.detect(metadata)
+
+    def _read_body(self) -> Optional[bytes]:
+        """Read request body, None if it is missing or too big."""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > _MAX_BODY_SIZE:
+            # the rest of request can't be skipped reliably
+            self.close_connection = True
+            return None
+
+        return self.rfile.read(length)
+
+    def _send(self, status: int, response: bytes) -> None:
+        """Send JSON response."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def _send_error(self, status: int, message: str) -> None:
+        """Send JSON error response."""
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests on debug level instead of STDERR."""
+        _LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8080, solver: Optional[Solver] = None) -> None:
+    """
+    Run HTTP server until interrupted.
+
+    :param host: address to listen on
+    :param port: port to listen on
+    :param solver: solver used for detection, a new one is created if not given
+    :return: None
+    """
+    server = SolverServer((host, port), solver)
+    _LOGGER.info("Serving license detection on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        _LOGGER.info("Server interrupted")
+    finally:
+        server.server_close()
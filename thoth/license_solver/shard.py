@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Partition inputs between more nodes by stable hash of their keys."""
+
+import os
+import attr
+import hashlib
+from .lockfile import normalize_package_name
+
+# metadata files of installed distributions have the same name, the distribution directory identifies them
+_METADATA_FILE_NAMES = ("METADATA", "PKG-INFO")
+
+
+def path_key(path: str) -> str:
+    """
+    Get shard key of input path, it doesn't depend on the directory where inputs are mounted.
+
+    :param path: path to input file, archive or metadata file of installed distribution
+    :return: file name, name of distribution directory for metadata files
+    """
+    directory, name = os.path.split(os.path.normpath(path))
+    if name in _METADATA_FILE_NAMES:
+        return os.path.basename(directory)
+
+    return name
+
+
+def package_key(package_name: str) -> str:
+    """Get shard key of package name, all versions of a package are in the same shard."""
+    return normalize_package_name(package_name)
+
+
+@attr.s(slots=True, frozen=True)
+class Shard:
+    """Part of inputs processed by one node, e.g. by one pod of an indexed Kubernetes job."""
+
+    index = attr.ib(type=int)
+    count = attr.ib(type=int)
+
+    @count.validator
+    def _check_count(self, _: "attr.Attribute[int]", value: int) -> None:
+        """Check shard index is in range of shards."""
+        if value < 1 or not 0 <= self.index < value:
+            raise ValueError(f"Shard index must be in range 0-{value - 1}, got {self.index}/{value}")
+
+    @classmethod
+    def parse(cls, value: str) -> "Shard":
+        """
+        Parse shard in form INDEX/COUNT, index starts at 0.
+
+        :param value: e.g. "0/4" for the first of four shards
+        :return: parsed shard
+        """
+        index, separator, count = value.partition("/")
+        if not separator or not index.strip().isdigit() or not count.strip().isdigit():
+            raise ValueError(f"Shard must be in form INDEX/COUNT, got {value!r}")
+
+        return cls(int(index), int(count))
+
+    def contains(self, key: str) -> bool:
+        """
+        Check if input belongs to this shard.
+
+        Keys are hashed with BLAKE2, so the partition is the same on all nodes and in all runs (unlike hash() of
+        strings) and shards get balanced subsets of inputs.
+
+        :param key: key of input, see path_key and package_key
+        :return: True if input is processed by this shard
+        """
+        if self.count == 1:
+            return True
+
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.count == self.index
+
+    def __str__(self) -> str:
+        """Render shard in form INDEX/COUNT."""
+        return f"{self.index}/{self.count}"
@@ -18,34 +18,83 @@
 """Main class which work with detecting and creating output."""
 
 import os
-import sys
 import json
+import time
 import logging
 import requests
+import threading
 
-from typing import List, Tuple, Dict, Any, Optional, Union
+from typing import List, Tuple, Dict, Any, Optional, Union, Iterable, Callable, Sequence
 from os import DirEntry
+from concurrent.futures import ThreadPoolExecutor
 
 from .classifiers import Classifiers
 from .licenses import Licenses
 from .package import Package, _detect_version_and_delete
 from .json_solver import JsonSolver
+from .expression import ExpressionParser
+from .fuzzy import FuzzyMatcher
+from .license_text import LicenseTextClassifier
+from .license_matrix import LicenseTextMatrix
+from .mentions import LicenseMentionScanner
+from .metadata import read_archive_metadata, read_metadata_file
+from .metadata import get_installed_metadata_paths, get_site_packages_paths
 from .comparator import _delete_brackets, _delete_brackets_and_content
 from .output_creator import OutputCreator
+from .output_sqlite import SqliteOutput
+from .output_summary import SummaryOutput
+from .pypi import PyPIClient
+from .dependencies import get_dependencies, get_pinned_version, get_release_versions, select_version
+from .shard import Shard, path_key, package_key
+from .dedup import ContentDeduplicator
+from .lockfile import normalize_package_name
 from .exceptions import UnableOpenFileData
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class Solver:
-    """Class pass all detected files and try to detect all necessary data."""
-
-    def __init__(self, github: bool = False) -> None:
-        """Init class variables and open JSON file of license aliases."""
+    """
+    Class pass all detected files and try to detect all necessary data.
+
+    One solver can be shared by more threads, lookup tables are read-only after init and results are accumulated
+    per thread by OutputCreator. Contents seen by the deduplicator persist for the lifetime of the solver, so a file
+    with the same content as a file of a previously solved directory is skipped too.
+    """
+
+    def __init__(
+        self,
+        github: bool = False,
+        output_sqlite: Optional[str] = None,
+        summary: Optional[int] = None,
+        shard: Optional[Shard] = None,
+        prescriptions: Optional[Dict[str, str]] = None,
+        deduplicate: bool = True,
+    ) -> None:
+        """
+        Init class variables and open JSON file of license aliases.
+
+        :param github: check license with github repository
+        :param output_sqlite: path to SQLite database where results are written
+        :param summary: number of samples per license in summary mode, None to create full output
+        :param shard: solve only inputs of this shard, None to solve all inputs
+        :param prescriptions: index of GitHub repositories from local prescriptions, None to download prescriptions
+        :param deduplicate: solve files of directories with identical content only once during the solver lifetime
+        """
+        self.shard = shard
+        self.deduplicator: Optional[ContentDeduplicator] = ContentDeduplicator() if deduplicate else None
         self.license_dictionary: Dict[str, Any] = dict()
         self.classifiers: Classifiers = Classifiers()
         self.licenses: Licenses = Licenses()
-        self.output: OutputCreator = OutputCreator(github)
+        self.expressions: ExpressionParser = ExpressionParser(self.licenses)
+        self.output: OutputCreator = OutputCreator(
+            github,
+            SqliteOutput(output_sqlite) if output_sqlite is not None else None,
+            SummaryOutput(summary) if summary is not None else None,
+            prescriptions,
+        )
+        self._sessions = threading.local()
+        self.pypi: PyPIClient = PyPIClient()
 
         file_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data", "license_dictionary.json")
         try:
@@ -55,6 +104,13 @@ class Solver:
         except Exception:
             raise UnableOpenFileData
 
+        self.fuzzy: FuzzyMatcher = FuzzyMatcher(self.licenses, self.license_dictionary)
+        self.mentions: LicenseMentionScanner = LicenseMentionScanner(self.licenses, self.license_dictionary)
+        self.license_texts: LicenseTextClassifier = LicenseTextClassifier()
+        # built on the first batch, it needs optional NumPy dependency
+        self._license_matrix: Optional[LicenseTextMatrix] = None
+        self._license_matrix_lock = threading.Lock()
+
     def solve_from_file(self, input_file: Union[Dict[str, Any], str]) -> None:
         """
         Solver from file.
@@ -63,6 +119,9 @@ class Solver:
         :return: None
         """
         if isinstance(input_file, str):
+            if not self.in_shard(path_key(input_file)):
+                return
+
             _LOGGER.debug("Parsing file: %s", input_file)
             if not self._check_if_json(input_file):
                 _LOGGER.warning("Input file is not valid. SKIPPED")
@@ -91,25 +150,161 @@ class Solver:
         except Exception:
             return
 
+        self._solve(json_solver)
+
+    def solve_from_archive(self, archive_path: str) -> None:
+        """
+        Solve from wheel or sdist archive, only the metadata member is read.
+
+        :param archive_path: path to archive
+        :return: None
+        """
+        if not self.in_shard(path_key(archive_path)):
+            return
+
+        self._solve_metadata(read_archive_metadata(archive_path), archive_path)
+
+    def solve_from_archives(self, archive_paths: Iterable[str], workers: Optional[int] = None) -> None:
+        """
+        Solve from wheel or sdist archives, metadata are read in parallel.
+
+        Results are added to output in the order of archive_paths.
+
+        :param archive_paths: paths to archives
+        :param workers: number of threads reading archives, None for default of ThreadPoolExecutor
+        :return: None
+        """
+        self._solve_concurrently(read_archive_metadata, archive_paths, workers)
+
+    def solve_from_site_packages(self, site_packages: Optional[str] = None, workers: Optional[int] = None) -> None:
+        """
+        Solve distributions installed in site-packages.
+
+        :param site_packages: site-packages directory, None for site-packages of the current interpreter
+        :param workers: number of threads reading metadata, None for default of ThreadPoolExecutor
+        :return: None
+        """
+        directories = [site_packages] if site_packages is not None else get_site_packages_paths()
+
+        metadata_paths: List[str] = list()
+        for directory in directories:
+            _LOGGER.debug("Start parsing site-packages %s.", directory)
+            metadata_paths.extend(get_installed_metadata_paths(directory))
+
+        self._solve_concurrently(read_metadata_file, metadata_paths, workers)
+
+    def _solve_concurrently(
+        self,
+        loader: Callable[[str], Optional[Dict[str, Any]]],
+        paths: Iterable[str],
+        workers: Optional[int] = None,
+    ) -> None:
+        """
+        Load metadata in parallel and solve them.
+
+        Results are added to output in the order of paths.
+
+        :param loader: function which loads metadata dictionary from path
+        :param paths: paths to load
+        :param workers: number of threads, None for default of ThreadPoolExecutor
+        :return: None
+        """
+        paths = [path for path in paths if self.in_shard(path_key(path))]
+        _LOGGER.debug("Start loading %d inputs.", len(paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for path, metadata in zip(paths, executor.map(loader, paths)):
+                self._solve_metadata(metadata, path)
+
+    def _solve_metadata(self, metadata: Optional[Dict[str, Any]], path: str) -> Optional[Package]:
+        """
+        Solve already parsed metadata.
+
+        :param metadata: metadata dictionary, None is skipped
+        :param path: origin of metadata
+        :return: solved package, None if metadata were skipped
+        """
+        if metadata is None:
+            return None
+
+        return self._solve(JsonSolver(metadata, path))  # type: ignore[call-arg]
+
+    def _solve(self, json_solver: JsonSolver) -> Package:
+        """Detect license and classifier of loaded metadata and add them to output."""
         package = Package()
 
         self._get_classifier_and_license(json_solver, package)
         self.output.add_package(package)
+        return package
+
+    def detect(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Detect license of metadata without adding the package to output.
+
+        Only immutable and cached data of solver are used, so it can be called from more threads at once. With github
+        check enabled, the repository license is queried synchronously before the result is returned.
+
+        :param metadata: metadata dictionary, PyPI JSON response with "info" is accepted as well
+        :return: output of the package, empty if package has no name or version
+        """
+        json_solver = JsonSolver(metadata, "dictionary_input")  # type: ignore[call-arg]
+        json_solver.get_info_attribute()
+
+        package = Package()
+        self._get_classifier_and_license(json_solver, package)
+        package_data = self.output.get_package_data(package)
+        if package_data is None:
+            return dict()
+
+        return {package.name: {package.version: package_data}}
+
+    def fetch_pypi_metadata(self, package_name: str, package_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Download package metadata from PyPI without adding the package to output.
+
+        Connections are reused per thread, so it can be called from more threads at once.
+
+        :param package_name: package name to download
+        :param package_version: package version to download, None for latest release
+        :return: PyPI JSON response, None if package was not found or PyPI is failing
+        """
+        return self._get_from_pypi(package_name, package_version, session=self._get_session())
 
     def solve_from_directory(self, input_directory: str) -> None:
         """
         Solve from directory.
 
+        Files with the same content as an already solved file are skipped, output is keyed by package name and version,
+        so the result of the first file covers all its copies.
+
         :param input_directory: directory path
         :return: None
         """
         _LOGGER.debug("Start parsing directory %s.", input_directory)
         file_path: DirEntry  # type: ignore[type-arg]
         for file_path in os.scandir(input_directory):
-            if file_path.is_file():
-                self.solve_from_file(file_path.path)
-            else:
+            if not file_path.is_file():
                 _LOGGER.debug("Subdirectory SKIPPED %s.", file_path)
+                continue
+
+            if not self.in_shard(path_key(file_path.path)):
+                continue
+
+            # only files which are solved are deduplicated, so duplicates count skipped solving work
+            if not self._check_if_json(file_path.path):
+                continue
+
+            if self.deduplicator is not None:
+                try:
+                    size = file_path.stat().st_size
+                except OSError as e:
+                    # file was removed or became unreadable during scan
+                    _LOGGER.warning("File %s can't be read: %s [SKIPPED]", file_path.path, e)
+                    continue
+
+                if self.deduplicator.is_duplicate(file_path.path, size):
+                    continue
+
+            self.solve_from_file(file_path.path)
 
     def solve_from_pypi(self, package_name: str, package_version: Optional[str]) -> None:
         """
@@ -119,29 +314,188 @@ class Solver:
         :param package_version: package version to solver
         :return: None
         """
-        if package_version:
-            url = f"https://pypi.org/pypi/{package_name}/{package_version}/json"
-            response = requests.get(url, headers={"User-Agent": "license-solver"})
-
-            if response.status_code != 200:
-                _LOGGER.warning("Package %r with version %r was not found on PyPI.", package_name, package_version)
-                print(f"Package {package_name} with {package_version} was not found on PyPI.", file=sys.stderr)
-                return
-        else:
-            # get latest licenses
-            url = f"https://pypi.org/pypi/{package_name}/json"
-            response = requests.get(url, headers={"User-Agent": "license-solver"})
+        if not self.in_shard(package_key(package_name)):
+            return
 
-            if response.status_code != 200:
-                _LOGGER.warning("Package %r was not found on PyPI.", package_name)
-                print(f"Package {package_name} was not found on PyPI.", file=sys.stderr)
-                return
+        res = self._get_from_pypi(package_name, package_version)
+        if res is None:
+            return
 
-        # convert to dictionary
-        res = json.loads(response.text)
         # solver like file
-        self.solve_from_file(res)
-        self.solve_from_file(res.get("info"))
+        self._solve_metadata(res.get("info"), "dictionary_input")
+
+    def solve_from_pins(
+        self, pins: Iterable[Tuple[str, Optional[str]]], workers: Optional[int] = None
+    ) -> Dict[Tuple[str, Optional[str]], float]:
+        """
+        Solve pinned packages from PyPI, metadata are downloaded concurrently.
+
+        Packages are sorted in output, so it does not depend on which download finished first.
+
+        :param pins: pairs of package name and version (None for latest release)
+        :param workers: number of threads downloading metadata, None for default of ThreadPoolExecutor
+        :return: download latency in seconds for each pin
+        """
+        pins = [pin for pin in pins if self.in_shard(package_key(pin[0]))]
+        latency: Dict[Tuple[str, Optional[str]], float] = dict()
+
+        def _fetch(pin: Tuple[str, Optional[str]]) -> Tuple[Optional[Dict[str, Any]], float]:
+            start = time.monotonic()
+            res = self._get_from_pypi(*pin, session=self._get_session())
+            return res, time.monotonic() - start
+
+        _LOGGER.debug("Start downloading %d pins from PyPI.", len(pins))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for pin, (res, duration) in zip(pins, executor.map(_fetch, pins)):
+                latency[pin] = duration
+                _LOGGER.info("Package %r with version %r downloaded in %.3f s", pin[0], pin[1], duration)
+                if res is not None:
+                    self._solve_metadata(res.get("info"), "dictionary_input")
+
+        return latency
+
+    def solve_dependencies(
+        self,
+        packages: Iterable[Tuple[str, Optional[str]]],
+        workers: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Solve packages from PyPI with all their transitive dependencies.
+
+        Dependency graph is walked breadth-first from ``requires_dist`` of PyPI metadata, packages of each level are
+        downloaded concurrently. Each requirement is resolved and each package version is downloaded and solved only
+        once, even if it is required by more packages or the graph has cycles. Requirements are resolved to the newest
+        release allowed by their version specifier.
+
+        :param packages: pairs of root package name and version (None for latest release)
+        :param workers: number of threads downloading metadata, None for default of ThreadPoolExecutor
+        :param max_depth: maximal depth of walked dependencies, None for the whole graph
+        :return: dependency tree, SPDX license and resolved versions of direct dependencies of each package version
+        """
+        frontier = list(
+            dict.fromkeys(
+                (normalize_package_name(name), f"=={version}" if version else None) for name, version in packages
+            )
+        )
+        # requirement (name and version specifier) to resolved package name and version, None until downloaded
+        # or if not found
+        resolved: Dict[Tuple[str, Optional[str]], Optional[Tuple[str, str]]] = dict.fromkeys(frontier)
+        # normalized name and version of each solved package version to its node in tree
+        nodes: Dict[Tuple[str, str], Tuple[str, str]] = dict()
+        solved: Dict[Tuple[str, str], Tuple[Optional[str], List[Tuple[str, Optional[str]]]]] = dict()
+        depth = 0
+
+        responses: Dict[Tuple[str, Optional[str]], Optional[Dict[str, Any]]] = dict()
+        responses_lock = threading.Lock()
+
+        def _get(name: str, version: Optional[str]) -> Optional[Dict[str, Any]]:
+            with responses_lock:
+                if (name, version) in responses:
+                    return responses[(name, version)]
+
+            res = self._get_from_pypi(name, version, session=self._get_session())
+            with responses_lock:
+                responses[(name, version)] = res
+            return res
+
+        def _fetch(requirement: Tuple[str, Optional[str]]) -> Optional[Dict[str, Any]]:
+            name, specifier = requirement
+            pinned = get_pinned_version(specifier)
+            if pinned is not None:
+                res = _get(name, pinned)
+                return res.get("info") if res is not None else None
+
+            res = _get(name, None)
+            if res is None or not specifier:
+                return res.get("info") if res is not None else None
+
+            version = select_version(get_release_versions(res), specifier)
+            if version is None:
+                _LOGGER.warning("No release of package %r satisfies %r [SKIPPED]", name, specifier)
+                return None
+
+            if version != (res.get("info") or {}).get("version"):
+                res = _get(name, version)
+            return res.get("info") if res is not None else None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while frontier:
+                _LOGGER.debug("Start downloading %d dependencies in depth %d from PyPI.", len(frontier), depth)
+                next_frontier = list()
+                for requirement, info in zip(frontier, executor.map(_fetch, frontier)):
+                    if not info or not info.get("name") or not info.get("version"):
+                        continue
+
+                    key = (normalize_package_name(info["name"]), info["version"])
+                    if key in nodes:
+                        resolved[requirement] = nodes[key]
+                        continue
+
+                    node = (info["name"], info["version"])
+                    package = None
+                    if self.in_shard(package_key(info["name"])):
+                        package = self._solve_metadata(info, "dictionary_input")
+                    if package is not None and package.name and package.version:
+                        # tree uses the same names and versions as output
+                        node = (package.name, package.version)
+
+                    resolved[requirement] = nodes[key] = node
+                    dependencies = get_dependencies(info)
+                    license_identifier = package.license.get("identifier_spdx") if package is not None else None
+                    solved[node] = (license_identifier, dependencies)
+
+                    if max_depth is not None and depth >= max_depth:
+                        continue
+
+                    for dependency in dependencies:
+                        if dependency not in resolved:
+                            resolved[dependency] = None
+                            next_frontier.append(dependency)
+
+                frontier = next_frontier
+                depth += 1
+
+        tree: Dict[str, Dict[str, Dict[str, Any]]] = dict()
+        for (name, version), (license_identifier, dependencies) in solved.items():
+            dependency_nodes = [resolved.get(dependency) for dependency in dependencies]
+            tree.setdefault(name, dict())[version] = {
+                "license": license_identifier,
+                "dependencies": dict(node for node in dependency_nodes if node is not None),
+            }
+
+        return tree
+
+    def in_shard(self, key: str) -> bool:
+        """Check if input with key belongs to shard of this solver."""
+        if self.shard is None or self.shard.contains(key):
+            return True
+
+        _LOGGER.debug("Input %r belongs to another shard than %s [SKIPPED]", key, self.shard)
+        return False
+
+    def _get_session(self) -> requests.Session:
+        """Get HTTP session of the current thread, connections are reused across requests."""
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = "license-solver"
+            self._sessions.session = session
+
+        return session
+
+    def _get_from_pypi(
+        self, package_name: str, package_version: Optional[str], session: Optional[requests.Session] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Download package metadata from PyPI.
+
+        :param package_name: package name to download
+        :param package_version: package version to download, None for latest release
+        :param session: HTTP session to use, new connection is opened if not given
+        :return: PyPI JSON response, None if package was not found or PyPI is failing
+        """
+        return self.pypi.get(package_name, package_version, session)
 
     def _get_classifier_and_license(self, json_file: JsonSolver, package: Package) -> None:
         """
@@ -157,7 +511,26 @@ class Solver:
         package.set_version(json_file.get_package_version())
 
         license_name = json_file.get_license_name()
-        package.set_license(self._get_license_group(license_name))
+        expression = None
+        # License-Expression metadata field is preferred, license field can contain an expression as well
+        for candidate in (json_file.get_license_expression(), license_name):
+            if isinstance(candidate, str):
+                expression = self.expressions.parse(candidate)
+                if expression is not None:
+                    license_name = candidate
+                    break
+
+        license_text = json_file.get_license_text()
+        if expression is not None and expression.is_compound:
+            package.set_license_expression(expression)
+        elif isinstance(license_name, str) and len(license_name) > self.fuzzy.max_length:
+            # license field contains the whole license text or a long text mentioning the license
+            license_group = self._get_license_group_from_text(license_name)
+            package.set_license(license_group if license_group[1] else self._get_license_group(license_name))
+        elif isinstance(license_text, str) and (license_name is None or license_name.lower() == "unknown"):
+            package.set_license(self._get_license_group_from_text(license_text))
+        else:
+            package.set_license(self._get_license_group(license_name))
 
         classifier_name = json_file.get_classifier_name()
         package.set_classifier(self._get_classifier_group(classifier_name))
@@ -199,8 +572,52 @@ class Solver:
             elif license_name_no_version == license_name:
                 return list([license_name]), True
 
+        # more licenses, e.g. "MIT or Apache 2.0", are never reduced to one of them
+        if len(self.mentions.licenses(license_name)) > 1:
+            _LOGGER.debug("License %r mentions more licenses", license_name)
+            return list(["UNDETECTED"]), False
+
+        # try to find the most similar license name, e.g. with a typo
+        found = self.fuzzy.match(license_name)
+        if found is not None:
+            return found[0], True
+
+        # try to find license mentioned in a sentence, e.g. "Licensed under the MIT license"
+        mentioned = self.mentions.find(license_name)
+        if mentioned is not None:
+            return mentioned, True
+
         return list(["UNDETECTED"]), False
 
+    def _get_license_group_from_text(self, license_text: str) -> Tuple[List[str], bool]:
+        """
+        Search for a group of license identified from full license text.
+
+        :param license_text: license text, e.g. content of LICENSE file
+        :return: Tuple[List[str], bool]:
+        """
+        found = self.license_texts.identify(license_text)
+        if found is None:
+            return list(["UNDETECTED"]), False
+
+        return self._get_license_group(found[0])
+
+    def get_license_groups_from_texts(self, license_texts: Sequence[str]) -> List[Tuple[List[str], bool]]:
+        """
+        Search for groups of licenses identified from a batch of full license texts, it requires NumPy.
+
+        :param license_texts: license texts, e.g. contents of LICENSE files
+        :return: license group for each text, the same as accepted by Package.set_license
+        """
+        with self._license_matrix_lock:
+            if self._license_matrix is None:
+                self._license_matrix = LicenseTextMatrix()
+
+        return [
+            self._get_license_group(found[0]) if found is not None else (list(["UNDETECTED"]), False)
+            for found in self._license_matrix.identify(license_texts)
+        ]
+
     def _get_classifier_group(self, classifier_name: Optional[List[str]]) -> Optional[List[str]]:
         """
         Search for a group of entered classifier name.
@@ -230,11 +647,15 @@ class Solver:
         """Save solver result to JSON."""
         f = open(file_name, "w")
         if indent < 0:
-            f.write(json.dumps(self.output.file))
+            f.write(json.dumps(self.output.get_result()))
         else:
-            f.write(json.dumps(self.output.file, indent=indent))
+            f.write(json.dumps(self.output.get_result(), indent=indent))
         f.close()
 
+    def close_output(self) -> None:
+        """Flush results written during solving, e.g. to SQLite output."""
+        self.output.close()
+
     def get_output_dict(self, **kw: Any) -> Dict[str, Any]:
         """Return dictionary from OutputCreator class."""
         condition = True if kw["package_name"] and kw["package_version"] else False
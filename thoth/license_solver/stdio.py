@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Answer detection requests read line by line from STDIN, the solver stays loaded between requests."""
+
+import sys
+import json
+import logging
+from typing import Any, Dict, IO, Optional
+from .solver import Solver
+from .exceptions import UnableOpenFile
+from .metadata import load_metadata_file
+
+_LOGGER = logging.getLogger(__name__)
+
+# error codes of JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RequestError(Exception):  # noqa: N818
+    """An exception raised if request can't be answered, it is sent back as JSON-RPC error."""
+
+    def __init__(self, code: int, message: str) -> None:
+        """Create error with JSON-RPC error code."""
+        super().__init__(message)
+        self.code = code
+
+
+def handle_request(solver: Solver, request: Any) -> Dict[str, Any]:
+    """
+    Answer one JSON-RPC request.
+
+    Methods:
+        * ``detect`` - params are metadata dictionary
+        * ``detect_file`` - params are ``{"path": ...}``, JSON file, archive or METADATA file
+        * ``detect_pypi`` - params are ``{"name": ..., "version": ...}``, version is optional
+
+    :param solver: solver used for detection
+    :param request: parsed JSON-RPC request
+    :return: output of the package, the same as in Solver.detect
+    """
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        raise RequestError(INVALID_REQUEST, "Request must be an object with method")
+
+    method = request["method"]
+    params = request.get("params")
+    if not isinstance(params, dict):
+        raise RequestError(INVALID_PARAMS, "Params must be an object")
+
+    if method == "detect":
+        return solver.detect(params)
+
+    if method == "detect_file":
+        if not isinstance(params.get("path"), str):
+            raise RequestError(INVALID_PARAMS, "Missing path")
+        try:
+            metadata = load_metadata_file(params["path"])
+        except UnableOpenFile as e:
+            raise RequestError(SERVER_ERROR, str(e))
+        return solver.detect(metadata)
+
+    if method == "detect_pypi":
+        if not isinstance(params.get("name"), str):
+            raise RequestError(INVALID_PARAMS, "Missing package name")
+        res = solver.fetch_pypi_metadata(params["name"], params.get("version"))
+        if res is None:
+            raise RequestError(SERVER_ERROR, f"Package {params['name']!r} was not found on PyPI")
+        return solver.detect(res)
+
+    raise RequestError(METHOD_NOT_FOUND, f"Unknown method {method!r}")
+
+
+def serve_stdio(solver: Solver, input_stream: Optional[IO[str]] = None, output_stream: Optional[IO[str]] = None) -> int:
+    """
+    Answer JSON-RPC 2.0 requests, one request per line, until end of input.
+
+    Each line gets exactly one response line, also requests without id, and the response is flushed right away.
+
+    :param solver: solver used for detection
+    :param input_stream: stream with requests, STDIN if not given
+    :param output_stream: stream for responses, STDOUT if not given
+    :return: number of answered requests
+    """
+    # streams are looked up on each call, so they can be redirected after import
+    if input_stream is None:
+        input_stream = sys.stdin
+    if output_stream is None:
+        output_stream = sys.stdout
+
+    count = 0
+    for line in iter(input_stream.readline, ""):
+        if not line.strip():
+            continue
+
+        request_id = None
+        response: Dict[str, Any] = {"jsonrpc": "2.0"}
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                raise RequestError(PARSE_ERROR, f"Parse error: {e}")
+
+            if isinstance(request, dict):
+                request_id = request.get("id")
+            response["result"] = handle_request(solver, request)
+        except RequestError as e:
+            response["error"] = {"code": e.code, "message": str(e)}
+        except Exception as e:
+            _LOGGER.exception("Failed to answer request %r", line[:200])
+            response["error"] = {"code": SERVER_ERROR, "message": str(e)}
+
+        response["id"] = request_id
+        output_stream.write(json.dumps(response) + "\n")
+        output_stream.flush()
+        count += 1
+
+    _LOGGER.debug("Answered %d requests from STDIN", count)
+    return count
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# license-solver
+# Copyright(C) 2021 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Watch directories and solve new and modified files as they appear, the solver stays loaded between changes."""
+
+import os
+import json
+import time
+import ctypes
+import ctypes.util
+import select
+import logging
+import threading
+from typing import Dict, IO, Iterable, List, Optional, Tuple
+from .solver import Solver
+from .shard import path_key
+from .exceptions import UnableOpenFile
+from .metadata import load_metadata_file
+
+_LOGGER = logging.getLogger(__name__)
+
+# IN_CLOSE_WRITE | IN_MOVED_TO, files are solved once they are written completely or moved to directory
+_INOTIFY_MASK = 0x00000008 | 0x00000080
+
+
+def _inotify_init(directories: Iterable[str]) -> Optional[int]:
+    """Create inotify descriptor watching directories, None if inotify is not available (e.g. outside of Linux)."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError, TypeError):
+        return None
+
+    if fd < 0:
+        return None
+
+    for directory in directories:
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _INOTIFY_MASK) < 0:
+            _LOGGER.debug("Directory %s can't be watched with inotify: %s", directory, os.strerror(ctypes.get_errno()))
+            os.close(fd)
+            return None
+
+    return fd
+
+
+class DirectoryWatcher:
+    """
+    Find new and modified JSON files in directories.
+
+    Only JSON files are watched, the same as in solver of ``--directory``, other files (e.g. READMEs or temporary
+    files of writers) are ignored. Files are compared by modification time and size between scans. On Linux
+    directories are watched with inotify and they are scanned only after a file was written, otherwise they are
+    scanned periodically.
+    """
+
+    def __init__(self, directories: Iterable[str], use_inotify: bool = True) -> None:
+        """
+        Init watcher, the first scan finds all files.
+
+        :param directories: watched directories, files in subdirectories are not watched
+        :param use_inotify: use inotify if it is available, directories are scanned periodically otherwise
+        """
+        self.directories = list(directories)
+        self._files: Dict[str, Tuple[int, int]] = dict()
+        self._inotify = _inotify_init(self.directories) if use_inotify else None
+        _LOGGER.debug(
+            "Watching %d directories with %s", len(self.directories), "inotify" if self._inotify else "polling"
+        )
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Check if directories are watched with inotify."""
+        return self._inotify is not None
+
+    def scan(self) -> List[str]:
+        """Get paths of JSON files which are new or were modified since the last scan."""
+        changed = list()
+        files: Dict[str, Tuple[int, int]] = dict()
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                _LOGGER.warning("Directory %s can't be scanned: %s", directory, e)
+                continue
+
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    _LOGGER.debug("File %s is not JSON type [SKIPPED]", entry.path)
+                    continue
+
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    # file was removed during scan
+                    continue
+
+                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                if self._files.get(entry.path) != files[entry.path]:
+                    changed.append(entry.path)
+
+        self._files = files
+        return sorted(changed)
+
+    def wait(self, timeout: float, stop: Optional[threading.Event] = None) -> bool:
+        """
+        Wait for changes in directories.
+
+        :param timeout: maximal time to wait in seconds
+        :param stop: event which stops waiting when it is set
+        :return: True if directories should be scanned
+        """
+        if self._inotify is None:
+            if stop is not None:
+                return not stop.wait(timeout)
+            time.sleep(timeout)
+            return True
+
+        readable, _, _ = select.select([self._inotify], [], [], timeout)
+        if not readable:
+            return False
+
+        # events are only a signal to scan, they are drained all at once
+        try:
+            while os.read(self._inotify, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+        return stop is None or not stop.is_set()
+
+    def close(self) -> None:
+        """Close inotify descriptor."""
+        if self._inotify is not None:
+            os.close(self._inotify)
+            self._inotify = None
+
+
+def solve_files(solver: Solver, paths: Iterable[str], output_stream: IO[str]) -> int:
+    """
+    Solve files and append their results to streaming output, one output object per line (NDJSON).
+
+    Results are not kept in output of solver, so memory does not grow while watching.
+
+    :param solver: solver used for detection
+    :param paths: paths to JSON files
+    :param output_stream: stream for results, it is flushed after each result
+    :return: number of solved packages
+    """
+    count = 0
+    for path in paths:
+        if not solver.in_shard(path_key(path)):
+            continue
+
+        try:
+            result = solver.detect(load_metadata_file(path))
+        except UnableOpenFile as e:
+            # file can be still being written, it is solved again once it is modified
+            _LOGGER.warning("%s [SKIPPED]", e)
+            continue
+        except Exception:
+            # one broken file must never stop watching
+            _LOGGER.exception("Failed to solve file %s [SKIPPED]", path)
+            continue
+
+        if not result:
+            _LOGGER.debug("File %s has no package name or version [SKIPPED]", path)
+            continue
+
+        output_stream.write(json.dumps(result) + "\n")
+        output_stream.flush()
+        count += 1
+
+    return count
+
+
+def watch(
+    solver: Solver,
+    directories: Iterable[str],
+    output_stream: IO[str],
+    interval: float = 1.0,
+    stop: Optional[threading.Event] = None,
+    use_inotify: bool = True,
+) -> int:
+    """
+    Solve all JSON files in directories and then new and modified JSON files until stopped.
+
+    :param solver: solver used for detection
+    :param directories: watched directories
+    :param output_stream: stream for results, one output object per line
+    :param interval: seconds between scans of directories, with inotify it is the maximal delay of stop
+    :param stop: event which stops watching when it is set, it runs until interrupted if not given
+    :param use_inotify: use inotify if it is available
+    :return: number of solved packages
+    """
+    watcher = DirectoryWatcher(directories, use_inotify)
+    count = 0
+    try:
+        scan = True
+        while stop is None or not stop.is_set():
+            if scan:
+                changed = watcher.scan()
+                if changed:
+                    _LOGGER.info("Found %d new or modified files", len(changed))
+                    count += solve_files(solver, changed, output_stream)
+
+            scan = watcher.wait(interval, stop)
+    finally:
+        watcher.close()
+
+    return count